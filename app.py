@@ -1,26 +1,53 @@
 
+import asyncio
 import logging
+import os
+import signal
+from contextlib import suppress
 from aiogram import executor
-from loader import dp, user_db, sections_db, payment_db
+from loader import dp, bot, storage, user_db, sections_db, payment_db, settings_db
 import middlewares, filters, handlers
+from middlewares import inflight
 from utils.notify_admins import on_startup_notify
 from utils.set_bot_commands import set_default_commands
-from data.config import ADMINS
+from utils.db_api.changes import ChangeWatcher
+from utils.db_api.executor import shutdown_all_executors
+from utils.db_api.instrumentation import sql_instrumentation
+from utils.db_api.maintenance import start_checkpoint_scheduler, stop_checkpoint_scheduler
+from utils.db_api.pool import close_all_pools
+from utils.misc.broadcast import broadcaster
+from utils.misc.sharding import ShardPeers, ShardRouter, WorkerPool, invalidation_app, poll_updates, serve_webhook
+from data.config import ADMINS, SQLITE_CHECKPOINT_INTERVAL, LAST_ACTIVE_FLUSH_INTERVAL, SIGNUP_DIGEST_INTERVAL
+from data.config import BOT_MODE, WEBHOOK_URL, WEBHOOK_PATH, WEBAPP_HOST, WEBAPP_PORT, SHUTDOWN_DRAIN_TIMEOUT
+from data.config import SHARD_UPSTREAM, WORKERS, WORKER_INDEX, WORKER_HOST, WORKER_PORT_BASE, SHARD_MAX_PENDING
+from data.config import CHANGE_POLL_INTERVAL
 
 # Logger sozlash
 logging.basicConfig(level=logging.INFO)
 
-async def on_startup(dispatcher):
-    """Botni ishga tushirishda bajariladigan funksiya"""
-    await set_default_commands(dispatcher)
+# Worker rejimida boshqa worker'lar yozgan o'zgarishlar bo'yicha keshlar bekor qilinadi
+watchers = [ChangeWatcher(db.path_to_db, db.on_change, interval=CHANGE_POLL_INTERVAL)
+            for db in (user_db, sections_db, settings_db)]
+# Ruxsat o'zgarishi foydalanuvchi worker'iga ChangeWatcher'ni kutmasdan yetkaziladi
+peers = ShardPeers(WORKER_INDEX, WORKERS, host=WORKER_HOST, port_base=WORKER_PORT_BASE)
 
+async def setup_databases(dispatcher):
+    """Jadvallar, migratsiyalar, sozlamalar va adminlarni tayyorlaydi.
+
+    sharded rejimida faqat frontda, worker'lar ishga tushishidan oldin bajariladi.
+    """
     try:
-        # Barcha jadvallarni yaratish
-        await user_db.create_table_users()
-        await payment_db.create_table_payments()
-        await sections_db.create_table_questions()
-        await sections_db.create_table_road_signs()
-        await sections_db.create_table_truck_parts()
+        # Barcha jadvallarni yaratish va sxema migratsiyalarini qo'llash
+        await user_db.migrate()
+        await payment_db.migrate()
+        await sections_db.migrate()
+        await settings_db.migrate()
+        await storage.migrate()
+        # display_id lar faqat nomuvofiqlik topilganda qayta indekslanadi
+        await sections_db.verify_display_ids()
+        # Standart sozlamalar bir marta yoziladi, keyin yuklanib obunachilarga (lokalizatsiya) yuboriladi
+        await settings_db.seed_defaults()
+        await settings_db.load()
         logging.info("Barcha jadvallar muvaffaqiyatli yaratildi yoki allaqachon mavjud.")
 
         # Adminlarni o'rnatish
@@ -38,7 +65,132 @@ async def on_startup(dispatcher):
         logging.error(f"Jadval yaratish yoki admin o'rnatishda xatolik: {e}")
         raise
 
-    await on_startup_notify(dispatcher)
+async def on_startup(dispatcher):
+    """Botni ishga tushirishda bajariladigan funksiya"""
+    if BOT_MODE == "worker":
+        # Sxema va adminlar frontda tayyorlangan; worker sozlamalarni o'qiydi va o'zgarishlarni kuzatadi.
+        # Yangi foydalanuvchilar buferlanmaydi: digestni front bazadan yig'adi
+        user_db.buffer_signups = False
+        user_db.on_access_change = peers.invalidate_user
+        await settings_db.load()
+        for watcher in watchers:
+            await watcher.start()
+    else:
+        await set_default_commands(dispatcher)
+        await setup_databases(dispatcher)
+
+    # So'nggi faollik vaqtlarini to'plab yozish
+    user_db.start_last_active_flusher(LAST_ACTIVE_FLUSH_INTERVAL)
+    # WAL checkpoint va digest bitta jarayonda bajariladi: sharded rejimida ularni front yuritadi
+    if BOT_MODE != "worker":
+        start_checkpoint_scheduler(SQLITE_CHECKPOINT_INTERVAL)
+        user_db.start_signup_digest(dispatcher, SIGNUP_DIGEST_INTERVAL)
+        # Eskirgan FSM holatlari yozuvlar bo'lmasa ham o'chiriladi (worker'lar faqat yozganda tozalaydi)
+        storage.start()
+
+    if BOT_MODE == "webhook":
+        # Telegram to'xtash paytidagi update'larni navbatda saqlaydi, shuning uchun webhook o'chirilmaydi
+        await dispatcher.bot.set_webhook(WEBHOOK_URL)
+        logging.info(f"Webhook o'rnatildi: {WEBHOOK_URL}")
+    elif BOT_MODE == "polling":
+        # Avval webhook rejimida ishlagan bo'lsa, polling ishlashi uchun webhook olib tashlanadi
+        await dispatcher.bot.delete_webhook()
+
+    # Worker'lar uchun ishga tushish xabarini front yuboradi
+    if BOT_MODE != "worker":
+        await on_startup_notify(dispatcher)
+
+async def on_shutdown(dispatcher):
+    """Bot to'xtaganda bajariladigan funksiya"""
+    # Jarayondagi handlerlar tugashi kutiladi, keyin ularning FSM yozuvlari saqlanadi
+    await inflight.drain(SHUTDOWN_DRAIN_TIMEOUT)
+    await storage.close()
+    for watcher in watchers:
+        await watcher.stop()
+    await peers.close()
+    # Oxirgi digest va fondagi admin xabarlari yuborib bo'linadi
+    if BOT_MODE != "worker":
+        await user_db.stop_signup_digest(dispatcher)
+    await broadcaster.drain()
+    bot.scheduler.log_summary()
+    await bot.scheduler.stop()
+    await user_db.stop_last_active_flusher()
+    # Oxirgi TRUNCATE checkpoint: sharded rejimida front worker'lar to'xtagandan keyin bajaradi
+    if BOT_MODE != "worker":
+        await stop_checkpoint_scheduler()
+    shutdown_all_executors()
+    if sql_instrumentation.timing:
+        sql_instrumentation.log_summary()
+    close_all_pools()
+    logging.info("Ma'lumotlar bazasi ulanishlari yopildi.")
+
+async def run_sharded():
+    """Front jarayon: bazalarni tayyorlaydi, WORKERS ta worker'ni ishga tushiradi va
+    update'larni ularga foydalanuvchi bo'yicha yo'naltiradi (SIGINT/SIGTERM gacha)."""
+    await set_default_commands(dp)
+    await setup_databases(dp)
+    # Ro'yxatdan o'tishlar worker'larda bo'ladi, shuning uchun digest bundan keyin bazadan yig'iladi
+    # (setup paytida qo'shilgan adminlar frontning o'z buferida qoladi)
+    await user_db.track_signups()
+    start_checkpoint_scheduler(SQLITE_CHECKPOINT_INTERVAL)
+    user_db.start_signup_digest(dp, SIGNUP_DIGEST_INTERVAL)
+
+    workers = WorkerPool(WORKERS, os.path.abspath(__file__), host=WORKER_HOST, port_base=WORKER_PORT_BASE,
+                         path=WEBHOOK_PATH)
+    workers.start()
+    router = ShardRouter(workers.urls, max_pending=SHARD_MAX_PENDING)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    upstream, runner = None, None
+    if SHARD_UPSTREAM == "webhook":
+        runner = await serve_webhook(router, WEBHOOK_PATH, WEBAPP_HOST, WEBAPP_PORT)
+        await bot.set_webhook(WEBHOOK_URL)
+        logging.info(f"Webhook o'rnatildi: {WEBHOOK_URL}")
+    else:
+        await bot.delete_webhook(drop_pending_updates=True)
+        upstream = asyncio.create_task(poll_updates(bot, router))
+    await on_startup_notify(dp)
+    logging.info(f"Sharded rejim: workers={WORKERS}, upstream={SHARD_UPSTREAM}")
+
+    await stop.wait()
+    # Yangi update'lar olinmaydi, yo'ldagilari worker'larga yetkaziladi, keyin worker'lar o'zi drain qiladi
+    if upstream is not None:
+        upstream.cancel()
+        with suppress(asyncio.CancelledError):
+            await upstream
+    if runner is not None:
+        await runner.cleanup()
+    await router.drain(SHUTDOWN_DRAIN_TIMEOUT)
+    await workers.stop(SHUTDOWN_DRAIN_TIMEOUT + 10)
+
+    # Worker'lar to'xtagach: oxirgi digest (ularning ro'yxatdan o'tishlari bilan) va WAL ni qisqartirish
+    await user_db.stop_signup_digest(dp)
+    await storage.close()
+    await broadcaster.drain()
+    bot.scheduler.log_summary()
+    await bot.scheduler.stop()
+    await stop_checkpoint_scheduler()
+    await (await bot.get_session()).close()
+    shutdown_all_executors()
+    close_all_pools()
+    logging.info("Front to'xtatildi.")
 
 if __name__ == '__main__':
-    executor.start_polling(dp, on_startup=on_startup, skip_updates=True)
+    if BOT_MODE == "sharded":
+        asyncio.get_event_loop().run_until_complete(run_sharded())
+    elif BOT_MODE == "worker":
+        # Update'lar frontdan lokal webhook orqali keladi; Telegram webhook'i front ixtiyorida.
+        # Shu serverda boshqa worker'lardan profil invalidatsiyalari ham qabul qilinadi
+        worker = executor.set_webhook(dp, webhook_path=WEBHOOK_PATH, on_startup=on_startup, on_shutdown=on_shutdown,
+                                      skip_updates=False, web_app=invalidation_app(user_db.on_change))
+        worker.run_app(host=WORKER_HOST, port=WORKER_PORT_BASE + WORKER_INDEX)
+    elif BOT_MODE == "webhook":
+        # Update'lar aiohttp server orqali qabul qilinadi; to'xtash paytidagi navbat tashlab yuborilmaydi
+        executor.start_webhook(dp, webhook_path=WEBHOOK_PATH, on_startup=on_startup, on_shutdown=on_shutdown,
+                               skip_updates=False, host=WEBAPP_HOST, port=WEBAPP_PORT)
+    else:
+        executor.start_polling(dp, on_startup=on_startup, on_shutdown=on_shutdown, skip_updates=True)
@@ -6,12 +6,67 @@ env.read_env()
 
 # .env fayl ichidan quyidagilarni o'qiymiz
 BOT_TOKEN = env.str("BOT_TOKEN")  # Bot token
-# ADMINS ni ro'yxat sifatida o'qish va agar bitta str bo'lsa, uni listga aylantirish
-ADMINS = env.list("ADMINS", subcast=int) if isinstance(env.list("ADMINS"), list) else [int(env.str("ADMINS"))]
+# ADMINS - int ID lar ro'yxati (bitta ID ham ro'yxat bo'ladi); taqqoslashlar int bilan qilinadi
+ADMINS = env.list("ADMINS", subcast=int)
 IP = env.str("ip")  # Xosting ip manzili
 
+# Ishga tushirish rejimi: "polling", "webhook" yoki "sharded" (front + WORKERS ta worker jarayoni);
+# "worker" rejimini front o'zi beradi
+BOT_MODE = env.str("BOT_MODE", "polling")
+WEBHOOK_HOST = env.str("WEBHOOK_HOST", "")  # tashqi manzil, masalan https://example.com
+WEBHOOK_PATH = env.str("WEBHOOK_PATH", "/webhook")
+WEBHOOK_URL = f"{WEBHOOK_HOST}{WEBHOOK_PATH}"
+WEBAPP_HOST = env.str("WEBAPP_HOST", "0.0.0.0")  # aiohttp server manzili
+WEBAPP_PORT = env.int("WEBAPP_PORT", 8080)
+BOT_API_SERVER = env.str("BOT_API_SERVER", "")  # lokal yoki soxta Bot API (masalan, http://localhost:8081)
+SHUTDOWN_DRAIN_TIMEOUT = env.float("SHUTDOWN_DRAIN_TIMEOUT", 30.0)  # to'xtashda handlerlarni kutish (soniya)
+SHARD_UPSTREAM = env.str("SHARD_UPSTREAM", "polling")  # sharded rejimida front update'larni qanday oladi
+WORKERS = env.int("WORKERS", 2)  # sharded rejimida worker jarayonlari soni
+WORKER_INDEX = env.int("WORKER_INDEX", 0)  # worker raqami (front tomonidan beriladi)
+WORKER_HOST = env.str("WORKER_HOST", "127.0.0.1")  # worker'lar tinglaydigan manzil
+WORKER_PORT_BASE = env.int("WORKER_PORT_BASE", 8100)  # worker i porti: WORKER_PORT_BASE + i
+SHARD_MAX_PENDING = env.int("SHARD_MAX_PENDING", 256)  # frontda bir vaqtda yo'naltirilayotgan update'lar
+CHANGE_POLL_INTERVAL = env.float("CHANGE_POLL_INTERVAL", 0.5)  # worker'lararo kesh invalidatsiyasi oralig'i (soniya)
+
+# SQLite PRAGMA profili: har bir yangi ulanish ochilganda qo'llaniladi
+SQLITE_PRAGMAS = {
+    "busy_timeout": env.int("SQLITE_BUSY_TIMEOUT", 5000),  # ms, qulf bo'shashini kutish
+    "journal_mode": env.str("SQLITE_JOURNAL_MODE", "WAL"),  # o'quvchilar yozuvchini kutmaydi
+    "synchronous": env.str("SQLITE_SYNCHRONOUS", "NORMAL"),  # WAL bilan har commitda fsync yo'q
+    "mmap_size": env.int("SQLITE_MMAP_SIZE", 134217728),  # 128 MB
+    "cache_size": env.int("SQLITE_CACHE_SIZE", -16000),  # manfiy qiymat = KiB (16 MB)
+    "temp_store": env.str("SQLITE_TEMP_STORE", "MEMORY"),
+}
+SQLITE_CHECKPOINT_INTERVAL = env.int("SQLITE_CHECKPOINT_INTERVAL", 300)  # WAL checkpoint oralig'i (soniya)
+LAST_ACTIVE_FLUSH_INTERVAL = env.int("LAST_ACTIVE_FLUSH_INTERVAL", 10)  # last_active buferini yozish oralig'i (soniya)
+SIGNUP_DIGEST_INTERVAL = env.int("SIGNUP_DIGEST_INTERVAL", 60)  # yangi foydalanuvchilar digesti oralig'i (soniya)
+FSM_HOT_SIZE = env.int("FSM_HOT_SIZE", 10000)  # xotirada saqlanadigan FSM holatlari soni
+FSM_HOT_TTL = env.int("FSM_HOT_TTL", 600)  # FSM holatining xotirada turish muddati (soniya)
+FSM_STATE_TTL = env.int("FSM_STATE_TTL", 259200)  # tashlab ketilgan holatlar muddati (soniya, 3 kun)
+FSM_FLUSH_INTERVAL = env.float("FSM_FLUSH_INTERVAL", 1.0)  # FSM o'zgarishlarini yozish oralig'i (soniya)
+THROTTLE_RATE_LIMIT = env.float("THROTTLE_RATE_LIMIT", 0.1)  # foydalanuvchi uchun token tiklanish oralig'i (soniya)
+THROTTLE_BURST = env.int("THROTTLE_BURST", 3)  # ketma-ket ruxsat etilgan so'rovlar
+USER_CACHE_SIZE = env.int("USER_CACHE_SIZE", 10000)  # keshdagi foydalanuvchi profillari soni
+USER_CACHE_TTL = env.int("USER_CACHE_TTL", 300)  # profil keshi muddati (soniya)
+SQL_TIMING = env.bool("SQL_TIMING", False)  # so'rovlar vaqt gistogrammasini yig'ish
+SQL_SLOW_QUERY_MS = env.int("SQL_SLOW_QUERY_MS", 500)  # sekin so'rovlar chegarasi (0 - o'chiq)
+SQL_TRACE_SAMPLE_RATE = env.float("SQL_TRACE_SAMPLE_RATE", 0.0)  # to'liq SQL trace ulushi (0..1)
+BROADCAST_CONCURRENCY = env.int("BROADCAST_CONCURRENCY", 8)  # bir vaqtda yuborilayotgan xabarlar
+OUTBOUND_GLOBAL_RATE = env.float("OUTBOUND_GLOBAL_RATE", 30.0)  # Bot API umumiy cheklovi (xabar/soniya)
+OUTBOUND_CHAT_RATE = env.float("OUTBOUND_CHAT_RATE", 1.0)  # bitta chatga (xabar/soniya)
+OUTBOUND_CHAT_BURST = env.int("OUTBOUND_CHAT_BURST", 3)  # bitta chatga ketma-ket yuborish mumkin bo'lgan xabarlar
+OUTBOUND_MAX_RETRIES = env.int("OUTBOUND_MAX_RETRIES", 3)  # RetryAfter dan keyin qayta urinishlar
+
 
 # data/config.py
 PAYMENT_AMOUNT = 14.09
 PAYMENT_CARD = "9860 1234 5678 9012"
-PAYMENT_OWNER = "FATTOYEV ABDUFATTOH"
\ No newline at end of file
+PAYMENT_OWNER = "FATTOYEV ABDUFATTOH"
+
+# Ish vaqtidagi sozlamalarning boshlang'ich qiymatlari: birinchi ishga tushishda
+# data/settings.db ga yoziladi, keyin admin buyruqlari orqali bazada o'zgaradi
+SETTINGS_DEFAULTS = {
+    "payment_amount": PAYMENT_AMOUNT,
+    "payment_card": "💳 *Uzcard:* *5614 6818 1201 1462*\n💳 *Visa:* *4231 2000 0805 3422*",
+    "payment_owner": "👤 Umedjon Mirbakayev",
+}
@@ -0,0 +1,114 @@
+# messages.py: foydalanuvchi xabarlari shablonlari (uz, ru, es)
+# {amount}, {uzcard}, {visa}, {owner} maydonlari to'lov sozlamalaridan to'ldiriladi
+# (utils.misc.localization.Localization). Oddiy "{" belgisi uchun "{{" yozing.
+
+USER_MESSAGES = {
+    "uz": {
+        "welcome": "🌟 *Xush kelibsiz!* 🌟\nIltimos, o'zingiz uchun mos tilni tanlang 👇",
+        "questions_answers": "📝 Savol va Javoblar",
+        "road_signs": "🚦 Yo'l Belgilari",
+        "truck_parts": "🚚 Truck Ehtiyot Qismlari",
+        "language_settings": "⚙️ Til Sozlamalari",
+        "success_message": "✅ *Tabriklaymiz!* 🎉 Botdan foydalanishingiz mumkin! 🚀",
+        "payment_required": "💰 Botdan foydalanish uchun ${amount} to'lov qiling va chekni yuboring 📸\n\n"
+                           "🌐 Karta ma'lumotlari:\n"
+                           "  💳 Uzcard: *{uzcard}*\n"
+                           "  💳 Visa:   *{visa}*\n"
+                           "👤 Karta egasi: {owner}",
+        "select_new_language": "🌐 *Yangi tilni tanlang:* 👇",
+        "language_saved": "✅ *Til saqlandi!* 🌟 Endi botni o'zingiz uchun sozlang!",
+        "payment_received": "📩 *Chek qabul qilindi!* ✅ Admin tasdiqlashini kuting ⏳",
+        "payment_already_pending": "⚠️ *Diqqat!* Sizning oldingi chekingiz hali ko'rib chiqilmoqda. Iltimos, kuting! ⏳",
+        "no_access": "❌ *Ruxsat yo'q!* 💡 Botdan foydalanish uchun to'lov qiling.",
+        "no_data": "⚠️ *Diqqat!* Bu bo'limda hozircha ma'lumot yo'q. Keling, keyinroq urinib ko'ramiz! 😊",
+        "select_section": "📋 *Iltimos, menyudan bo'lim tanlang:* 👇",
+        "error_occurred": "🚫 *Xatolik yuz berdi!* 😔 Iltimos, qayta urinib ko'ring.",
+        "item_not_found": "🔍 *Element topilmadi!* Iltimos, boshqa elementni tanlang.",
+        "forward_prohibited": "⚠️ *Forward taqiqlangan!* 🚫 Xabarni qayta yubormang.",
+        "previous": "⬅️ Oldingi",
+        "next": "Keyingi ➡️",
+        "question": "📝 Savol",
+        "road_sign": "🚦 Yo'l Belgisi",
+        "truck_part": "🚚 Truck Ehtiyot Qismi",
+        "questions_list": "📚 *Savol va Javoblar Ro'yxati:*",
+        "road_signs_list": "🚦 *Yo'l Belgilari Ro'yxati:*",
+        "truck_parts_list": "🚚 *Truck Ehtiyot Qismlari Ro'yxati:*",
+        "question_label": "📌 *Savol:*",
+        "answer_label": "💡 *Javob:*",
+        "audio_caption": "🎵 *Savol Audiosi*",
+        "back_to_menu": "🔙 Orqaga",
+        "payment_rejected": "❌ *Kechirasiz, to'lovingiz rad etildi! Iltimos, qayta urinib ko'ring.*"
+    },
+    "ru": {
+        "welcome": "🌟 *Добро пожаловать!* 🌟\nПожалуйста, выберите язык 👇",
+        "questions_answers": "📝 Вопросы и ответы",
+        "road_signs": "🚦 Дорожные знаки",
+        "truck_parts": "🚚 Запчасти для грузовиков",
+        "language_settings": "⚙️ Настройки языка",
+        "success_message": "✅ *Поздравляем!* 🎉 Вы можете использовать бота! 🚀",
+        "payment_required": "💰 Оплатите ${amount} для использования бота и отправьте чек 📸\n\n"
+                           "🌐 Информация о карте:\n"
+                           "  💳 Uzcard: *{uzcard}*\n"
+                           "  💳 Visa:   *{visa}*\n"
+                           "👤 Владелец карты: {owner}",
+        "select_new_language": "🌐 *Выберите новый язык:* 👇",
+        "language_saved": "✅ *Язык сохранен!* 🌟 Настройте бота под себя!",
+        "payment_received": "📩 *Чек принят!* ✅ Ожидайте подтверждения администратора ⏳",
+        "payment_already_pending": "⚠️ *Внимание!* Ваш предыдущий чек еще рассматривается. Пожалуйста, подождите! ⏳",
+        "no_access": "❌ *Нет доступа!* 💡 Оплатите, чтобы использовать бота.",
+        "no_data": "⚠️ *Внимание!* В этом разделе пока нет данных. Попробуем позже! 😊",
+        "select_section": "📋 *Выберите раздел из меню:* 👇",
+        "error_occurred": "🚫 *Произошла ошибка!* 😔 Пожалуйста, попробуйте снова.",
+        "item_not_found": "🔍 *Элемент не найден!* Выберите другой элемент.",
+        "forward_prohibited": "⚠️ *Пересылка запрещена!* 🚫 Не отправляйте сообщения повторно.",
+        "previous": "⬅️ Предыдущая",
+        "next": "Следующая ➡️",
+        "question": "📝 Вопрос",
+        "road_sign": "🚦 Дорожный знак",
+        "truck_part": "🚚 Запчасть грузовика",
+        "questions_list": "📚 *Список вопросов и ответов:*",
+        "road_signs_list": "🚦 *Список дорожных знаков:*",
+        "truck_parts_list": "🚚 *Список запчастей для грузовиков:*",
+        "question_label": "📌 *Вопрос:*",
+        "answer_label": "💡 *Ответ:*",
+        "audio_caption": "🎵 *Аудио вопроса*",
+        "back_to_menu": "🔙 Назад",
+        "payment_rejected": "❌ *К сожалению, ваш платеж отклонен! Пожалуйста, попробуйте снова.*"
+    },
+    "es": {
+        "welcome": "🌟 *¡Bienvenido!* 🌟\nPor favor, selecciona un idioma 👇",
+        "questions_answers": "📝 Preguntas y respuestas",
+        "road_signs": "🚦 Señales de tráfico",
+        "truck_parts": "🚚 Piezas de camiones",
+        "language_settings": "⚙️ Configuración de idioma",
+        "success_message": "✅ *¡Felicidades!* 🎉 ¡Puedes usar el bot! 🚀",
+        "payment_required": "💰 Paga ${amount} para usar el bot y envía el recibo 📸\n\n"
+                           "🌐 Información de la tarjeta:\n"
+                           "  💳 Uzcard: *{uzcard}*\n"
+                           "  💳 Visa:   *{visa}*\n"
+                           "👤 Titular de la tarjeta: {owner}",
+        "select_new_language": "🌐 *Selecciona un nuevo idioma:* 👇",
+        "language_saved": "✅ *¡Idioma guardado!* 🌟 ¡Personaliza el bot!",
+        "payment_received": "📩 *¡Recibo recibido!* ✅ Espera la confirmación del administrador ⏳",
+        "payment_already_pending": "⚠️ *¡Atención!* Tu recibo anterior aún está siendo revisado. ¡Por favor, espera! ⏳",
+        "no_access": "❌ *¡Sin acceso!* 💡 Realiza el pago para usar el bot.",
+        "no_data": "⚠️ *¡Atención!* No hay datos en esta sección. ¡Intentémoslo más tarde! 😊",
+        "select_section": "📋 *Por favor, selecciona una sección del menú:* 👇",
+        "error_occurred": "🚫 *¡Ocurrió un error!* 😔 Inténtalo de nuevo.",
+        "item_not_found": "🔍 *¡Elemento no encontrado!* Selecciona otro elemento.",
+        "forward_prohibited": "⚠️ *¡Reenvío prohibido!* 🚫 No reenvíes mensajes.",
+        "previous": "⬅️ Anterior",
+        "next": "Siguiente ➡️",
+        "question": "📝 Pregunta",
+        "road_sign": "🚦 Señal de tráfico",
+        "truck_part": "🚚 Pieza de camión",
+        "questions_list": "📚 *Lista de preguntas y respuestas:*",
+        "road_signs_list": "🚦 *Lista de señales de tráfico:*",
+        "truck_parts_list": "🚚 *Lista de piezas de camiones:*",
+        "question_label": "📌 *Pregunta:*",
+        "answer_label": "💡 *Respuesta:*",
+        "audio_caption": "🎵 *Audio de la pregunta*",
+        "back_to_menu": "🔙 Atrás",
+        "payment_rejected": "❌ *¡Lo sentimos, tu pago ha sido rechazado! Por favor, inténtalo de nuevo.*"
+    }
+}
@@ -45,12 +45,14 @@ async def errors_handler(update, exception):
         logging.exception(f'InvalidQueryID: {exception} \nUpdate: {update}')
         return True
 
+    if isinstance(exception, RetryAfter):
+        # ScheduledBot qayta urinishlari tugagandan keyingina shu yerga keladi
+        logging.exception(f'RetryAfter (retries exhausted): {exception} \nUpdate: {update}')
+        return True
+
     if isinstance(exception, TelegramAPIError):
         logging.exception(f'TelegramAPIError: {exception} \nUpdate: {update}')
         return True
-    if isinstance(exception, RetryAfter):
-        logging.exception(f'RetryAfter: {exception} \nUpdate: {update}')
-        return True
     if isinstance(exception, CantParseEntities):
         logging.exception(f'CantParseEntities: {exception} \nUpdate: {update}')
         return True
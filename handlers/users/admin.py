@@ -4,17 +4,14 @@ from aiogram.dispatcher.filters.builtin import Command
 from aiogram.dispatcher import FSMContext
 from aiogram.dispatcher.filters.state import State, StatesGroup
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-from loader import dp, bot, user_db, sections_db, payment_db
-from data.config import ADMINS, PAYMENT_AMOUNT
+from loader import dp, bot, user_db, sections_db, payment_db, settings_db
+from keyboards.cache import keyboard_cache
+from data.config import ADMINS
 import logging
 import os
 
 logging.basicConfig(level=logging.INFO)
 
-# To'lov summasi (standart qiymat, agar config'da bo'lmasa)
-PAYMENT_AMOUNT = PAYMENT_AMOUNT if 'PAYMENT_AMOUNT' in globals() else 10.00
-
-
 # States class
 class UserStates(StatesGroup):
     SELECTING_LANGUAGE = State()
@@ -48,7 +45,7 @@ class AdminFilter(Filter):
 # Super Admin Filter
 class SuperAdminFilter(Filter):
     async def check(self, message: types.Message):
-        return str(message.from_user.id) in ADMINS
+        return message.from_user.id in ADMINS
 
 
 # Enhanced localization messages
@@ -84,7 +81,7 @@ MESSAGES = {
         "audio_caption": "🎵 *Savol Audiosi*",
         "back_to_menu": "🔙 Orqaga",
         # Admin xabarlar
-        "admin_welcome": f"👑 *Admin paneliga xush kelibsiz!* 🌟\n💰 *Joriy to'lov summasi:* ${PAYMENT_AMOUNT}\nTanlang:",
+        "admin_welcome": "👑 *Admin paneliga xush kelibsiz!* 🌟\n💰 *Joriy to'lov summasi:* ${}\nTanlang:",
         "add_question": "📝 *Savol qo'shish jarayoni boshlandi!*",
         "add_road_sign": "🚦 *Yo'l belgisi qo'shish jarayoni boshlandi!*",
         "add_truck_part": "🚚 *Truck zapchasti qo'shish jarayoni boshlandi!*",
@@ -131,7 +128,7 @@ MESSAGES = {
         "audio_caption": "🎵 *Аудио вопроса*",
         "back_to_menu": "🔙 Назад",
         # Admin xabarlar
-        "admin_welcome": f"👑 *Добро пожаловать в админ-панель!* 🌟\n💰 *Текущая сумма платежа:* ${PAYMENT_AMOUNT}\nВыберите:",
+        "admin_welcome": "👑 *Добро пожаловать в админ-панель!* 🌟\n💰 *Текущая сумма платежа:* ${}\nВыберите:",
         "add_question": "📝 *Процесс добавления вопроса начат!*",
         "add_road_sign": "🚦 *Процесс добавления дорожного знака начат!*",
         "add_truck_part": "🚚 *Процесс добавления запчасти начат!*",
@@ -178,7 +175,7 @@ MESSAGES = {
         "audio_caption": "🎵 *Audio de la pregunta*",
         "back_to_menu": "🔙 Atrás",
         # Admin xabarlar
-        "admin_welcome": f"👑 *¡Bienvenido al panel de administración!* 🌟\n💰 *Monto de pago actual:* ${PAYMENT_AMOUNT}\nElige:",
+        "admin_welcome": "👑 *¡Bienvenido al panel de administración!* 🌟\n💰 *Monto de pago actual:* ${}\nElige:",
         "add_question": "📝 *¡Proceso de añadir pregunta iniciado!*",
         "add_road_sign": "🚦 *¡Proceso de añadir señal iniciado!*",
         "add_truck_part": "🚚 *¡Proceso de añadir pieza iniciado!*",
@@ -204,7 +201,7 @@ def get_message(language: str, key: str, *args) -> str:
 
 
 # Admin Menu
-def get_admin_menu():
+def _build_admin_menu():
     return InlineKeyboardMarkup(row_width=1).add(
         InlineKeyboardButton("📝 Savol Qo‘shish", callback_data="admin_add_question"),
         InlineKeyboardButton("🚦 Yo‘l Belgisi Qo‘shish", callback_data="admin_add_road_sign"),
@@ -215,8 +212,12 @@ def get_admin_menu():
     )
 
 
+def get_admin_menu():
+    return keyboard_cache.get(None, "admin_menu", _build_admin_menu)
+
+
 # Language Selection
-def get_language_selection():
+def _build_language_selection():
     return InlineKeyboardMarkup(row_width=1).add(
         InlineKeyboardButton("🇺🇿 O‘zbek tili", callback_data="admin_lang_uz"),
         InlineKeyboardButton("🇷🇺 Русский язык", callback_data="admin_lang_ru"),
@@ -224,8 +225,12 @@ def get_language_selection():
     )
 
 
+def get_language_selection():
+    return keyboard_cache.get(None, "admin_language", _build_language_selection)
+
+
 # Section Selection
-def get_section_selection(language: str):
+def _build_section_selection(language: str):
     sections = {
         "uz": ["Savol va Javoblar", "Yo'l Belgilari", "Truck Zapchastlari"],
         "ru": ["Вопросы и ответы", "Дорожные знаки", "Запчасти для грузовиков"],
@@ -242,6 +247,10 @@ def get_section_selection(language: str):
     return keyboard
 
 
+def get_section_selection(language: str):
+    return keyboard_cache.get(language, "admin_sections", lambda: _build_section_selection(language))
+
+
 # Delete Items Keyboard
 def get_delete_items_keyboard(items, section: str, language: str):
     """O'chirish uchun elementlar ro'yxati"""
@@ -301,44 +310,12 @@ def get_payment_actions(telegram_id: int):
     )
 
 
-# Config faylini yangilash funksiyasi
-def update_payment_amount_in_config(new_amount: float):
-    """data.config fayliga yangi to'lov summasini yozadi"""
-    config_file = "data/config.py"
-    try:
-        # Faylni ochish va o'qish
-        with open(config_file, "r") as file:
-            lines = file.readlines()
-
-        # PAYMENT_AMOUNT ni yangilash
-        updated_lines = []
-        amount_updated = False
-        for line in lines:
-            if line.strip().startswith("PAYMENT_AMOUNT ="):
-                updated_lines.append(f"PAYMENT_AMOUNT = {new_amount}\n")
-                amount_updated = True
-            else:
-                updated_lines.append(line)
-
-        # Agar PAYMENT_AMOUNT topilmasa, qo'shish
-        if not amount_updated:
-            updated_lines.append(f"PAYMENT_AMOUNT = {new_amount}\n")
-
-        # Faylni yangilash
-        with open(config_file, "w") as file:
-            file.writelines(updated_lines)
-        logging.info(f"Config faylida PAYMENT_AMOUNT yangilandi: {new_amount}")
-    except Exception as e:
-        logging.error(f"Config faylini yangilashda xatolik: {e}")
-        raise
-
-
 # Admin Panel
 @dp.message_handler(AdminFilter(), commands=["admin"])
 async def admin_panel(message: types.Message):
     user_language = await user_db.get_user_language(telegram_id=message.from_user.id) or "uz"
     await message.answer(
-        get_message(user_language, "admin_welcome"),
+        get_message(user_language, "admin_welcome", settings_db.get("payment_amount")),
         reply_markup=get_admin_menu(),
         parse_mode="Markdown"
     )
@@ -388,9 +365,7 @@ async def set_payment_amount_command(message: types.Message, state: FSMContext):
         new_amount = float(args)
         if new_amount <= 0:
             raise ValueError("Summa noldan katta bo'lishi kerak")
-        update_payment_amount_in_config(new_amount)
-        global PAYMENT_AMOUNT
-        PAYMENT_AMOUNT = new_amount
+        await settings_db.set_value("payment_amount", new_amount)
         await message.answer(
             get_message(user_language, "payment_amount_updated", new_amount),
             parse_mode="Markdown"
@@ -501,9 +476,7 @@ async def handle_set_payment_amount(message: types.Message, state: FSMContext):
         new_amount = float(message.text)
         if new_amount <= 0:
             raise ValueError("Summa noldan katta bo'lishi kerak")
-        update_payment_amount_in_config(new_amount)
-        global PAYMENT_AMOUNT
-        PAYMENT_AMOUNT = new_amount
+        await settings_db.set_value("payment_amount", new_amount)
         await message.answer(
             get_message(user_language, "payment_amount_updated", new_amount),
             reply_markup=get_admin_menu(),
@@ -1011,7 +984,7 @@ async def back_to_admin(callback_query: types.CallbackQuery, state: FSMContext):
 
     await callback_query.message.delete()
     await callback_query.message.answer(
-        get_message(user_language, "admin_welcome"),
+        get_message(user_language, "admin_welcome", settings_db.get("payment_amount")),
         reply_markup=get_admin_menu(),
         parse_mode="Markdown"
     )
@@ -1123,12 +1096,12 @@ async def cancel_command(message: types.Message, state: FSMContext):
         await user_db.update_last_active(telegram_id=user_id)
 
         # Check if the user is an admin
-        is_admin = await user_db.check_if_admin(user_id) or str(user_id) in ADMINS
+        is_admin = await user_db.check_if_admin(user_id) or user_id in ADMINS
 
         if is_admin:
             # Return to admin menu for admins
             await message.answer(
-                get_message(user_language, "admin_welcome"),
+                get_message(user_language, "admin_welcome", settings_db.get("payment_amount")),
                 reply_markup=get_admin_menu(),
                 parse_mode="Markdown",
                 protect_content=True
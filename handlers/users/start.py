@@ -4,12 +4,13 @@ from aiogram.dispatcher.filters.builtin import CommandStart
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
 from aiogram.dispatcher import FSMContext
 from aiogram.dispatcher.filters.state import State, StatesGroup
-from loader import dp, bot, user_db, sections_db, payment_db
+from loader import dp, bot, user_db, sections_db, payment_db, settings_db, localization
+from keyboards.cache import keyboard_cache
+from utils.misc.text_router import TextRouter
+from utils.misc.broadcast import broadcaster
+from utils.misc import rate_limit
 from data.config import ADMINS
 import logging
-import importlib
-import sys
-import time
 
 logging.basicConfig(level=logging.INFO)
 
@@ -20,244 +21,147 @@ class UserStates(StatesGroup):
     WAITING_FOR_PAYMENT = State()
 
 
-# To‘lov ma'lumotlari keshini boshqarish
-class PaymentInfoCache:
-    def __init__(self):
-        self._cache = None
-        self._last_updated = None
-        self._cache_timeout = 60  # 1 daqiqa kesh muddati
-
-    async def get_payment_info(self):
-        """Kesh orqali to'lov ma'lumotlarini olish"""
-        current_time = time.time()
-        if (self._cache is None or
-                self._last_updated is None or
-                current_time - self._last_updated > self._cache_timeout):
-            await self._refresh_cache()
-        return self._cache
-
-    async def _refresh_cache(self):
-        """Keshni yangilash"""
-        try:
-            # data.config modulini qayta yuklash
-            if 'data.config' in sys.modules:
-                importlib.reload(sys.modules['data.config'])
-
-            from data.config import PAYMENT_AMOUNT
-
-            self._cache = {
-                'amount': float(PAYMENT_AMOUNT),
-                'card': "💳 *Uzcard:* *5614 6818 1201 1462*\n💳 *Visa:* *4231 2000 0805 3422*",
-                'owner': "👤 Umedjon Mirbakayev"
-            }
-            self._last_updated = time.time()
-
-        except Exception as e:
-            logging.error(f"To'lov keshini yangilashda xatolik: {e}")
-            self._cache = {
-                'amount': 10.00,  # Fallback qiymat
-                'card': "💳 *Uzcard:* *5614 6818 1201 1462*\n💳 *Visa:* *4231 2000 0805 3422*",
-                'owner': "👤 Umedjon Mirbakayev"
-            }
-            self._last_updated = time.time()
-
-    def clear_cache(self):
-        """Keshni tozalash"""
-        self._cache = None
-        self._last_updated = None
-
-# Global kesh obyekti
-payment_cache = PaymentInfoCache()
-
+# To'lov ma'lumotlari sozlamalar bazasidan (settings_db) olinadi
+def get_payment_info() -> dict:
+    """Joriy to'lov ma'lumotlarini qaytaradi"""
+    return {
+        'amount': float(settings_db.get('payment_amount')),
+        'card': settings_db.get('payment_card'),
+        'owner': settings_db.get('payment_owner')
+    }
 
 
-# Enhanced localization messages
-async def get_messages_async():
-    """Real vaqtda xabarlarni olish"""
-    payment_info = await payment_cache.get_payment_info()
-    # Karta raqamlarini `\n` bilan ajratish
+# Lokalizatsiya: xabarlar loader.localization katalogida bir marta tayyorlanadi
+def payment_context(payment_info: dict) -> dict:
+    """To'lov ma'lumotlaridan xabar shablonlari uchun kontekst tayyorlaydi."""
     card_lines = payment_info['card'].split('\n')
     uzcard_line = card_lines[0].strip() if card_lines and len(card_lines) > 0 else "Karta ma'lumoti yo'q"
     visa_line = card_lines[1].strip() if card_lines and len(card_lines) > 1 else "Karta ma'lumoti yo'q"
     return {
-        "uz": {
-            "welcome": "🌟 *Xush kelibsiz!* 🌟\nIltimos, o'zingiz uchun mos tilni tanlang 👇",
-            "questions_answers": "📝 Savol va Javoblar",
-            "road_signs": "🚦 Yo'l Belgilari",
-            "truck_parts": "🚚 Truck Ehtiyot Qismlari",
-            "language_settings": "⚙️ Til Sozlamalari",
-            "success_message": "✅ *Tabriklaymiz!* 🎉 Botdan foydalanishingiz mumkin! 🚀",
-            "payment_required": f"💰 Botdan foydalanish uchun ${payment_info['amount']} to'lov qiling va chekni yuboring 📸\n\n"
-                               f"🌐 Karta ma'lumotlari:\n"
-                               f"  💳 Uzcard: *{uzcard_line.split('Uzcard:')[1].strip().replace('*', '') if 'Uzcard:' in uzcard_line else uzcard_line}*\n"
-                               f"  💳 Visa:   *{visa_line.split('Visa:')[1].strip().replace('*', '') if 'Visa:' in visa_line else visa_line}*\n"
-                               f"👤 Karta egasi: {payment_info['owner']}",
-            "select_new_language": "🌐 *Yangi tilni tanlang:* 👇",
-            "language_saved": "✅ *Til saqlandi!* 🌟 Endi botni o'zingiz uchun sozlang!",
-            "payment_received": "📩 *Chek qabul qilindi!* ✅ Admin tasdiqlashini kuting ⏳",
-            "payment_already_pending": "⚠️ *Diqqat!* Sizning oldingi chekingiz hali ko'rib chiqilmoqda. Iltimos, kuting! ⏳",
-            "no_access": "❌ *Ruxsat yo'q!* 💡 Botdan foydalanish uchun to'lov qiling.",
-            "no_data": "⚠️ *Diqqat!* Bu bo'limda hozircha ma'lumot yo'q. Keling, keyinroq urinib ko'ramiz! 😊",
-            "select_section": "📋 *Iltimos, menyudan bo'lim tanlang:* 👇",
-            "error_occurred": "🚫 *Xatolik yuz berdi!* 😔 Iltimos, qayta urinib ko'ring.",
-            "item_not_found": "🔍 *Element topilmadi!* Iltimos, boshqa elementni tanlang.",
-            "forward_prohibited": "⚠️ *Forward taqiqlangan!* 🚫 Xabarni qayta yubormang.",
-            "previous": "⬅️ Oldingi",
-            "next": "Keyingi ➡️",
-            "question": "📝 Savol",
-            "road_sign": "🚦 Yo'l Belgisi",
-            "truck_part": "🚚 Truck Ehtiyot Qismi",
-            "questions_list": "📚 *Savol va Javoblar Ro'yxati:*",
-            "road_signs_list": "🚦 *Yo'l Belgilari Ro'yxati:*",
-            "truck_parts_list": "🚚 *Truck Ehtiyot Qismlari Ro'yxati:*",
-            "question_label": "📌 *Savol:*",
-            "answer_label": "💡 *Javob:*",
-            "audio_caption": "🎵 *Savol Audiosi*",
-            "back_to_menu": "🔙 Orqaga",
-            "payment_rejected": "❌ *Kechirasiz, to'lovingiz rad etildi! Iltimos, qayta urinib ko'ring.*"
-        },
-        "ru": {
-            "welcome": "🌟 *Добро пожаловать!* 🌟\nПожалуйста, выберите язык 👇",
-            "questions_answers": "📝 Вопросы и ответы",
-            "road_signs": "🚦 Дорожные знаки",
-            "truck_parts": "🚚 Запчасти для грузовиков",
-            "language_settings": "⚙️ Настройки языка",
-            "success_message": "✅ *Поздравляем!* 🎉 Вы можете использовать бота! 🚀",
-            "payment_required": f"💰 Оплатите ${payment_info['amount']} для использования бота и отправьте чек 📸\n\n"
-                               f"🌐 Информация о карте:\n"
-                               f"  💳 Uzcard: *{uzcard_line.split('Uzcard:')[1].strip().replace('*', '') if 'Uzcard:' in uzcard_line else uzcard_line}*\n"
-                               f"  💳 Visa:   *{visa_line.split('Visa:')[1].strip().replace('*', '') if 'Visa:' in visa_line else visa_line}*\n"
-                               f"👤 Владелец карты: {payment_info['owner']}",
-            "select_new_language": "🌐 *Выберите новый язык:* 👇",
-            "language_saved": "✅ *Язык сохранен!* 🌟 Настройте бота под себя!",
-            "payment_received": "📩 *Чек принят!* ✅ Ожидайте подтверждения администратора ⏳",
-            "payment_already_pending": "⚠️ *Внимание!* Ваш предыдущий чек еще рассматривается. Пожалуйста, подождите! ⏳",
-            "no_access": "❌ *Нет доступа!* 💡 Оплатите, чтобы использовать бота.",
-            "no_data": "⚠️ *Внимание!* В этом разделе пока нет данных. Попробуем позже! 😊",
-            "select_section": "📋 *Выберите раздел из меню:* 👇",
-            "error_occurred": "🚫 *Произошла ошибка!* 😔 Пожалуйста, попробуйте снова.",
-            "item_not_found": "🔍 *Элемент не найден!* Выберите другой элемент.",
-            "forward_prohibited": "⚠️ *Пересылка запрещена!* 🚫 Не отправляйте сообщения повторно.",
-            "previous": "⬅️ Предыдущая",
-            "next": "Следующая ➡️",
-            "question": "📝 Вопрос",
-            "road_sign": "🚦 Дорожный знак",
-            "truck_part": "🚚 Запчасть грузовика",
-            "questions_list": "📚 *Список вопросов и ответов:*",
-            "road_signs_list": "🚦 *Список дорожных знаков:*",
-            "truck_parts_list": "🚚 *Список запчастей для грузовиков:*",
-            "question_label": "📌 *Вопрос:*",
-            "answer_label": "💡 *Ответ:*",
-            "audio_caption": "🎵 *Аудио вопроса*",
-            "back_to_menu": "🔙 Назад",
-            "payment_rejected": "❌ *К сожалению, ваш платеж отклонен! Пожалуйста, попробуйте снова.*"
-        },
-        "es": {
-            "welcome": "🌟 *¡Bienvenido!* 🌟\nPor favor, selecciona un idioma 👇",
-            "questions_answers": "📝 Preguntas y respuestas",
-            "road_signs": "🚦 Señales de tráfico",
-            "truck_parts": "🚚 Piezas de camiones",
-            "language_settings": "⚙️ Configuración de idioma",
-            "success_message": "✅ *¡Felicidades!* 🎉 ¡Puedes usar el bot! 🚀",
-            "payment_required": f"💰 Paga ${payment_info['amount']} para usar el bot y envía el recibo 📸\n\n"
-                               f"🌐 Información de la tarjeta:\n"
-                               f"  💳 Uzcard: *{uzcard_line.split('Uzcard:')[1].strip().replace('*', '') if 'Uzcard:' in uzcard_line else uzcard_line}*\n"
-                               f"  💳 Visa:   *{visa_line.split('Visa:')[1].strip().replace('*', '') if 'Visa:' in visa_line else visa_line}*\n"
-                               f"👤 Titular de la tarjeta: {payment_info['owner']}",
-            "select_new_language": "🌐 *Selecciona un nuevo idioma:* 👇",
-            "language_saved": "✅ *¡Idioma guardado!* 🌟 ¡Personaliza el bot!",
-            "payment_received": "📩 *¡Recibo recibido!* ✅ Espera la confirmación del administrador ⏳",
-            "payment_already_pending": "⚠️ *¡Atención!* Tu recibo anterior aún está siendo revisado. ¡Por favor, espera! ⏳",
-            "no_access": "❌ *¡Sin acceso!* 💡 Realiza el pago para usar el bot.",
-            "no_data": "⚠️ *¡Atención!* No hay datos en esta sección. ¡Intentémoslo más tarde! 😊",
-            "select_section": "📋 *Por favor, selecciona una sección del menú:* 👇",
-            "error_occurred": "🚫 *¡Ocurrió un error!* 😔 Inténtalo de nuevo.",
-            "item_not_found": "🔍 *¡Elemento no encontrado!* Selecciona otro elemento.",
-            "forward_prohibited": "⚠️ *¡Reenvío prohibido!* 🚫 No reenvíes mensajes.",
-            "previous": "⬅️ Anterior",
-            "next": "Siguiente ➡️",
-            "question": "📝 Pregunta",
-            "road_sign": "🚦 Señal de tráfico",
-            "truck_part": "🚚 Pieza de camión",
-            "questions_list": "📚 *Lista de preguntas y respuestas:*",
-            "road_signs_list": "🚦 *Lista de señales de tráfico:*",
-            "truck_parts_list": "🚚 *Lista de piezas de camiones:*",
-            "question_label": "📌 *Pregunta:*",
-            "answer_label": "💡 *Respuesta:*",
-            "audio_caption": "🎵 *Audio de la pregunta*",
-            "back_to_menu": "🔙 Atrás",
-            "payment_rejected": "❌ *¡Lo sentimos, tu pago ha sido rechazado! Por favor, inténtalo de nuevo.*"
-        }
+        "amount": payment_info['amount'],
+        "uzcard": uzcard_line.split('Uzcard:')[1].strip().replace('*', '') if 'Uzcard:' in uzcard_line else uzcard_line,
+        "visa": visa_line.split('Visa:')[1].strip().replace('*', '') if 'Visa:' in visa_line else visa_line,
+        "owner": payment_info['owner'],
     }
 
+
+# Sozlamalar o'zgarganda to'lov shablonlari darhol qayta yoziladi
+settings_db.subscribe(lambda settings: localization.set_context(**payment_context(get_payment_info())))
+
+
+async def get_messages_async():
+    """Barcha tillarning tayyor xabarlarini qaytaradi"""
+    return localization.all_messages()
+
 async def get_message_async(language: str, key: str) -> str:
     """Lokalizatsiya xabarini async tarzda olish"""
-    messages = await get_messages_async()
-    return messages.get(language, messages["uz"]).get(key, messages["uz"].get(key, "Xabar topilmadi"))
+    return localization.get(language, key)
 
-def get_language_inline_keyboard():
-    """Language selection keyboard"""
+def _build_language_inline_keyboard():
     return InlineKeyboardMarkup(row_width=1).add(
         InlineKeyboardButton("🇺🇿 O‘zbek tili", callback_data="lang_uz"),
         InlineKeyboardButton("🇷🇺 Русский язык", callback_data="lang_ru"),
         InlineKeyboardButton("🇪🇸 Español", callback_data="lang_es")
     )
 
-async def get_main_menu(language: str):
-    """Main menu keyboard"""
+def get_language_inline_keyboard():
+    """Language selection keyboard"""
+    return keyboard_cache.get(None, "language", _build_language_inline_keyboard)
+
+def _build_main_menu(language: str):
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
     keyboard.add(
-        KeyboardButton(await get_message_async(language, "questions_answers")),
-        KeyboardButton(await get_message_async(language, "road_signs"))
+        KeyboardButton(localization.get(language, "questions_answers")),
+        KeyboardButton(localization.get(language, "road_signs"))
     )
     keyboard.add(
-        KeyboardButton(await get_message_async(language, "truck_parts")),
-        KeyboardButton(await get_message_async(language, "language_settings"))
+        KeyboardButton(localization.get(language, "truck_parts")),
+        KeyboardButton(localization.get(language, "language_settings"))
     )
     return keyboard
 
-async def get_pagination_buttons(section: str, page: int, total_items: int, language: str, items_per_page: int = 10):
-    """Pagination buttons"""
+async def get_main_menu(language: str):
+    """Main menu keyboard"""
+    return keyboard_cache.get(language, "main_menu", lambda: _build_main_menu(language))
+
+ITEMS_PER_PAGE = 10
+
+def get_pagination_buttons(section: str, page: int, total_items: int, language: str, items,
+                           items_per_page: int = ITEMS_PER_PAGE):
+    """Pagination buttons
+
+    Callback: page_{section}_{page}_{after_display_id}_{language}. display_id lar
+    har bir til uchun 1 dan ketma-ket bo'lgani uchun oldingi sahifa kursori
+    joriy sahifaning birinchi elementidan hisoblanadi.
+    """
     keyboard = InlineKeyboardMarkup(row_width=2)
+    if not items:
+        return keyboard
     total_pages = (total_items + items_per_page - 1) // items_per_page
     if page > 1:
+        prev_after = max(items[0]["display_id"] - 1 - items_per_page, 0)
         keyboard.insert(InlineKeyboardButton(
-            await get_message_async(language, "previous"),
-            callback_data=f"page_{section}_{page - 1}_{language}"
+            localization.get(language, "previous"),
+            callback_data=f"page_{section}_{page - 1}_{prev_after}_{language}"
         ))
     if page < total_pages:
         keyboard.insert(InlineKeyboardButton(
-            await get_message_async(language, "next"),
-            callback_data=f"page_{section}_{page + 1}_{language}"
+            localization.get(language, "next"),
+            callback_data=f"page_{section}_{page + 1}_{items[-1]['display_id']}_{language}"
         ))
     return keyboard
 
-async def get_section_items_keyboard(items, section: str, language: str, page: int, total_items: int):
-    """Section items keyboard with pagination"""
+def parse_page_callback(data: str, items_per_page: int = ITEMS_PER_PAGE):
+    """Paginatsiya callback'idan (section, page, after_display_id, language) ni ajratadi."""
+    # page_{section}_{page}_{after}_{language}: bo'lim nomida "_" bo'lishi mumkin (road_sign, truck_part)
+    parts = data[len("page_"):].rsplit("_", 3)
+    if len(parts) == 4 and parts[1].isdigit() and parts[2].isdigit():
+        return parts[0], int(parts[1]), int(parts[2]), parts[3]
+    # Eski formatdagi tugmalar: page_{section}_{page}_{language}
+    section, page, language = data[len("page_"):].rsplit("_", 2)
+    page = int(page)
+    return section, page, (page - 1) * items_per_page, language
+
+def _build_section_items_keyboard(items, section: str, language: str, page: int, total_items: int):
     keyboard = InlineKeyboardMarkup(row_width=1)
     for item in items or []:
-        if item and isinstance(item, dict):
-            real_id = item.get("id")
-            display_id = item.get("display_id", real_id)
-            content = item.get("question", item.get("description", item.get("name", "Kontent yo‘q")))
-            content_preview = (content[:50] + "..." if len(str(content)) > 50 else content)
-            display_text = f"#{display_id}: {content_preview}"
-            keyboard.add(InlineKeyboardButton(display_text, callback_data=f"{section}_{real_id}"))
-    pagination_keyboard = await get_pagination_buttons(section, page, total_items, language)
+        real_id = item.get("id")
+        display_id = item.get("display_id", real_id)
+        content = item.get("question", item.get("description", item.get("name", "Kontent yo‘q")))
+        content_preview = (content[:50] + "..." if len(str(content)) > 50 else content)
+        display_text = f"#{display_id}: {content_preview}"
+        keyboard.add(InlineKeyboardButton(display_text, callback_data=f"{section}_{real_id}"))
+    pagination_keyboard = get_pagination_buttons(section, page, total_items, language, items)
     if pagination_keyboard.inline_keyboard:
         keyboard.row(*pagination_keyboard.inline_keyboard[0])
-    keyboard.add(InlineKeyboardButton(await get_message_async(language, "back_to_menu"), callback_data="back_to_menu"))
+    keyboard.add(InlineKeyboardButton(localization.get(language, "back_to_menu"), callback_data="back_to_menu"))
     return keyboard
 
+async def get_section_items_keyboard(items, section: str, language: str, page: int, total_items: int):
+    """Section items keyboard with pagination
+
+    Sahifa klaviaturasi (bo'lim, sahifa, birinchi display_id) va katalog
+    versiyasi bo'yicha keshlanadi: bo'lim o'zgarganda versiya oshadi.
+    """
+    first_display_id = items[0]["display_id"] if items else 0
+    return keyboard_cache.get(
+        language, f"items_{section}",
+        lambda: _build_section_items_keyboard(items, section, language, page, total_items),
+        page=(page, first_display_id, total_items), version=sections_db.catalog.version(section, language))
+
+# Reply-klaviatura matnlari uchun router: tarjimalar o'zgarmaguncha qayta qurilmaydi
+text_router = TextRouter(localization, {
+    "questions_answers": ("section", "question"),
+    "road_signs": ("section", "road_sign"),
+    "truck_parts": ("section", "truck_part"),
+    "language_settings": ("language_settings", None),
+    "back_to_menu": ("back", None),
+})
+
 async def get_section_type_from_text(text: str) -> str:
     """Determine section type from button text"""
-    messages = await get_messages_async()
-    section_mapping = {}
-    for lang in messages:
-        section_mapping[messages[lang]["questions_answers"]] = "question"
-        section_mapping[messages[lang]["road_signs"]] = "road_sign"
-        section_mapping[messages[lang]["truck_parts"]] = "truck_part"
-    return section_mapping.get(text)
+    route = text_router.resolve(text)
+    return route[1] if route and route[0] == "section" else None
 
 async def get_section_list_title(section: str, language: str) -> str:
     """Get section list title"""
@@ -270,11 +174,8 @@ async def get_section_list_title(section: str, language: str) -> str:
 
 async def is_language_settings_text(text: str) -> bool:
     """Check if text is language settings button"""
-    messages = await get_messages_async()
-    for lang in messages:
-        if text == messages[lang]["language_settings"]:
-            return True
-    return False
+    route = text_router.resolve(text)
+    return bool(route) and route[0] == "language_settings"
 
 @dp.message_handler(CommandStart())
 async def bot_start(message: types.Message, state: FSMContext):
@@ -327,8 +228,10 @@ async def handle_text_messages(message: types.Message, state: FSMContext):
     user_id = message.from_user.id
     user_language = await user_db.get_user_language(telegram_id=user_id) or "uz"
 
+    action, argument = text_router.resolve(message.text) or (None, None)
+
     # Til sozlamalari tekshiruvi
-    if await is_language_settings_text(message.text):
+    if action == "language_settings":
         await message.answer(
             await get_message_async(user_language, "select_new_language"),
             reply_markup=get_language_inline_keyboard(),
@@ -340,7 +243,7 @@ async def handle_text_messages(message: types.Message, state: FSMContext):
         return
 
     # Bo'lim tanlash tekshiruvi
-    section = await get_section_type_from_text(message.text)
+    section = argument if action == "section" else None
     if section is not None:
         try:
             user = await user_db.select_user(telegram_id=user_id)
@@ -366,16 +269,9 @@ async def handle_text_messages(message: types.Message, state: FSMContext):
 
             await user_db.update_last_active(telegram_id=user_id)
 
-            items = []
-            if section == "question":
-                items = await sections_db.get_questions(language=user_language)
-            elif section == "road_sign":
-                items = await sections_db.get_road_signs(language=user_language)
-            elif section == "truck_part":
-                items = await sections_db.get_truck_parts(language=user_language)
-
-            valid_items = [item for item in items if item and isinstance(item, dict)]
-            if not valid_items:
+            page = 1
+            paginated_items, total_items = await sections_db.get_page(section, user_language, 0, ITEMS_PER_PAGE)
+            if not total_items:
                 await message.answer(
                     await get_message_async(user_language, "no_data"),
                     parse_mode="Markdown",
@@ -383,15 +279,10 @@ async def handle_text_messages(message: types.Message, state: FSMContext):
                 )
                 return
 
-            items_per_page = 10
-            page = 1
-            start_idx = (page - 1) * items_per_page
-            paginated_items = valid_items[start_idx:start_idx + items_per_page]
-
             await message.answer(
                 await get_section_list_title(section, user_language),
                 reply_markup=await get_section_items_keyboard(paginated_items, section, user_language, page,
-                                                              len(valid_items)),
+                                                              total_items),
                 parse_mode="Markdown",
                 protect_content=True
             )
@@ -407,7 +298,7 @@ async def handle_text_messages(message: types.Message, state: FSMContext):
             )
             return
 
-    # Boshqa xabarlar uchun
+    # "Orqaga" va boshqa xabarlar uchun: asosiy menyu (to'lov kutilayotgan bo'lsa, eslatma)
     current_state = await state.get_state()
     if current_state == UserStates.WAITING_FOR_PAYMENT.state:
         await message.answer(
@@ -490,7 +381,7 @@ async def handle_payment_photo(message: types.Message, state: FSMContext):
             return
 
         # Real vaqtda to'lov ma'lumotlarini olish
-        payment_info = await payment_cache.get_payment_info()
+        payment_info = get_payment_info()
 
         payment_id = await payment_db.add_payment(
             telegram_id=user_id,
@@ -537,35 +428,23 @@ async def handle_payment_photo(message: types.Message, state: FSMContext):
             InlineKeyboardButton("❌ Rad Qilish", callback_data=f"disallow_{user_id}")
         )
 
-        for admin_id in ADMINS:
-            try:
-                await bot.send_photo(
-                    chat_id=admin_id,
-                    photo=photo_file_id,
-                    caption=admin_message,
-                    reply_markup=payment_keyboard,
-                    parse_mode="MarkdownV2"
-                )
-            except Exception as admin_error:
-                logging.error(f"Admin {admin_id} ga xabar yuborishda xatolik: {admin_error}")
-                # Zaxira xabar, Markdownsiz
-                try:
-                    await bot.send_photo(
-                        chat_id=admin_id,
-                        photo=photo_file_id,
-                        caption=(
-                            f"Yangi to'lov cheki!\n\n"
-                            f"Foydalanuvchi ID: {user_id}\n"
-                            f"Username: @{username}\n"
-                            f"To'lov summasi: ${payment_info['amount']}\n"
-                            f"Vaqt: {current_time}\n\n"
-                            f"Tasdiqlash: /allow {user_id}\n"
-                            f"Rad qilish: /disallow {user_id}"
-                        ),
-                        reply_markup=payment_keyboard
-                    )
-                except Exception as fallback_error:
-                    logging.error(f"Zaxira xabar ham yuborilmadi: {fallback_error}")
+        fallback_caption = (
+            f"Yangi to'lov cheki!\n\n"
+            f"Foydalanuvchi ID: {user_id}\n"
+            f"Username: @{username}\n"
+            f"To'lov summasi: ${payment_info['amount']}\n"
+            f"Vaqt: {current_time}\n\n"
+            f"Tasdiqlash: /allow {user_id}\n"
+            f"Rad qilish: /disallow {user_id}"
+        )
+        # Adminlarga parallel, fonda yuboriladi; MarkdownV2 xato bersa, zaxira xabar (Markdownsiz)
+        broadcaster.schedule(
+            ADMINS,
+            lambda admin_id: bot.send_photo(chat_id=admin_id, photo=photo_file_id, caption=admin_message,
+                                            reply_markup=payment_keyboard, parse_mode="MarkdownV2"),
+            fallback=lambda admin_id: bot.send_photo(chat_id=admin_id, photo=photo_file_id, caption=fallback_caption,
+                                                     reply_markup=payment_keyboard)
+        )
 
         await state.finish()
         logging.info(f"To'lov yuborildi: user_id={user_id}, payment_id={payment_id}, amount=${payment_info['amount']}")
@@ -580,31 +459,18 @@ async def handle_payment_photo(message: types.Message, state: FSMContext):
 
 
 @dp.callback_query_handler(lambda c: c.data.startswith("page_"))
+@rate_limit(0.3, key="pagination")
 async def handle_pagination(callback_query: types.CallbackQuery, state: FSMContext):
     """Pagination handler"""
     try:
         user_id = callback_query.from_user.id
-        data_parts = callback_query.data.split("_")
-        section = data_parts[1]
-        page = int(data_parts[2])
-        language = data_parts[3]
+        section, page, after, language = parse_page_callback(callback_query.data)
 
-        items = []
-        if section == "question":
-            items = await sections_db.get_questions(language=language)
-        elif section == "road_sign":
-            items = await sections_db.get_road_signs(language=language)
-        elif section == "truck_part":
-            items = await sections_db.get_truck_parts(language=language)
-
-        valid_items = [item for item in items if item and isinstance(item, dict)]
-        items_per_page = 10
-        start_idx = (page - 1) * items_per_page
-        paginated_items = valid_items[start_idx:start_idx + items_per_page]
+        paginated_items, total_items = await sections_db.get_page(section, language, after, ITEMS_PER_PAGE)
 
         await callback_query.message.edit_text(
             await get_section_list_title(section, language),
-            reply_markup=await get_section_items_keyboard(paginated_items, section, language, page, len(valid_items)),
+            reply_markup=await get_section_items_keyboard(paginated_items, section, language, page, total_items),
             parse_mode="Markdown"
         )
         await callback_query.answer()
@@ -1074,11 +940,9 @@ async def reload_config_command(message: types.Message):
     admin_id = message.from_user.id
 
     try:
-        # Clear cache
-        payment_cache.clear_cache()
-
-        # Get updated payment info
-        payment_info = await payment_cache.get_payment_info()
+        # Sozlamalarni bazadan qayta o'qish (obunachilar yangilanadi)
+        await settings_db.load()
+        payment_info = get_payment_info()
 
         if not payment_info:
             await message.answer("❌ To'lov ma'lumotlarini olishda xatolik!")
@@ -1109,7 +973,7 @@ async def handle_unexpected_message(message: types.Message, state: FSMContext):
         user = await user_db.select_user(telegram_id=user_id)
         user_language = user.get("language", "uz") if user else "uz"
 
-        # Skip text messages - they are handled elsewhere
+        # Matnli xabarlarni (tugmalar ham) yuqorida ro'yxatdan o'tgan handle_text_messages oladi
         if message.content_type == types.ContentType.TEXT:
             return
 
@@ -0,0 +1,41 @@
+# cache.py: tillar bo'yicha oldindan yig'ilgan klaviaturalar keshi
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from utils.db_api.cache import LRUCache
+
+
+class KeyboardCache:
+    """(til, tur, sahifa, versiya) kaliti bo'yicha tayyor klaviaturalar keshi.
+
+    Klaviatura bir marta yig'iladi va JSON matni sifatida saqlanadi: aiogram
+    ``reply_markup`` ga berilgan satrni o'zgarishsiz yuboradi, shuning uchun
+    har bir xabarda markup obyektlari qayta yaratilmaydi va seriyalanmaydi.
+    Bo'lim klaviaturalari kalitiga katalog versiyasi kiradi, tarjimalar
+    o'zgarganda esa (``localization.subscribe``) butun kesh tozalanadi.
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self._cache = LRUCache(maxsize=maxsize, ttl=None)
+
+    def get(self, language: Optional[str], kind: str, build: Callable[[], Any],
+            page: Hashable = None, version: int = 0) -> str:
+        """Tayyor klaviaturani qaytaradi; keshda bo'lmasa ``build()`` bilan yig'adi."""
+        key = (language, kind, page, version)
+        markup = self._cache.get(key)
+        if markup is None:
+            markup = build().as_json()
+            self._cache.set(key, markup)
+        return markup
+
+    def clear(self, *_: Any) -> None:
+        """Barcha klaviaturalarni bekor qiladi (tarjimalar o'zgarganda)."""
+        self._cache.clear()
+        logging.info("Klaviatura keshi tozalandi")
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+# Barcha handlerlar uchun umumiy nusxa
+keyboard_cache = KeyboardCache()
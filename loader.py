@@ -1,14 +1,45 @@
 
-from aiogram import Bot, Dispatcher, types
-from aiogram.contrib.fsm_storage.memory import MemoryStorage
+from aiogram import Dispatcher, types
+from aiogram.bot.api import TELEGRAM_PRODUCTION, TelegramAPIServer
 from utils.db_api.users import UserDatabase
 from utils.db_api.sections import SectionsDatabase
 from utils.db_api.payment import PaymentDatabase
+from utils.db_api.settings import SettingsDatabase
+from utils.db_api.fsm_storage import SQLiteStorage
+from utils.db_api.instrumentation import sql_instrumentation
+from utils.db_api.pool import configure_pools
 from data import config
+from data.messages import USER_MESSAGES
+from utils.misc.localization import Localization
+from utils.misc.broadcast import broadcaster
+from utils.misc.outbound import OutboundScheduler, ScheduledBot
+from keyboards.cache import keyboard_cache
 
-bot = Bot(token=config.BOT_TOKEN, parse_mode=types.ParseMode.HTML)
-storage = MemoryStorage()
+# Worker'lar bitta bot tokenini bo'lishadi, shuning uchun umumiy tezlik cheklovlari ular orasida bo'linadi
+shards = config.WORKERS if config.BOT_MODE == "worker" else 1
+# Admin chatlariga hamma worker'lar va front (digest, ishga tushish xabari) yozadi
+admin_shares = config.WORKERS + 1 if config.BOT_MODE in ("worker", "sharded") else 1
+# Barcha chiquvchi xabarlar tezlik cheklovlari va ustuvorliklar bilan navbat orqali yuboriladi
+# BOT_API_SERVER berilsa (lokal Bot API yoki yuklama testi uchun soxta server), so'rovlar o'sha yerga yuboriladi
+bot = ScheduledBot(token=config.BOT_TOKEN, parse_mode=types.ParseMode.HTML,
+                   server=TelegramAPIServer.from_base(config.BOT_API_SERVER) if config.BOT_API_SERVER
+                   else TELEGRAM_PRODUCTION,
+                   scheduler=OutboundScheduler(global_rate=config.OUTBOUND_GLOBAL_RATE / shards,
+                                               chat_rate=config.OUTBOUND_CHAT_RATE,
+                                               chat_burst=config.OUTBOUND_CHAT_BURST,
+                                               max_retries=config.OUTBOUND_MAX_RETRIES,
+                                               shared_chats=config.ADMINS, shares=admin_shares))
+# FSM holatlari: xotirada chegaralangan issiq qatlam + SQLite (qayta ishga tushishda saqlanadi)
+storage = SQLiteStorage(path_to_db="data/fsm.db", hot_size=config.FSM_HOT_SIZE, hot_ttl=config.FSM_HOT_TTL,
+                        state_ttl=config.FSM_STATE_TTL, flush_interval=config.FSM_FLUSH_INTERVAL)
 dp = Dispatcher(bot, storage=storage)
-user_db = UserDatabase(path_to_db="data/user.db")
+configure_pools(pragmas=config.SQLITE_PRAGMAS)
+sql_instrumentation.configure(timing=config.SQL_TIMING, slow_query_ms=config.SQL_SLOW_QUERY_MS,
+                              trace_sample_rate=config.SQL_TRACE_SAMPLE_RATE)
+broadcaster.configure(concurrency=config.BROADCAST_CONCURRENCY)
+user_db = UserDatabase(path_to_db="data/user.db", cache_size=config.USER_CACHE_SIZE, cache_ttl=config.USER_CACHE_TTL)
 payment_db = PaymentDatabase(path_to_db="data/payment.db")
 sections_db = SectionsDatabase(path_to_db="data/sections.db")
+settings_db = SettingsDatabase(path_to_db="data/settings.db", defaults=config.SETTINGS_DEFAULTS)
+localization = Localization(USER_MESSAGES)
+localization.subscribe(keyboard_cache.clear)
@@ -0,0 +1,3 @@
+# loadtest: soxta Bot API va sessiyalarni qayta o'ynash orqali botni yuklama ostida o'lchash
+from .fake_api import FakeBotAPI
+from .runner import LoadTest, Report, Scenario
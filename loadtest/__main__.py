@@ -0,0 +1,75 @@
+# Yuklama testi: python -m loadtest --help
+import argparse
+import asyncio
+import logging
+
+from .runner import LoadTest, Scenario
+
+# --matrix: polling va webhook kechikishlarini, sharded rejimning worker soni bo'yicha o'sishini solishtirish
+MATRIX = [
+    Scenario("polling"),
+    Scenario("webhook"),
+    Scenario("sharded", workers=1),
+    Scenario("sharded", workers=2),
+    Scenario("sharded", workers=4),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest",
+        description="Botni soxta Bot API bilan ishga tushirib, foydalanuvchi sessiyalarini qayta o'ynaydi "
+                    "(/start -> til -> to'lov -> tasdiq -> menyu -> bo'lim -> sahifa -> element).")
+    parser.add_argument("--mode", choices=("polling", "webhook", "sharded"), default="polling")
+    parser.add_argument("--workers", type=int, default=2, help="sharded rejimida worker'lar soni")
+    parser.add_argument("--upstream", choices=("polling", "webhook"), default="webhook",
+                        help="sharded rejimida front update'larni qanday oladi")
+    parser.add_argument("--matrix", action="store_true",
+                        help="polling, webhook va sharded x1/x2/x4 stsenariylarini ketma-ket ishga tushirish")
+    parser.add_argument("--sessions", type=int, default=100, help="sessiyalar soni")
+    parser.add_argument("--rate", type=float, default=5.0, help="yangi sessiyalar tezligi (sessiya/soniya)")
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="qadamlar orasidagi o'rtacha o'ylash vaqti (soniya); 0 - maksimal o'tkazuvchanlik")
+    parser.add_argument("--pages", type=int, default=1, help="har bir sessiyada ochiladigan sahifalar")
+    parser.add_argument("--items", type=int, default=30, help="har bir bo'lim/til uchun elementlar")
+    parser.add_argument("--paid-ratio", type=float, default=1.0,
+                        help="to'lov va admin tasdig'idan o'tadigan sessiyalar ulushi (0..1); qolganlari "
+                             "ruxsatga ega foydalanuvchi sifatida bazaga oldindan yoziladi")
+    parser.add_argument("--latency", type=float, default=0.0, help="soxta API javob kechikishi (soniya)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="kechikishga qo'shiladigan tasodifiy qism (soniya)")
+    parser.add_argument("--retry-after-rate", type=float, default=0.0,
+                        help="yuborishlarning 429 (RetryAfter) qaytariladigan ulushi (0..1)")
+    parser.add_argument("--api-port", type=int, default=8081)
+    parser.add_argument("--webapp-port", type=int, default=8080)
+    parser.add_argument("--worker-port-base", type=int, default=8100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="bot jarayoni uchun qo'shimcha muhit o'zgaruvchisi (masalan, OUTBOUND_GLOBAL_RATE=1000)")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    env = dict(item.split("=", 1) for item in args.env)
+    scenarios = MATRIX if args.matrix else [Scenario(args.mode, args.workers, args.upstream)]
+    reports = []
+    for scenario in scenarios:
+        test = LoadTest(scenario, sessions=args.sessions, rate=args.rate, think=args.think, pages=args.pages,
+                        items=args.items, paid_ratio=args.paid_ratio, api_port=args.api_port, webapp_port=args.webapp_port,
+                        worker_port_base=args.worker_port_base, latency=args.latency, jitter=args.jitter,
+                        retry_after_rate=args.retry_after_rate, seed=args.seed, env=env)
+        report = await test.run()
+        print("\n".join(report.lines()), flush=True)
+        reports.append(report)
+
+    if len(reports) > 1:
+        print("\nscenario               updates/s   p50_ms    p95_ms    p99_ms    completed")
+        for report in reports:
+            total = report.summary()
+            print(f"{report.scenario.name:<22} {report.updates / report.duration:<11.1f} {total['p50_ms']:<9} "
+                  f"{total['p95_ms']:<9} {total['p99_ms']:<9} {report.completed}/{report.sessions}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
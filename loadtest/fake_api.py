@@ -0,0 +1,229 @@
+# fake_api.py: yuklama testi uchun soxta Telegram Bot API serveri
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+BOT_USER = {"id": 100000001, "is_bot": True, "first_name": "LoadTest", "username": "loadtest_bot"}
+
+# Javob sifatida Message qaytaradigan metodlar
+MESSAGE_METHODS = frozenset({
+    "sendMessage", "sendPhoto", "sendAudio", "sendVoice", "sendDocument", "sendVideo", "sendAnimation",
+    "sendSticker", "sendLocation", "sendContact", "copyMessage", "forwardMessage",
+    "editMessageText", "editMessageCaption", "editMessageMedia", "editMessageReplyMarkup",
+})
+# Fayl sifatida yuboriladigan maydonlar (javobdagi Message ga qo'shiladi)
+MEDIA_FIELDS = ("photo", "audio", "voice", "document", "video", "animation")
+
+
+class Call:
+    """Bot qilgan bitta Bot API so'rovi."""
+    __slots__ = ("method", "params", "chat_id", "at", "status")
+
+    def __init__(self, method: str, params: Dict[str, Any], chat_id: Optional[int], at: float, status: int):
+        self.method = method
+        self.params = params
+        self.chat_id = chat_id
+        self.at = at
+        self.status = status
+
+
+class FakeBotAPI:
+    """Bot ``BOT_API_SERVER`` orqali ulanadigan, jarayon ichidagi soxta Bot API.
+
+    * har bir so'rov ``calls`` ga yoziladi; yuborilgan xabarlar haqiqiy
+      ``Message`` ko'rinishida (message_id, chat, reply_markup) qaytariladi;
+    * ``latency`` (+ ``jitter``) soniya kechiktirish bilan javob beradi;
+    * yuborish metodlarining ``retry_after_rate`` ulushiga 429
+      (``RetryAfter``) qaytaradi;
+    * ``getUpdates`` uchun ``push_update`` bilan to'ldiriladigan navbatni beradi
+      (polling rejimini sinash uchun).
+
+    Chatga javob kelganini kutish uchun ``wait_reply`` ishlatiladi: chatga
+    tegishli istalgan so'rov (yoki shu chatdagi callback javobi) javob hisoblanadi.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, retry_after_rate: float = 0.0,
+                 retry_after: int = 1, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.retry_after_rate = retry_after_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.calls: List[Call] = []
+        self.retry_after_sent = 0
+        self._message_id = 0
+        # chat_id -> {message_id: reply_markup}
+        self._markups: Dict[int, Dict[int, Any]] = defaultdict(dict)
+        self._last_markup: Dict[int, int] = {}
+        self._markup_counts: Dict[int, int] = defaultdict(int)
+        # callback_query_id -> chat_id (answerCallbackQuery da chat_id yo'q)
+        self._callbacks: Dict[str, int] = {}
+        self._replies: Dict[int, List[float]] = defaultdict(list)
+        # chat_id -> [(after, future)]: wait_reply kutayotganlar
+        self._waiters: Dict[int, List[tuple]] = defaultdict(list)
+        self._updates: List[Dict[str, Any]] = []
+        self._update_event: Optional[asyncio.Event] = None
+        self._runner: Optional[web.AppRunner] = None
+        self.webhook_url = ""
+        self.seen: Dict[str, int] = defaultdict(int)
+
+    @property
+    def updates_ready(self) -> asyncio.Event:
+        # Event ishlayotgan event loop ichida yaratiladi
+        if self._update_event is None:
+            self._update_event = asyncio.Event()
+        return self._update_event
+
+    # --- replayer uchun ---
+
+    def register_callback(self, callback_query_id: str, chat_id: int) -> None:
+        self._callbacks[callback_query_id] = chat_id
+
+    def push_update(self, update: Dict[str, Any]) -> None:
+        """Update'ni ``getUpdates`` navbatiga qo'shadi."""
+        self._updates.append(update)
+        self.updates_ready.set()
+
+    def last_markup(self, chat_id: int) -> Optional[tuple]:
+        """Chatga yuborilgan oxirgi klaviaturani (message_id, reply_markup) qaytaradi."""
+        message_id = self._last_markup.get(chat_id)
+        return (message_id, self._markups[chat_id][message_id]) if message_id is not None else None
+
+    def reply_count(self, chat_id: int) -> int:
+        return len(self._replies.get(chat_id, ()))
+
+    def markup_count(self, chat_id: int) -> int:
+        """Chatga klaviatura bilan yuborilgan (yoki tahrirlangan) xabarlar soni."""
+        return self._markup_counts.get(chat_id, 0)
+
+    async def wait_reply(self, chat_id: int, after: int, timeout: float) -> Optional[float]:
+        """Chatga ``after`` tartib raqamidan keyingi javobni kutadi va uning vaqtini qaytaradi."""
+        replies = self._replies[chat_id]
+        if len(replies) > after:
+            return replies[after]
+        future = asyncio.get_running_loop().create_future()
+        waiter = (after, future)
+        self._waiters[chat_id].append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if waiter in self._waiters[chat_id]:
+                self._waiters[chat_id].remove(waiter)
+
+    # --- server ---
+
+    def _message(self, method: str, params: Dict[str, Any], chat_id: int) -> Dict[str, Any]:
+        if method.startswith("edit") and "message_id" in params:
+            message_id = int(params["message_id"])
+        else:
+            self._message_id += 1
+            message_id = self._message_id
+        message = {"message_id": message_id, "date": int(time.time()), "from": BOT_USER,
+                   "chat": {"id": chat_id, "type": "private"}}
+        if "text" in params:
+            message["text"] = params["text"]
+        if "caption" in params:
+            message["caption"] = params["caption"]
+        for field in MEDIA_FIELDS:
+            if field in params:
+                file = {"file_id": str(params[field]), "file_unique_id": f"u{message_id}"}
+                message[field] = [dict(file, width=800, height=600)] if field == "photo" else file
+        markup = params.get("reply_markup")
+        if markup:
+            markup = json.loads(markup) if isinstance(markup, str) else markup
+            message["reply_markup"] = markup
+            self._markups[chat_id][message_id] = markup
+            self._last_markup[chat_id] = message_id
+            self._markup_counts[chat_id] += 1
+        return message
+
+    async def _get_updates(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        if offset:
+            self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates:
+            self.updates_ready.clear()
+            try:
+                await asyncio.wait_for(self.updates_ready.wait(), float(params.get("timeout") or 0))
+            except asyncio.TimeoutError:
+                pass
+        limit = int(params.get("limit") or 100)
+        return self._updates[:limit]
+
+    async def _result(self, method: str, params: Dict[str, Any], chat_id: Optional[int]) -> Any:
+        if method == "getMe":
+            return BOT_USER
+        if method == "getUpdates":
+            return await self._get_updates(params)
+        if method == "setWebhook":
+            self.webhook_url = params.get("url", "")
+        elif method == "deleteWebhook":
+            self.webhook_url = ""
+        elif method == "getWebhookInfo":
+            return {"url": self.webhook_url, "has_custom_certificate": False,
+                    "pending_update_count": len(self._updates)}
+        if method in MESSAGE_METHODS and chat_id is not None:
+            return self._message(method, params, chat_id)
+        return True
+
+    def _reply(self, chat_id: Optional[int], at: float) -> None:
+        if chat_id is None:
+            return
+        replies = self._replies[chat_id]
+        replies.append(at)
+        for after, future in self._waiters.get(chat_id, ()):
+            if after < len(replies) and not future.done():
+                future.set_result(replies[after])
+
+    async def handle(self, request: web.Request) -> web.Response:
+        # Javob vaqti - so'rov kelgan payt (soxta tarmoq kechikishisiz)
+        arrived = time.perf_counter()
+        method = request.match_info["method"]
+        if request.content_type == "application/json":
+            params = await request.json()
+        else:
+            params = dict(await request.post())
+        self.seen[method] += 1
+        chat_id = params.get("chat_id")
+        chat_id = int(chat_id) if chat_id is not None else self._callbacks.get(params.get("callback_query_id"))
+
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay and method != "getUpdates":
+            await asyncio.sleep(delay)
+
+        if method in MESSAGE_METHODS and self.random.random() < self.retry_after_rate:
+            self.retry_after_sent += 1
+            self.calls.append(Call(method, params, chat_id, time.perf_counter(), 429))
+            return web.json_response({
+                "ok": False, "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            }, status=429)
+
+        result = await self._result(method, params, chat_id)
+        self.calls.append(Call(method, params, chat_id, time.perf_counter(), 200))
+        if method != "getUpdates":
+            self._reply(chat_id, arrived)
+        return web.json_response({"ok": True, "result": result})
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8081) -> str:
+        """Serverni ishga tushiradi va ``BOT_API_SERVER`` uchun manzilni qaytaradi."""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        app.router.add_get("/bot{token}/{method}", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
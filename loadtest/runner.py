@@ -0,0 +1,393 @@
+# runner.py: botni soxta Bot API bilan ishga tushirish, sessiyalarni qayta o'ynash va natijalarni hisoblash
+import asyncio
+import logging
+import math
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import aiohttp
+
+from .fake_api import FakeBotAPI
+from .sessions import STEPS, SessionPlan, UpdateFactory, inline_buttons, reply_buttons
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+BOT_TOKEN = "123456789:LOADTEST"
+ADMIN_ID = 1000
+FIRST_USER_ID = 500000000
+
+# Bo'lim -> (jadval, ustunlar, qiymatlar yaratuvchi)
+SEED_TABLES = {
+    "question": ("Questions", "question, answer",
+                 lambda i, lang: (f"Savol {i} ({lang})?", f"Javob {i} ({lang}). " * 20)),
+    "road_sign": ("RoadSigns", "image_file_id, description",
+                  lambda i, lang: (f"loadtest-sign-{lang}-{i}", f"Belgi {i} ({lang})")),
+    "truck_part": ("TruckParts", "image_file_id, description",
+                   lambda i, lang: (f"loadtest-part-{lang}-{i}", f"Qism {i} ({lang})")),
+}
+
+
+class Scenario(NamedTuple):
+    """Botni ishga tushirish usuli."""
+    mode: str  # "polling", "webhook" yoki "sharded"
+    workers: int = 1
+    upstream: str = "webhook"  # sharded rejimida front update'larni qanday oladi
+
+    @property
+    def name(self) -> str:
+        return f"sharded/{self.upstream} x{self.workers}" if self.mode == "sharded" else self.mode
+
+    @property
+    def via_webhook(self) -> bool:
+        return self.mode == "webhook" or (self.mode == "sharded" and self.upstream == "webhook")
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Tartiblangan ``samples`` ning ``q`` (0..100) persentili (eng yaqin daraja)."""
+    if not samples:
+        return 0.0
+    rank = math.ceil(q / 100 * len(samples))
+    return samples[max(0, min(len(samples), rank) - 1)]
+
+
+class Report:
+    """Sessiyalar natijasi: qadamlar bo'yicha kechikishlar va o'tkazuvchanlik."""
+
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.sessions = 0
+        self.completed = 0
+        self.updates = 0
+        self.started = 0.0
+        self.finished = 0.0
+        self.api_calls = 0
+        self.retry_after = 0
+
+    def observe(self, step: str, latency: float) -> None:
+        self.latencies[step].append(latency * 1000)
+        self.updates += 1
+
+    @property
+    def duration(self) -> float:
+        return max(self.finished - self.started, 1e-9)
+
+    def summary(self, step: Optional[str] = None) -> Dict[str, Any]:
+        samples = sorted(self.latencies[step] if step else
+                         [value for values in self.latencies.values() for value in values])
+        return {
+            "count": len(samples),
+            "p50_ms": round(percentile(samples, 50), 1),
+            "p95_ms": round(percentile(samples, 95), 1),
+            "p99_ms": round(percentile(samples, 99), 1),
+            "max_ms": round(samples[-1], 1) if samples else 0.0,
+        }
+
+    def lines(self) -> List[str]:
+        total = self.summary()
+        lines = [
+            f"== {self.scenario.name} ==",
+            f"sessions={self.sessions} completed={self.completed} updates={self.updates} "
+            f"duration={self.duration:.1f}s updates/s={self.updates / self.duration:.1f}",
+            f"latency: p50={total['p50_ms']}ms p95={total['p95_ms']}ms p99={total['p99_ms']}ms "
+            f"max={total['max_ms']}ms",
+            f"bot api: calls={self.api_calls} retry_after_injected={self.retry_after}",
+        ]
+        for step in STEPS:
+            if self.latencies.get(step) or self.failures.get(step):
+                s = self.summary(step)
+                lines.append(f"  {step:<9} n={s['count']:<6} p50={s['p50_ms']:<8} p95={s['p95_ms']:<8} "
+                             f"p99={s['p99_ms']:<8} failed={self.failures.get(step, 0)}")
+        return lines
+
+
+class BotProcess:
+    """``app.py`` ni vaqtinchalik papkada (alohida ``data/*.db``) alohida jarayonda ishga tushiradi.
+
+    Haqiqiy bazalarga tegmaydi: bot ``data/`` yo'llarini joriy papkaga nisbatan ochadi.
+    """
+
+    def __init__(self, scenario: Scenario, api_url: str, webapp_port: int = 8080, worker_port_base: int = 8100,
+                 env: Optional[Dict[str, str]] = None):
+        self.scenario = scenario
+        self.webapp_port = webapp_port
+        self.worker_port_base = worker_port_base
+        self.workdir = tempfile.mkdtemp(prefix="loadtest-")
+        os.makedirs(os.path.join(self.workdir, "data"))
+        self.env = dict(os.environ)
+        self.env.update({
+            "BOT_TOKEN": BOT_TOKEN,
+            "ADMINS": str(ADMIN_ID),
+            "ip": "127.0.0.1",
+            "BOT_API_SERVER": api_url,
+            "BOT_MODE": scenario.mode,
+            "WEBHOOK_HOST": f"http://127.0.0.1:{webapp_port}",
+            "WEBHOOK_PATH": "/webhook",
+            "WEBAPP_HOST": "127.0.0.1",
+            "WEBAPP_PORT": str(webapp_port),
+            "WORKERS": str(scenario.workers),
+            "SHARD_UPSTREAM": scenario.upstream,
+            "WORKER_PORT_BASE": str(worker_port_base),
+            # Barcha admin tasdiqlari bitta admin foydalanuvchidan keladi
+            "THROTTLE_RATE_LIMIT": "0",
+        })
+        self.env.update(env or {})
+        self.process: Optional[subprocess.Popen] = None
+        self._log = None
+
+    @property
+    def webhook_url(self) -> str:
+        return f"http://127.0.0.1:{self.webapp_port}/webhook"
+
+    @property
+    def ports(self) -> List[int]:
+        """Tayyor bo'lishi kerak bo'lgan portlar."""
+        ports = [self.webapp_port] if self.scenario.via_webhook else []
+        if self.scenario.mode == "sharded":
+            ports += [self.worker_port_base + index for index in range(self.scenario.workers)]
+        return ports
+
+    def start(self) -> None:
+        self._log = open(os.path.join(self.workdir, "bot.log"), "w")
+        self.process = subprocess.Popen([sys.executable, APP], cwd=self.workdir, env=self.env,
+                                        stdout=self._log, stderr=subprocess.STDOUT)
+        logging.info(f"Bot ishga tushdi: scenario={self.scenario.name}, pid={self.process.pid}, "
+                     f"workdir={self.workdir}")
+
+    def seed_sections(self, items: int) -> None:
+        """Har bir bo'lim va til uchun ``items`` ta element qo'shadi (migratsiyalardan keyin)."""
+        conn = sqlite3.connect(os.path.join(self.workdir, "data", "sections.db"), timeout=30)
+        with conn:
+            for section, (table, columns, values) in SEED_TABLES.items():
+                rows = [(i, *values(i, lang), lang) for lang in ("uz", "ru", "es") for i in range(1, items + 1)]
+                conn.executemany(f"INSERT INTO {table} (display_id, {columns}, language) "
+                                 f"VALUES (?, {', '.join('?' * len(columns.split(',')))}, ?)", rows)
+        conn.close()
+
+    def seed_users(self, users: List[tuple]) -> None:
+        """Ruxsatga ega foydalanuvchilarni ``(telegram_id, language)`` bazaga yozadi."""
+        conn = sqlite3.connect(os.path.join(self.workdir, "data", "user.db"), timeout=30)
+        with conn:
+            conn.executemany("INSERT INTO Users (telegram_id, username, is_allowed, language) VALUES (?, ?, 1, ?)",
+                             [(user_id, f"user{user_id}", language) for user_id, language in users])
+        conn.close()
+
+    def stop(self, timeout: float = 60.0) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self._log is not None:
+            self._log.close()
+
+
+async def _port_open(port: int) -> bool:
+    try:
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+    except OSError:
+        return False
+    writer.close()
+    return True
+
+
+class LoadTest:
+    """Bitta stsenariy: soxta API + bot jarayoni + sessiyalarni qayta o'ynash.
+
+    Har bir qadam kechikishi - update yetkazilgan paytdan bot shu foydalanuvchi
+    chatiga birinchi Bot API so'rovini yuborgunicha (javob, callback javobi,
+    tahrirlash) o'tgan vaqt. Polling rejimida bunga update'ning getUpdates
+    orqali olinishi ham kiradi, shuning uchun polling va webhook natijalari
+    bevosita solishtiriladi.
+    """
+
+    def __init__(self, scenario: Scenario, sessions: int = 100, rate: float = 5.0, think: float = 1.0,
+                 pages: int = 1, items: int = 30, paid_ratio: float = 1.0, api_port: int = 8081, webapp_port: int = 8080,
+                 worker_port_base: int = 8100, latency: float = 0.0, jitter: float = 0.0,
+                 retry_after_rate: float = 0.0, step_timeout: float = 30.0, settle: float = 0.05, seed: int = 1,
+                 env: Optional[Dict[str, str]] = None):
+        self.scenario = scenario
+        self.sessions = sessions
+        self.rate = rate
+        self.think = think
+        self.pages = pages
+        self.items = items
+        self.paid_ratio = paid_ratio
+        self.api_port = api_port
+        self.webapp_port = webapp_port
+        self.worker_port_base = worker_port_base
+        self.step_timeout = step_timeout
+        self.settle = settle
+        self.env = env
+        self.rng = random.Random(seed)
+        self.api = FakeBotAPI(latency=latency, jitter=jitter, retry_after_rate=retry_after_rate, seed=seed)
+        self.factory = UpdateFactory()
+        self.report = Report(scenario)
+        self.bot: Optional[BotProcess] = None
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._posts: set = set()
+
+    async def _wait_ready(self, timeout: float = 60.0) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        signal = "setWebhook" if self.scenario.via_webhook else "getUpdates"
+        while loop.time() < deadline:
+            if self.bot.process.poll() is not None:
+                raise RuntimeError(f"Bot to'xtadi (code={self.bot.process.returncode}), "
+                                   f"log: {self.bot.workdir}/bot.log")
+            if self.api.seen.get(signal) and all([await _port_open(port) for port in self.bot.ports]):
+                return
+            await asyncio.sleep(0.2)
+        raise RuntimeError(f"Bot {timeout}s ichida tayyor bo'lmadi, log: {self.bot.workdir}/bot.log")
+
+    async def _post(self, update: Dict[str, Any]) -> None:
+        for attempt in range(5):
+            try:
+                async with self._http.post(self.bot.webhook_url, json=update) as response:
+                    if response.status < 500:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2 * (attempt + 1))
+        logging.error(f"Webhook'ga yuborilmadi: update_id={update['update_id']}")
+
+    def _deliver(self, update: Dict[str, Any]) -> None:
+        if self.scenario.via_webhook:
+            # Javob (handler tugashi) kutilmaydi: kechikish bot chatga yozgan paytda o'lchanadi
+            task = asyncio.create_task(self._post(update))
+            self._posts.add(task)
+            task.add_done_callback(self._posts.discard)
+        else:
+            self.api.push_update(update)
+
+    async def _step(self, step: str, update: Dict[str, Any], chat_id: int, replies: int = 1,
+                    markup: bool = False) -> bool:
+        """Update'ni yetkazadi va handler ``chat_id`` ga javob berib bo'lishini kutadi.
+
+        Kechikish - birinchi javobgacha. Keyingi qadam faqat ``replies`` ta javob
+        (``markup`` bo'lsa, yangi klaviatura ham) kelgandan keyin yuboriladi:
+        chat bo'yicha tezlik cheklovi javoblar orasini uzaytirsa ham, keyingi
+        update to'g'ri FSM holatiga va oxirgi klaviaturaga tushadi.
+        """
+        callback = update.get("callback_query")
+        if callback:
+            self.api.register_callback(callback["id"], callback["message"]["chat"]["id"])
+        after = self.api.reply_count(chat_id)
+        markups = self.api.markup_count(chat_id)
+        sent = time.perf_counter()
+        self._deliver(update)
+        replied = await self.api.wait_reply(chat_id, after, self.step_timeout)
+        if replied is None:
+            self.report.failures[step] += 1
+            return False
+        self.report.observe(step, max(0.0, replied - sent))
+
+        deadline = sent + self.step_timeout
+        while self.api.reply_count(chat_id) < after + replies or (markup and self.api.markup_count(chat_id) == markups):
+            if await self.api.wait_reply(chat_id, self.api.reply_count(chat_id), deadline - time.perf_counter()) is None:
+                self.report.failures[step] += 1
+                return False
+        # Oxirgi javobdan keyin handler FSM holatini o'rnatadi
+        while await self.api.wait_reply(chat_id, self.api.reply_count(chat_id), self.settle) is not None:
+            pass
+        if self.think > 0:
+            # Foydalanuvchi javobni o'qiydi
+            await asyncio.sleep(self.rng.expovariate(1.0 / self.think))
+        return True
+
+    async def _pay(self, plan: SessionPlan) -> bool:
+        """Yangi foydalanuvchi: /start -> til -> to'lov cheki -> admin tasdig'i."""
+        user_id = plan.user_id
+        f = self.factory
+        if not await self._step("start", f.text(user_id, "/start"), user_id, markup=True):
+            return False
+        message_id, markup = self.api.last_markup(user_id) or (None, {})
+        data = f"lang_{plan.language}"
+        if data not in inline_buttons(markup):
+            self.report.failures["language"] += 1
+            return False
+        # Xabar o'chiriladi, "til saqlandi" va "to'lov qiling" yuboriladi
+        if not await self._step("language", f.callback(user_id, data, message_id=message_id), user_id, replies=3):
+            return False
+        if not await self._step("payment", f.photo(user_id), user_id):
+            return False
+        # Admin chek ostidagi "Ruxsat berish" tugmasini bosadi; kechikish foydalanuvchiga javobgacha
+        return await self._step("approve", f.callback(ADMIN_ID, f"allow_{user_id}", chat_id=ADMIN_ID), user_id)
+
+    async def _session(self, plan: SessionPlan) -> None:
+        user_id = plan.user_id
+        f = self.factory
+        if plan.pays and not await self._pay(plan):
+            return
+        # Tasdiq xabarida menyu yo'q: foydalanuvchi /start bilan asosiy menyuni ochadi
+        if not await self._step("menu", f.text(user_id, "/start"), user_id, markup=True):
+            return
+
+        _, markup = self.api.last_markup(user_id) or (None, {})
+        sections = reply_buttons(markup)[:3]
+        if len(sections) < 3:
+            self.report.failures["section"] += 1
+            return
+        if not await self._step("section", f.text(user_id, sections[plan.section_index]), user_id, markup=True):
+            return
+
+        for _ in range(plan.pages):
+            message_id, markup = self.api.last_markup(user_id) or (None, {})
+            pages = [data for data in inline_buttons(markup) if data.startswith("page_")]
+            if not pages:
+                break
+            # Oxirgi tugma - "keyingi" (birinchi sahifada yagona)
+            if not await self._step("page", f.callback(user_id, pages[-1], message_id=message_id), user_id,
+                                    markup=True):
+                return
+
+        message_id, markup = self.api.last_markup(user_id) or (None, {})
+        items = [data for data in inline_buttons(markup) if not data.startswith("page_") and data != "back_to_menu"]
+        if not items:
+            self.report.failures["item"] += 1
+            return
+        if not await self._step("item", f.callback(user_id, plan.pick(items), message_id=message_id), user_id):
+            return
+        self.report.completed += 1
+
+    async def run(self) -> Report:
+        api_url = await self.api.start(port=self.api_port)
+        self.bot = BotProcess(self.scenario, api_url, webapp_port=self.webapp_port,
+                              worker_port_base=self.worker_port_base, env=self.env)
+        self._http = aiohttp.ClientSession()
+        try:
+            self.bot.start()
+            await self._wait_ready()
+            self.bot.seed_sections(self.items)
+            plans = [SessionPlan(FIRST_USER_ID + index, random.Random(self.rng.random()), pages=self.pages,
+                                 paid_ratio=self.paid_ratio) for index in range(self.sessions)]
+            self.bot.seed_users([(plan.user_id, plan.language) for plan in plans if not plan.pays])
+
+            self.report.started = time.perf_counter()
+            sessions = []
+            for plan in plans:
+                sessions.append(asyncio.create_task(self._session(plan)))
+                self.report.sessions += 1
+                if self.rate > 0:
+                    await asyncio.sleep(self.rng.expovariate(self.rate))
+            await asyncio.gather(*sessions)
+            self.report.finished = time.perf_counter()
+        finally:
+            self.report.api_calls = len(self.api.calls)
+            self.report.retry_after = self.api.retry_after_sent
+            await asyncio.get_running_loop().run_in_executor(None, self.bot.stop)
+            if self._posts:
+                await asyncio.wait(set(self._posts), timeout=5)
+            await self._http.close()
+            await self.api.stop()
+        return self.report
@@ -0,0 +1,83 @@
+# sessions.py: foydalanuvchi sessiyalarini (update'lar ketma-ketligini) yaratish
+import itertools
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from .fake_api import BOT_USER
+
+# Sessiya qadamlari: /start -> til -> to'lov cheki -> admin tasdig'i -> /start (menyu) -> bo'lim -> sahifa -> element
+STEPS = ("start", "language", "payment", "approve", "menu", "section", "page", "item")
+LANGUAGES = ("uz", "ru", "es")
+
+
+class UpdateFactory:
+    """Bot API formatidagi update'larni (dict) yaratadi."""
+
+    def __init__(self, first_update_id: int = 1):
+        self._update_ids = itertools.count(first_update_id)
+        self._message_ids = itertools.count(1)
+        self._callback_ids = itertools.count(1)
+
+    @staticmethod
+    def user(user_id: int) -> Dict[str, Any]:
+        return {"id": user_id, "is_bot": False, "first_name": f"User{user_id}", "username": f"user{user_id}",
+                "language_code": "uz"}
+
+    def _message(self, user_id: int, **fields: Any) -> Dict[str, Any]:
+        return {"message_id": next(self._message_ids), "date": int(time.time()), "from": self.user(user_id),
+                "chat": {"id": user_id, "type": "private", "first_name": f"User{user_id}"}, **fields}
+
+    def text(self, user_id: int, text: str) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {"text": text}
+        if text.startswith("/"):
+            fields["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return {"update_id": next(self._update_ids), "message": self._message(user_id, **fields)}
+
+    def photo(self, user_id: int) -> Dict[str, Any]:
+        file_id = f"loadtest-receipt-{user_id}"
+        photo = [{"file_id": file_id, "file_unique_id": f"r{user_id}", "width": 800, "height": 600}]
+        return {"update_id": next(self._update_ids), "message": self._message(user_id, photo=photo)}
+
+    def callback(self, user_id: int, data: str, chat_id: Optional[int] = None,
+                 message_id: Optional[int] = None) -> Dict[str, Any]:
+        """``chat_id`` dagi bot xabari (``message_id``) tugmasi bosilgandagi update."""
+        chat_id = chat_id or user_id
+        message = {"message_id": message_id or 1, "date": int(time.time()), "from": BOT_USER,
+                   "chat": {"id": chat_id, "type": "private"}, "text": "loadtest"}
+        return {"update_id": next(self._update_ids),
+                "callback_query": {"id": str(next(self._callback_ids)), "from": self.user(user_id),
+                                   "message": message, "chat_instance": str(chat_id), "data": data}}
+
+
+def inline_buttons(markup: Dict[str, Any]) -> List[str]:
+    """Inline klaviaturadagi callback_data larni qaytaradi."""
+    return [button["callback_data"] for row in markup.get("inline_keyboard", ()) for button in row
+            if "callback_data" in button]
+
+
+def reply_buttons(markup: Dict[str, Any]) -> List[str]:
+    """Oddiy (reply) klaviaturadagi tugma matnlarini qaytaradi."""
+    return [button["text"] if isinstance(button, dict) else button
+            for row in markup.get("keyboard", ()) for button in row]
+
+
+class SessionPlan:
+    """Bitta foydalanuvchi sessiyasi parametrlari.
+
+    Tugmalar (til, bo'lim, sahifa, element) bot yuborgan klaviaturadan
+    tanlanadi, shuning uchun replayer bot matnlari va ID lariga bog'lanmaydi.
+    """
+
+    def __init__(self, user_id: int, rng: random.Random, pages: int = 1, paid_ratio: float = 1.0):
+        self.user_id = user_id
+        self.language = rng.choice(LANGUAGES)
+        # False - foydalanuvchi avvaldan ruxsatga ega (bazaga oldindan yoziladi), to'lov qadamlari o'tkazib yuboriladi
+        self.pays = rng.random() < paid_ratio
+        # Bo'lim menyusidagi tugmalardan birinchi uchtasi - bo'limlar
+        self.section_index = rng.randrange(3)
+        self.pages = pages
+        self.rng = rng
+
+    def pick(self, buttons: List[str]) -> Optional[str]:
+        return self.rng.choice(buttons) if buttons else None
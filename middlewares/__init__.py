@@ -1,8 +1,14 @@
 from aiogram import Dispatcher
 
 from loader import dp
+from data.config import THROTTLE_RATE_LIMIT, THROTTLE_BURST
+from .inflight import InFlightMiddleware
 from .throttling import ThrottlingMiddleware
 
+# To'xtashda jarayondagi handlerlarni kutish uchun (app.on_shutdown)
+inflight = InFlightMiddleware()
+
 
 if __name__ == "middlewares":
-    dp.middleware.setup(ThrottlingMiddleware())
+    dp.middleware.setup(inflight)
+    dp.middleware.setup(ThrottlingMiddleware(limit=THROTTLE_RATE_LIMIT, burst=THROTTLE_BURST))
@@ -0,0 +1,51 @@
+# inflight.py: jarayondagi update'lar hisobi va to'xtashda ularni kutish
+import asyncio
+import logging
+from typing import Optional
+
+from aiogram import types
+from aiogram.dispatcher.middlewares import BaseMiddleware
+
+
+class InFlightMiddleware(BaseMiddleware):
+    """
+    Hozir qayta ishlanayotgan update'lar sonini hisoblaydi.
+
+    To'xtashda ``drain`` kutiladi: storage va hovuzlar yopilishidan oldin
+    ishlayotgan handlerlar tugaydi va ularning FSM/baza yozuvlari saqlanadi.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self._idle: Optional[asyncio.Event] = None
+        super(InFlightMiddleware, self).__init__()
+
+    @property
+    def idle(self) -> asyncio.Event:
+        # Event ishlayotgan event loop ichida yaratiladi
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            self._idle.set()
+        return self._idle
+
+    async def on_pre_process_update(self, update: types.Update, data: dict):
+        self.in_flight += 1
+        self.idle.clear()
+
+    async def on_post_process_update(self, update: types.Update, result, data: dict):
+        self.in_flight -= 1
+        if self.in_flight <= 0:
+            self.in_flight = 0
+            self.idle.set()
+
+    async def drain(self, timeout: float = 30.0) -> bool:
+        """Jarayondagi update'lar tugashini kutadi; vaqt tugasa False qaytaradi."""
+        if not self.in_flight:
+            return True
+        logging.info(f"Jarayondagi update'lar kutilmoqda: {self.in_flight}")
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logging.warning(f"Drain vaqti tugadi, tugallanmagan update'lar: {self.in_flight}")
+            return False
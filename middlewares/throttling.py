@@ -1,37 +1,67 @@
-import asyncio
+import time
 
-from aiogram import types, Dispatcher
+from aiogram import types
 from aiogram.dispatcher import DEFAULT_RATE_LIMIT
 from aiogram.dispatcher.handler import CancelHandler, current_handler
 from aiogram.dispatcher.middlewares import BaseMiddleware
-from aiogram.utils.exceptions import Throttled
+
+from utils.db_api.cache import LRUCache
+from utils.misc.outbound import TokenBucket
 
 
 class ThrottlingMiddleware(BaseMiddleware):
     """
-    Simple middleware
+    Xabarlar va callback'lar uchun foydalanuvchi bo'yicha token bucket.
+
+    Har bir (foydalanuvchi, kalit) juftligining bucket'i ``limit`` soniyada bitta
+    token bilan to'ladi, sig'imi ``burst``. Handler ``utils.misc.throttling``
+    dagi ``rate_limit`` bilan ikkalasini o'zgartirishi mumkin; kalitsiz
+    handlerlar foydalanuvchining standart bucket'ini bo'lishadi. Bucket'lar
+    chegaralangan LRU jadvalda saqlanadi va ishlatilmaganlari eskiradi, shuning
+    uchun xotira foydalanuvchilar soni bilan o'smaydi.
     """
 
-    def __init__(self, limit=DEFAULT_RATE_LIMIT, key_prefix='antiflood_'):
+    def __init__(self, limit=DEFAULT_RATE_LIMIT, burst: int = 3, max_users: int = 100000, idle_ttl: float = 60.0):
         self.rate_limit = limit
-        self.prefix = key_prefix
+        self.burst = burst
+        # (user_id, key) -> [TokenBucket, exceeded_count]
+        self._buckets = LRUCache(maxsize=max_users, ttl=idle_ttl)
         super(ThrottlingMiddleware, self).__init__()
 
-    async def on_process_message(self, message: types.Message, data: dict):
+    def _allow(self, user_id: int) -> tuple:
+        """So'rovni o'tkazish mumkinligini va ketma-ket rad etishlar sonini qaytaradi."""
         handler = current_handler.get()
-        dispatcher = Dispatcher.get_current()
-        if handler:
-            limit = getattr(handler, "throttling_rate_limit", self.rate_limit)
-            key = getattr(handler, "throttling_key", f"{self.prefix}_{handler.__name__}")
-        else:
-            limit = self.rate_limit
-            key = f"{self.prefix}_message"
-        try:
-            await dispatcher.throttle(key, rate=limit)
-        except Throttled as t:
-            await self.message_throttled(message, t)
+        limit = getattr(handler, "throttling_rate_limit", self.rate_limit) if handler else self.rate_limit
+        key = getattr(handler, "throttling_key", "default") if handler else "default"
+        if limit <= 0:
+            return True, 0
+        now = time.monotonic()
+        entry = self._buckets.get((user_id, key))
+        if entry is None:
+            entry = [TokenBucket(1.0 / limit, self.burst, now), 0]
+            self._buckets.set((user_id, key), entry)
+        if entry[0].try_consume(now):
+            entry[1] = 0
+            return True, 0
+        entry[1] += 1
+        return False, entry[1]
+
+    async def on_process_message(self, message: types.Message, data: dict):
+        allowed, exceeded = self._allow(message.from_user.id)
+        if not allowed:
+            await self.message_throttled(message, exceeded)
+            raise CancelHandler()
+
+    async def on_process_callback_query(self, callback_query: types.CallbackQuery, data: dict):
+        allowed, exceeded = self._allow(callback_query.from_user.id)
+        if not allowed:
+            await self.callback_throttled(callback_query, exceeded)
             raise CancelHandler()
 
-    async def message_throttled(self, message: types.Message, throttled: Throttled):
-        if throttled.exceeded_count <= 2:
+    async def message_throttled(self, message: types.Message, exceeded: int):
+        if exceeded <= 2:
             await message.reply("Too many requests!")
+
+    async def callback_throttled(self, callback_query: types.CallbackQuery, exceeded: int):
+        # Tugmadagi "yuklanmoqda" belgisi to'xtashi uchun callback har doim javoblanadi
+        await callback_query.answer("Too many requests!" if exceeded <= 2 else None)
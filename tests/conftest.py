@@ -0,0 +1,36 @@
+# conftest.py: testlar uchun umumiy sozlamalar
+import os
+import sys
+
+import pytest
+
+# data/config.py majburiy muhit o'zgaruvchilarini talab qiladi (.env bo'lmasa ham testlar ishlaydi)
+os.environ.setdefault("BOT_TOKEN", "123456789:TEST")
+os.environ.setdefault("ADMINS", "1000")
+os.environ.setdefault("ip", "127.0.0.1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db_api.executor import shutdown_all_executors  # noqa: E402
+from utils.db_api.pool import close_all_pools  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _close_databases():
+    """Har bir testdan keyin umumiy executor va hovuzlarni yopadi (har test o'z fayllari bilan)."""
+    yield
+    shutdown_all_executors()
+    close_all_pools()
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: vaqt o'lchovi, faqat RUN_BENCHMARKS=1 bo'lganda ishga tushadi")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Benchmark testlari devor soatiga bog'liq - standart yugurishda o'tkazib yuboriladi."""
+    if os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark: RUN_BENCHMARKS=1 bilan ishga tushiring")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,58 @@
+import asyncio
+
+from aiogram.utils.exceptions import BadRequest, RetryAfter
+
+from utils.misc.broadcast import Broadcaster
+from utils.misc.outbound import PRIORITY_ADMIN, PRIORITY_BULK, send_priority
+
+
+def _broadcaster() -> Broadcaster:
+    return Broadcaster(concurrency=4)
+
+
+def test_send_uses_admin_priority_and_bulk_override():
+    seen = []
+
+    async def send(chat_id):
+        seen.append((chat_id, send_priority.get()))
+
+    async def main():
+        broadcaster = _broadcaster()
+        await broadcaster.send([1], send)
+        await broadcaster.send([2], send, bulk=True)
+        await broadcaster.schedule([3], send, bulk=True)
+
+    asyncio.run(main())
+    assert seen == [(1, PRIORITY_ADMIN), (2, PRIORITY_BULK), (3, PRIORITY_BULK)]
+
+
+def test_retry_after_is_not_retried_again():
+    # ScheduledBot RetryAfter ni o'zi qayta yuboradi; Broadcaster ikkinchi marta urinmaydi
+    calls = []
+
+    async def send(chat_id):
+        calls.append(("send", chat_id))
+        raise RetryAfter(1)
+
+    async def fallback(chat_id):
+        calls.append(("fallback", chat_id))
+
+    sent, failed = asyncio.run(_broadcaster().send([1], send, fallback))
+    assert (sent, failed) == (0, 1)
+    assert calls == [("send", 1)]
+
+
+def test_fallback_tried_once_on_error():
+    calls = []
+
+    async def send(chat_id):
+        calls.append(("send", chat_id))
+        raise BadRequest("Can't parse entities")
+
+    async def fallback(chat_id):
+        calls.append(("fallback", chat_id))
+        raise BadRequest("Chat not found")
+
+    sent, failed = asyncio.run(_broadcaster().send([1, 1, 2], send, fallback))
+    assert (sent, failed) == (0, 2)
+    assert sorted(calls) == [("fallback", 1), ("fallback", 2), ("send", 1), ("send", 2)]
@@ -0,0 +1,118 @@
+# test_catalog.py: SectionCatalog - versiyalangan sahifalar keshi va invalidatsiya
+import asyncio
+
+from utils.db_api.catalog import SectionCatalog
+from utils.db_api.sections import SectionsDatabase
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FakeLoaders:
+    """Katalog uchun soxta yuklovchilar: chaqiruvlarni sanaydi, ixtiyoriy ``gate`` da kutadi."""
+
+    def __init__(self, total: int = 25):
+        self.total = total
+        self.pages = 0
+        self.counts = 0
+        self.gate = None
+
+    async def page(self, section, language, after, limit):
+        self.pages += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return [{"display_id": i} for i in range(after + 1, min(after + limit, self.total) + 1)]
+
+    async def count(self, section, language):
+        self.counts += 1
+        return self.total
+
+
+def test_pages_cached_until_invalidated():
+    loaders = FakeLoaders()
+    catalog = SectionCatalog(loaders.page, loaders.count)
+
+    async def main():
+        first, total = await catalog.get_page("question", "uz", 0, 10)
+        again, _ = await catalog.get_page("question", "uz", 0, 10)
+        await catalog.get_page("question", "ru", 0, 10)
+        before = catalog.version("question", "uz"), catalog.version("question", "ru")
+        catalog.invalidate("question", "uz")
+        await catalog.get_page("question", "uz", 0, 10)
+        await catalog.get_page("question", "ru", 0, 10)
+        return first is again, total, before, catalog.version("question", "uz"), catalog.version("question", "ru")
+
+    assert run(main()) == (True, 25, (0, 0), 1, 0)
+    # uz: ikki marta yuklandi, ru: bir marta (boshqa til keshi saqlanadi)
+    assert (loaders.pages, loaders.counts) == (3, 3)
+
+
+def test_invalidate_without_language_bumps_every_language():
+    loaders = FakeLoaders()
+    catalog = SectionCatalog(loaders.page, loaders.count)
+
+    async def main():
+        for language in ("uz", "ru"):
+            await catalog.get_page("road_sign", language, 0, 10)
+        await catalog.get_page("question", "uz", 0, 10)
+        catalog.invalidate("road_sign")
+        return [catalog.version(section, language)
+                for section, language in (("road_sign", "uz"), ("road_sign", "ru"), ("question", "uz"))]
+
+    assert run(main()) == [1, 1, 0]
+
+
+def test_page_loaded_during_invalidation_not_cached():
+    loaders = FakeLoaders()
+    catalog = SectionCatalog(loaders.page, loaders.count)
+
+    async def main():
+        await catalog.get_page("question", "uz", 0, 10)
+        loaders.gate = asyncio.Event()
+        reader = asyncio.create_task(catalog.get_page("question", "uz", 10, 10))
+        await asyncio.sleep(0)
+        catalog.invalidate("question", "uz")
+        loaders.gate.set()
+        await reader
+        loaders.gate = None
+        await catalog.get_page("question", "uz", 10, 10)
+
+    run(main())
+    # Eski versiyadagi sahifa saqlanmadi, shuning uchun qayta yuklandi
+    assert loaders.pages == 3
+
+
+def test_pages_per_entry_bounded():
+    loaders = FakeLoaders(total=1000)
+    catalog = SectionCatalog(loaders.page, loaders.count, max_pages=2)
+
+    async def main():
+        for after in (0, 10, 20):
+            await catalog.get_page("question", "uz", after, 10)
+        return list(catalog._entries[("question", "uz")].pages)
+
+    assert run(main()) == [(10, 10), (20, 10)]
+
+
+def test_section_writes_bump_catalog_version(tmp_path):
+    db = SectionsDatabase(str(tmp_path / "sections.db"))
+
+    async def main():
+        await db.migrate()
+        question_id = await db.add_question("q1", "a1", language="uz")
+        await db.add_question("q2", "a2", language="uz")
+        versions = [db.catalog.version("question", "uz")]
+        page, total = await db.get_page("question", "uz", 0, 10)
+        await db.update_question(question_id, question="yangi", language="uz")
+        versions.append(db.catalog.version("question", "uz"))
+        updated, _ = await db.get_page("question", "uz", 0, 10)
+        await db.delete_question(question_id)
+        versions.append(db.catalog.version("question", "uz"))
+        remaining, remaining_total = await db.get_page("question", "uz", 0, 10)
+        return (versions, total, updated[0]["question"],
+                [(item["display_id"], item["question"]) for item in remaining], remaining_total)
+
+    versions, total, updated, remaining, remaining_total = run(main())
+    assert versions[0] < versions[1] < versions[2]
+    assert (total, updated, remaining, remaining_total) == (2, "yangi", [(1, "q2")], 1)
@@ -0,0 +1,57 @@
+# test_database.py: Database.execute - commit semantikasi va qator ko'rinishlari
+import asyncio
+
+import pytest
+
+from utils.db_api.database import Database, dict_rows
+from utils.db_api.records import Question, record_factory
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "a.db"))
+    db.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, x)", commit=True)
+    return db
+
+
+def count(db: Database) -> int:
+    return db.execute("SELECT COUNT(*) FROM t", fetchone=True)[0]
+
+
+def test_commit_persists_write(db):
+    db.execute("INSERT INTO t (x) VALUES (1)", commit=True)
+    assert count(db) == 1
+
+
+def test_write_without_commit_is_discarded(db):
+    db.execute("INSERT INTO t (x) VALUES (1)")
+    assert count(db) == 0
+
+
+def test_returning_with_commit(db):
+    assert db.execute("INSERT INTO t (x) VALUES (7) RETURNING id", fetchone=True, commit=True) == (1,)
+    assert count(db) == 1
+
+
+def test_failed_write_rolled_back(db):
+    db.execute("INSERT INTO t (id, x) VALUES (1, 1)", commit=True)
+    with pytest.raises(Exception):
+        db.execute("INSERT INTO t (id, x) VALUES (1, 2)", commit=True)
+    assert db.execute("SELECT x FROM t WHERE id = 1", fetchone=True) == (1,)
+    with db.pool.connection() as conn:
+        assert not conn.in_transaction
+
+
+def test_async_commit_runs_on_writer(db):
+    async def main():
+        await db.execute_async("INSERT INTO t (x) VALUES (1)", commit=True)
+        return await db.execute_async("SELECT x FROM t", fetchall=True)
+
+    assert asyncio.run(main()) == [(1,)]
+
+
+def test_row_factories(db):
+    db.execute("INSERT INTO t (x) VALUES ('a')", commit=True)
+    assert db.execute("SELECT id, x FROM t", fetchone=True, row_factory=dict_rows) == {"id": 1, "x": "a"}
+    row = db.execute("SELECT id, x AS question FROM t", fetchone=True, row_factory=record_factory(Question))
+    assert isinstance(row, Question) and row["question"] == "a" and row.answer is None
@@ -0,0 +1,119 @@
+# test_executor.py: DatabaseExecutor - sekin so'rov event loopni bloklamasligi va yozuvlar navbati
+import asyncio
+import functools
+import threading
+import time
+
+import pytest
+
+from utils.db_api.database import Database
+from utils.db_api.executor import DatabaseExecutor
+
+# Rekursiv CTE: bir necha yuz millisekund davom etadigan, GIL ni qo'yib yuboradigan haqiqiy SQLite ishi
+SLOW_SQL = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 3000000)
+    INSERT INTO t SELECT COUNT(*) FROM n
+"""
+
+
+async def _ticker(stop: asyncio.Event, interval: float, delays: list) -> None:
+    """Har ``interval`` da uyg'onib, rejalashtirish kechikishini yozadi."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        delays.append(loop.time() - expected)
+
+
+def test_loop_runs_while_write_in_progress():
+    # Yozuv loop ichida bajarilsa, u loopdagi signalni hech qachon ko'rmaydi va timeout bilan tugaydi
+    executor = DatabaseExecutor(":memory:")
+    started, resumed = threading.Event(), threading.Event()
+
+    def write():
+        started.set()
+        return resumed.wait(timeout=5), threading.get_ident()
+
+    async def main():
+        pending = asyncio.ensure_future(executor.run(write, write=True))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        resumed.set()
+        return await pending
+
+    released, thread_id = asyncio.run(main())
+    executor.shutdown()
+    assert released is True
+    assert thread_id != threading.get_ident()
+
+
+@pytest.mark.benchmark
+def test_slow_write_does_not_block_loop(tmp_path):
+    db = Database(str(tmp_path / "a.db"))
+    db.execute("CREATE TABLE t (x)", commit=True)
+
+    async def main():
+        stop, delays = asyncio.Event(), []
+        ticker = asyncio.create_task(_ticker(stop, 0.01, delays))
+        started = time.perf_counter()
+        await db.executor.run(functools.partial(db.execute, SLOW_SQL, commit=True), write=True)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await ticker
+        return elapsed, delays
+
+    elapsed, delays = asyncio.run(main())
+    assert elapsed > 0.1, "so'rov ticker bir necha marta ishlashi uchun yetarlicha sekin bo'lishi kerak"
+    assert len(delays) >= elapsed / 0.01 * 0.5
+    assert max(delays) < 0.05, f"event loop {max(delays) * 1000:.1f}ms bloklandi"
+
+
+@pytest.mark.benchmark
+def test_blocking_call_on_loop_is_detected(tmp_path):
+    """Nazorat: xuddi shu so'rov loop ichida bajarilsa, ticker kechikishni ko'radi."""
+    db = Database(str(tmp_path / "a.db"))
+    db.execute("CREATE TABLE t (x)", commit=True)
+
+    async def main():
+        stop, delays = asyncio.Event(), []
+        ticker = asyncio.create_task(_ticker(stop, 0.01, delays))
+        await asyncio.sleep(0.02)
+        db.execute(SLOW_SQL, commit=True)
+        await asyncio.sleep(0.02)
+        stop.set()
+        await ticker
+        return delays
+
+    assert max(asyncio.run(main())) > 0.05
+
+
+def test_writes_serialized_reads_parallel():
+    executor = DatabaseExecutor(":memory:", read_workers=4)
+    active = {"read": 0, "write": 0}
+    peak = {"read": 0, "write": 0}
+    lock = threading.Lock()
+    # 4 ta o'qish bir vaqtda bajarilmasa, to'siq timeout bilan buziladi
+    barrier = threading.Barrier(4, timeout=5)
+
+    def work(kind):
+        with lock:
+            active[kind] += 1
+            peak[kind] = max(peak[kind], active[kind])
+        if kind == "read":
+            barrier.wait()
+        else:
+            time.sleep(0.01)
+        with lock:
+            active[kind] -= 1
+        return threading.current_thread().name
+
+    async def main():
+        writes = [executor.run(work, "write", write=True) for _ in range(4)]
+        reads = [executor.run(work, "read") for _ in range(4)]
+        return await asyncio.gather(*writes), await asyncio.gather(*reads)
+
+    writers, _ = asyncio.run(main())
+    executor.shutdown()
+    assert peak["write"] == 1
+    assert peak["read"] == 4
+    assert len(set(writers)) == 1
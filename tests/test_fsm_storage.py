@@ -0,0 +1,111 @@
+# test_fsm_storage.py: SQLiteStorage - flush paytida o'qish va qayta ishga tushirish
+import asyncio
+import time
+
+from utils.db_api.fsm_storage import SQLiteStorage
+
+
+def _storage(tmp_path, **kwargs) -> SQLiteStorage:
+    storage = SQLiteStorage(str(tmp_path / "fsm.db"), flush_interval=3600, **kwargs)
+    asyncio.run(storage.migrate())
+    return storage
+
+
+def test_state_visible_while_flush_in_flight(tmp_path):
+    # Issiq qatlamdan chiqib ketgan, commit qilinmagan holat bazadagi eski qiymatdan ustun
+    storage = _storage(tmp_path, hot_size=1)
+    write = storage.db.transaction_async
+
+    async def main():
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_write(*args):
+            started.set()
+            await release.wait()
+            return await write(*args)
+
+        storage.db.transaction_async = slow_write
+        await storage.set_state(chat=1, user=1, state="Form:amount")
+        await storage.set_state(chat=2, user=2, state="Form:card")  # 1-kalit issiq qatlamdan chiqadi
+        flush = asyncio.create_task(storage.flush())
+        await started.wait()
+        during = await storage.get_state(chat=1, user=1)
+        release.set()
+        await flush
+        return during
+
+    assert asyncio.run(main()) == "Form:amount"
+
+
+def test_states_survive_restart(tmp_path):
+    storage = _storage(tmp_path)
+
+    async def write():
+        await storage.set_state(chat=1, user=1, state="Form:amount")
+        await storage.update_data(chat=1, user=1, amount=50000)
+        await storage.close()
+
+    asyncio.run(write())
+    restored = SQLiteStorage(str(tmp_path / "fsm.db"))
+
+    async def read():
+        return await restored.get_state(chat=1, user=1), await restored.get_data(chat=1, user=1)
+
+    assert asyncio.run(read()) == ("Form:amount", {"amount": 50000})
+
+
+def _insert(storage: SQLiteStorage, user: int, age: float) -> None:
+    storage.db.execute("INSERT INTO FSM (chat, user, state, data, updated_at) VALUES (?, ?, 'Form:amount', '{}', ?)",
+                       (str(user), str(user), time.time() - age), commit=True)
+
+
+def _stored_users(storage: SQLiteStorage) -> list:
+    return [row[0] for row in storage.db.execute("SELECT user FROM FSM ORDER BY user", fetchall=True)]
+
+
+def test_expired_state_ignored_and_swept(tmp_path):
+    storage = _storage(tmp_path, state_ttl=60)
+    _insert(storage, 1, age=120)
+    _insert(storage, 2, age=10)
+
+    async def main():
+        states = await storage.get_state(chat=1, user=1), await storage.get_state(chat=2, user=2)
+        await storage.flush()
+        return states
+
+    assert asyncio.run(main()) == (None, "Form:amount")
+    assert _stored_users(storage) == ["2"]
+
+
+def test_started_storage_sweeps_without_writes(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "fsm.db"), state_ttl=60, flush_interval=0.01)
+    asyncio.run(storage.migrate())
+    _insert(storage, 1, age=120)
+
+    async def main():
+        storage.start()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if storage._last_sweep:
+                break
+        await storage.close()
+
+    asyncio.run(main())
+    assert _stored_users(storage) == []
+
+
+def test_hot_states_and_buckets_bounded(tmp_path):
+    storage = _storage(tmp_path, hot_size=2)
+
+    async def main():
+        for user in range(5):
+            await storage.set_state(chat=user, user=user, state=f"Form:{user}")
+            await storage.set_bucket(chat=user, user=user, bucket={"amount": user})
+        # Issiq qatlamdan chiqqan holat yozilmagan o'zgarishlardan o'qiladi
+        evicted = await storage.get_state(chat=0, user=0)
+        sizes = len(storage._hot), len(storage._buckets)
+        await storage.close()
+        return evicted, sizes
+
+    assert asyncio.run(main()) == ("Form:0", (2, 2))
+    assert _stored_users(storage) == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,42 @@
+# test_inflight.py: InFlightMiddleware.drain - to'xtashda jarayondagi update'larni kutish
+import asyncio
+
+from middlewares.inflight import InFlightMiddleware
+
+
+async def _handle(middleware: InFlightMiddleware, seconds: float) -> None:
+    await middleware.on_pre_process_update(None, {})
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        await middleware.on_post_process_update(None, None, {})
+
+
+def test_drain_returns_immediately_when_idle():
+    assert asyncio.run(InFlightMiddleware().drain(timeout=0.01)) is True
+
+
+def test_drain_waits_for_running_handlers():
+    async def main():
+        middleware = InFlightMiddleware()
+        handlers = [asyncio.create_task(_handle(middleware, delay)) for delay in (0.05, 0.1)]
+        await asyncio.sleep(0)
+        assert middleware.in_flight == 2
+        drained = await middleware.drain(timeout=1.0)
+        return drained, [task.done() for task in handlers], middleware.in_flight
+
+    assert asyncio.run(main()) == (True, [True, True], 0)
+
+
+def test_drain_times_out_on_stuck_handler():
+    async def main():
+        middleware = InFlightMiddleware()
+        handler = asyncio.create_task(_handle(middleware, 10))
+        await asyncio.sleep(0)
+        drained = await middleware.drain(timeout=0.05)
+        handler.cancel()
+        await asyncio.gather(handler, return_exceptions=True)
+        return drained, middleware.in_flight
+
+    # Bekor qilingan handler ham hisobdan chiqariladi
+    assert asyncio.run(main()) == (False, 0)
@@ -0,0 +1,53 @@
+# test_instrumentation.py: SQL o'lchash - span qamrovi va sekin so'rovlar jurnali
+import logging
+import time
+
+import pytest
+
+from utils.db_api.database import Database
+from utils.db_api.instrumentation import sql_instrumentation
+
+
+@pytest.fixture
+def timing():
+    sql_instrumentation.configure(timing=True, slow_query_ms=0, trace_sample_rate=0.0)
+    sql_instrumentation.reset()
+    yield sql_instrumentation
+    sql_instrumentation.configure(timing=False, slow_query_ms=0, trace_sample_rate=0.0)
+    sql_instrumentation.reset()
+
+
+def test_span_includes_row_fetch(tmp_path, timing, monkeypatch):
+    db = Database(str(tmp_path / "a.db"))
+    fetch = Database._fetch
+
+    def slow_fetch(self, *args):
+        time.sleep(0.05)
+        return fetch(self, *args)
+
+    monkeypatch.setattr(Database, "_fetch", slow_fetch)
+    assert db.execute("SELECT 1 AS x", fetchone=True) == (1,)
+    stats, = timing.snapshot()
+    assert stats["query"] == "SELECT 1 AS x"
+    assert stats["max_ms"] >= 50
+
+
+def test_slow_query_logged(tmp_path, caplog):
+    sql_instrumentation.configure(slow_query_ms=1)
+    try:
+        db = Database(str(tmp_path / "a.db"))
+        with caplog.at_level(logging.WARNING):
+            db.execute("""
+                WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 200000)
+                SELECT COUNT(*) FROM n
+            """, fetchone=True)
+        assert any("Sekin SQL" in record.message for record in caplog.records)
+    finally:
+        sql_instrumentation.configure(slow_query_ms=0)
+
+
+def test_disabled_instrumentation_is_null_span(tmp_path):
+    assert not sql_instrumentation._active
+    db = Database(str(tmp_path / "a.db"))
+    with db.pool.connection() as conn:
+        assert sql_instrumentation.span(conn, "SELECT 1") is sql_instrumentation.span(conn, "SELECT 2")
@@ -0,0 +1,60 @@
+# test_keyboard_cache.py: KeyboardCache - tayyor klaviaturalar va sozlamalar o'zgarganda bekor qilish
+import asyncio
+import json
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from keyboards.cache import KeyboardCache
+from utils.db_api.settings import SettingsDatabase
+from utils.misc.localization import Localization
+
+TEMPLATES = {"uz": {"pay": "To'lash ({amount} so'm)", "back": "Orqaga"},
+             "ru": {"pay": "Оплатить ({amount} сум)"}}
+
+
+def _texts(markup: str) -> list:
+    return [button["text"] for row in json.loads(markup)["inline_keyboard"] for button in row]
+
+
+def _keyboard(localization: Localization, language: str, builds: list):
+    def build():
+        builds.append(language)
+        return InlineKeyboardMarkup().add(InlineKeyboardButton(localization.get(language, "pay"), callback_data="pay"),
+                                          InlineKeyboardButton(localization.get(language, "back"), callback_data="back"))
+    return build
+
+
+def test_keyboard_built_once_per_key():
+    cache, localization, builds = KeyboardCache(), Localization(TEMPLATES), []
+    first = cache.get("uz", "payment", _keyboard(localization, "uz", builds))
+    again = cache.get("uz", "payment", _keyboard(localization, "uz", builds))
+    cache.get("ru", "payment", _keyboard(localization, "ru", builds))
+    # Sahifa va katalog versiyasi kalitning bir qismi
+    cache.get("uz", "payment", _keyboard(localization, "uz", builds), page=(2, 11, 25))
+    cache.get("uz", "payment", _keyboard(localization, "uz", builds), page=(2, 11, 25), version=1)
+    assert first is again and isinstance(first, str)
+    assert builds == ["uz", "ru", "uz", "uz"]
+
+
+def test_settings_change_rebuilds_keyboards_with_new_values(tmp_path):
+    # loader.py dagi bog'lanish: sozlamalar -> lokalizatsiya konteksti -> klaviatura keshi tozalanadi
+    cache, localization, builds = KeyboardCache(), Localization(TEMPLATES), []
+    settings = SettingsDatabase(str(tmp_path / "settings.db"), defaults={"payment_amount": 10000, "other": 1})
+    settings.subscribe(lambda db: localization.set_context(amount=db.get("payment_amount")))
+    localization.subscribe(cache.clear)
+
+    async def main():
+        await settings.migrate()
+        await settings.load()
+        before = cache.get("ru", "payment", _keyboard(localization, "ru", builds))
+        # Klaviaturaga kirmaydigan sozlama keshni tozalamaydi
+        await settings.set_value("other", 2)
+        cache.get("ru", "payment", _keyboard(localization, "ru", builds))
+        await settings.set_value("payment_amount", 12000)
+        after = cache.get("ru", "payment", _keyboard(localization, "ru", builds))
+        return _texts(before), _texts(after)
+
+    before, after = asyncio.run(main())
+    assert before == ["Оплатить (10000 сум)", "Orqaga"]
+    assert after == ["Оплатить (12000 сум)", "Orqaga"]
+    assert builds == ["ru", "ru"]
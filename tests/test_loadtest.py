@@ -0,0 +1,132 @@
+# test_loadtest.py: yuklama testi vositalari - persentil, soxta Bot API va update'lar
+import asyncio
+import json
+import socket
+
+import aiohttp
+import pytest
+from aiogram import Bot
+from aiogram.bot.api import TelegramAPIServer
+from aiogram.utils.exceptions import RetryAfter
+
+from loadtest.fake_api import BOT_USER, FakeBotAPI
+from loadtest.runner import BOT_TOKEN, percentile
+from loadtest.sessions import UpdateFactory, inline_buttons, reply_buttons
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _call(url: str, method: str, **params):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{url}/bot{BOT_TOKEN}/{method}", json=params) as response:
+            return response.status, await response.json()
+
+
+@pytest.mark.parametrize("q, expected", [(0, 1), (1, 1), (50, 5), (95, 10), (99, 10), (100, 10)])
+def test_percentile_nearest_rank(q, expected):
+    assert percentile([float(i) for i in range(1, 11)], q) == expected
+
+
+def test_percentile_empty_and_single():
+    assert percentile([], 50) == 0.0
+    assert percentile([7.0], 0) == percentile([7.0], 100) == 7.0
+
+
+def test_fake_api_injects_retry_after():
+    async def main():
+        api = FakeBotAPI(retry_after_rate=1.0, retry_after=3, seed=1)
+        url = await api.start(port=_free_port())
+        bot = Bot(BOT_TOKEN, server=TelegramAPIServer.from_base(url))
+        try:
+            with pytest.raises(RetryAfter) as error:
+                await bot.send_message(5, "salom")
+            # Yuborish bo'lmagan metodlarga 429 qaytarilmaydi
+            await bot.answer_callback_query("1")
+        finally:
+            await (await bot.get_session()).close()
+            await api.stop()
+        return error.value.timeout, api.retry_after_sent, [(c.method, c.status) for c in api.calls], \
+            api.reply_count(5)
+
+    assert asyncio.run(main()) == (3, 1, [("sendMessage", 429), ("answerCallbackQuery", 200)], 0)
+
+
+def test_wait_reply_resolves_in_order():
+    async def main():
+        api = FakeBotAPI()
+        url = await api.start(port=_free_port())
+        try:
+            first = asyncio.create_task(api.wait_reply(5, 0, timeout=2))
+            second = asyncio.create_task(api.wait_reply(5, 1, timeout=2))
+            await asyncio.sleep(0)
+            await _call(url, "sendMessage", chat_id=5, text="bir")
+            await asyncio.sleep(0.05)
+            second_after_one = second.done()
+            await _call(url, "sendMessage", chat_id=5, text="ikki")
+            replies = await first, await second
+            missing = await api.wait_reply(6, 0, timeout=0.05)
+        finally:
+            await api.stop()
+        return second_after_one, replies[0] < replies[1], missing, api.reply_count(5)
+
+    assert asyncio.run(main()) == (False, True, None, 2)
+
+
+def test_last_markup_tracks_keyboards_and_edits():
+    keyboard = {"inline_keyboard": [[{"text": "UZ", "callback_data": "lang_uz"}]]}
+    edited = {"inline_keyboard": [[{"text": "RU", "callback_data": "lang_ru"}]]}
+
+    async def main():
+        api = FakeBotAPI()
+        url = await api.start(port=_free_port())
+        try:
+            _, sent = await _call(url, "sendMessage", chat_id=5, text="til", reply_markup=json.dumps(keyboard))
+            await _call(url, "sendMessage", chat_id=5, text="klaviaturasiz")
+            after_plain = api.last_markup(5)
+            message_id = sent["result"]["message_id"]
+            await _call(url, "editMessageReplyMarkup", chat_id=5, message_id=message_id,
+                        reply_markup=json.dumps(edited))
+            after_edit = api.last_markup(5)
+        finally:
+            await api.stop()
+        return message_id, after_plain, after_edit, api.markup_count(5), api.last_markup(6)
+
+    message_id, after_plain, after_edit, count, other = asyncio.run(main())
+    assert after_plain == (message_id, keyboard)
+    assert after_edit == (message_id, edited)
+    assert (count, other) == (2, None)
+
+
+def test_update_factory_command_entities():
+    factory = UpdateFactory(first_update_id=10)
+    command = factory.text(7, "/start ref")
+    plain = factory.text(7, "Salom")
+    assert command["update_id"] == 10 and plain["update_id"] == 11
+    assert command["message"]["entities"] == [{"type": "bot_command", "offset": 0, "length": 6}]
+    assert "entities" not in plain["message"]
+    assert command["message"]["from"]["id"] == command["message"]["chat"]["id"] == 7
+
+
+def test_update_factory_callback_shape():
+    factory = UpdateFactory()
+    update = factory.callback(7, "allow_8", chat_id=1000, message_id=42)
+    query = update["callback_query"]
+    assert query["from"]["id"] == 7 and query["data"] == "allow_8"
+    assert query["message"]["chat"]["id"] == 1000 and query["message"]["message_id"] == 42
+    assert query["message"]["from"] == BOT_USER
+    # Standart holatda callback foydalanuvchining o'z chatidagi xabarga tegishli
+    own = factory.callback(7, "lang_uz")["callback_query"]
+    assert own["message"]["chat"]["id"] == 7 and own["id"] != query["id"]
+
+
+def test_inline_and_reply_buttons():
+    inline = {"inline_keyboard": [[{"text": "A", "callback_data": "a"}, {"text": "Sayt", "url": "https://t.me"}],
+                                  [{"text": "B", "callback_data": "b"}]]}
+    reply = {"keyboard": [[{"text": "Savollar"}, "Belgilar"], [{"text": "Orqaga"}]]}
+    assert inline_buttons(inline) == ["a", "b"]
+    assert reply_buttons(reply) == ["Savollar", "Belgilar", "Orqaga"]
+    assert inline_buttons({}) == reply_buttons({}) == []
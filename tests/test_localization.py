@@ -0,0 +1,63 @@
+# test_localization.py: Localization - bir marta kompilyatsiya va faqat maydonli shablonlarni qayta yozish
+from utils.misc.localization import Localization
+
+TEMPLATES = {
+    "uz": {"hello": "Salom", "price": "Narx: {amount} so'm", "card": "Karta: {uzcard}, egasi {owner}",
+           "braces": "{{amount}} - maydon emas"},
+    "ru": {"hello": "Привет", "price": "Цена: {amount} сум"},
+}
+
+
+def _render_spy(localization: Localization) -> list:
+    rendered = []
+    render = localization._render
+    localization._render = lambda keys: rendered.append(sorted(keys)) or render(keys)
+    return rendered
+
+
+def test_lookup_and_fallback():
+    localization = Localization(TEMPLATES, missing="?")
+    assert localization.get("ru", "hello") == "Привет"
+    # ru da yo'q kalit va noma'lum til fallback (uz) dan olinadi
+    assert localization.get("ru", "braces") == localization.get("es", "braces") == "{amount} - maydon emas"
+    assert localization.get("uz", "unknown") == "?"
+    # Kontekst berilmaguncha shablon o'zgarishsiz qoladi
+    assert localization.get("uz", "price") == "Narx: {amount} so'm"
+
+
+def test_only_dependent_templates_rerendered():
+    localization = Localization(TEMPLATES)
+    rendered = _render_spy(localization)
+    hello = localization.get("uz", "hello")
+
+    assert localization.set_context(amount=14.09) is True
+    assert rendered == [[("ru", "price"), ("uz", "price")]]
+    assert localization.get("ru", "price") == "Цена: 14.09 сум"
+    # Maydonsiz matn qayta yaratilmaydi
+    assert localization.get("uz", "hello") is hello
+
+    # ru da "card" yo'q, lekin fallback orqali olingan shablon ham qayta yoziladi
+    localization.set_context(uzcard="8600", owner="Ali")
+    assert rendered[-1] == [("ru", "card"), ("uz", "card")]
+    assert localization.get("uz", "card") == "Karta: 8600, egasi Ali"
+
+
+def test_unchanged_context_keeps_version():
+    localization = Localization(TEMPLATES)
+    notified = []
+    localization.subscribe(lambda catalog: notified.append(catalog.version))
+    localization.set_context(amount=10)
+    version = localization.version
+    assert localization.set_context(amount=10) is False
+    assert localization.version == version
+    localization.set_context(amount=20, owner="Ali")
+    assert notified == [version, localization.version] and localization.version > version
+
+
+def test_failing_subscriber_does_not_block_others():
+    localization = Localization(TEMPLATES)
+    notified = []
+    localization.subscribe(lambda catalog: 1 / 0)
+    localization.subscribe(lambda catalog: notified.append(catalog.get("uz", "price")))
+    localization.set_context(amount=5)
+    assert notified == ["Narx: 5 so'm"]
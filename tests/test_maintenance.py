@@ -0,0 +1,94 @@
+# test_maintenance.py: WAL PRAGMA profili va checkpoint rejalashtiruvchisi
+import asyncio
+import os
+import time
+
+import pytest
+
+from utils.db_api import maintenance
+from utils.db_api.database import Database
+from utils.db_api.pool import ConnectionPool, configure_pools, _pool_options
+
+WAL_PROFILE = {"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000}
+
+
+@pytest.fixture
+def wal_pools():
+    saved = dict(_pool_options)
+    configure_pools(pragmas=WAL_PROFILE)
+    yield
+    _pool_options.clear()
+    _pool_options.update(saved)
+
+
+def test_stop_truncates_wal(tmp_path, wal_pools):
+    db = Database(str(tmp_path / "a.db"))
+    wal = db.path_to_db + "-wal"
+
+    async def main():
+        maintenance.start_checkpoint_scheduler(3600)
+        assert maintenance._checkpoint_task is not None
+        await db.execute_async("CREATE TABLE t (x)", commit=True)
+        await db.executemany_async("INSERT INTO t VALUES (?)", [(i,) for i in range(1000)])
+        assert os.path.getsize(wal) > 0
+        await maintenance.stop_checkpoint_scheduler()
+
+    asyncio.run(main())
+    assert maintenance._checkpoint_task is None
+    assert os.path.getsize(wal) == 0
+    assert db.execute("SELECT COUNT(*) FROM t", fetchone=True) == (1000,)
+
+
+def test_scheduler_runs_periodically(tmp_path, wal_pools, monkeypatch):
+    modes = []
+
+    async def fake_checkpoint_all(mode="PASSIVE"):
+        modes.append(mode)
+
+    monkeypatch.setattr(maintenance, "checkpoint_all", fake_checkpoint_all)
+
+    async def main():
+        maintenance._checkpoint_task = asyncio.create_task(maintenance._checkpoint_loop(0.01))
+        await asyncio.sleep(0.1)
+        await maintenance.stop_checkpoint_scheduler()
+
+    asyncio.run(main())
+    assert modes.count("PASSIVE") >= 3
+    assert modes[-1] == "TRUNCATE"
+
+
+def test_disabled_scheduler_not_started():
+    maintenance.start_checkpoint_scheduler(0)
+    assert maintenance._checkpoint_task is None
+
+
+def _commits_per_second(path: str, pragmas: dict, rows: int = 500) -> float:
+    pool = ConnectionPool(path, pragmas=pragmas)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE Users (telegram_id INTEGER PRIMARY KEY, last_active TEXT)")
+        conn.commit()
+        started = time.perf_counter()
+        # update_last_active kabi: har bir yozuv alohida commit
+        for i in range(rows):
+            conn.execute("INSERT OR REPLACE INTO Users VALUES (?, ?)", (i, str(i)))
+            conn.commit()
+        elapsed = time.perf_counter() - started
+    pool.close()
+    return rows / elapsed
+
+
+def test_wal_profile_applied(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "wal.db"), pragmas=WAL_PROFILE)
+    with pool.connection() as conn:
+        settings = tuple(conn.execute(f"PRAGMA {name}").fetchone()[0] for name in WAL_PROFILE)
+    pool.close()
+    # synchronous=NORMAL -> 1
+    assert settings == ("wal", 1, 5000)
+
+
+@pytest.mark.benchmark
+def test_wal_profile_write_throughput(tmp_path):
+    """Benchmark: standart rollback journal + FULL sync va WAL + NORMAL."""
+    default = _commits_per_second(str(tmp_path / "default.db"), {"journal_mode": "DELETE", "synchronous": "FULL"})
+    wal = _commits_per_second(str(tmp_path / "wal.db"), WAL_PROFILE)
+    assert wal > default, f"commits/s: default={default:.0f}, wal={wal:.0f}"
@@ -0,0 +1,28 @@
+# test_outbound.py: OutboundScheduler - chat cheklovlari
+from utils.misc.outbound import OutboundScheduler
+
+
+def test_shared_chats_split_limit_between_processes():
+    scheduler = OutboundScheduler(chat_rate=1.0, chat_burst=3, shared_chats=[1000], shares=3)
+    admin, user = scheduler._chat_bucket(1000, 0.0), scheduler._chat_bucket(42, 0.0)
+    assert (admin.rate, admin.capacity) == (1.0 / 3, 1.0)
+    assert (user.rate, user.capacity) == (1.0, 3)
+    # chat_id satr ko'rinishida kelsa ham bir xil chat
+    assert scheduler._chat_bucket("1000", 0.0).rate == 1.0 / 3
+
+
+def test_single_process_keeps_full_limit():
+    scheduler = OutboundScheduler(chat_rate=1.0, chat_burst=3, shared_chats=[1000])
+    assert scheduler._chat_bucket(1000, 0.0).rate == 1.0
+
+
+def test_chat_buckets_bounded_by_lru():
+    scheduler = OutboundScheduler(chat_rate=1.0, chat_burst=3, max_chats=3)
+    # Hech biri bo'sh turmagan (token ishlatilgan) bo'lsa ham chegara saqlanadi
+    for chat_id in (1, 2, 3):
+        scheduler._chat_bucket(chat_id, 0.0).reserve(0.0)
+    recent = scheduler._chat_bucket(1, 0.0)
+    scheduler._chat_bucket(4, 0.0)
+    assert list(scheduler._chats) == [3, 1, 4]
+    # Qolgan bucket o'z holatini saqlaydi
+    assert scheduler._chat_bucket(1, 0.0) is recent
@@ -0,0 +1,40 @@
+# test_pagination.py: keyset paginatsiya tugmalari va callback formatlari
+import pytest
+
+from handlers.users.start import get_pagination_buttons, parse_page_callback
+
+
+def _items(first: int, last: int) -> list:
+    return [{"display_id": i} for i in range(first, last + 1)]
+
+
+def _callbacks(keyboard) -> list:
+    return [button.callback_data for row in keyboard.inline_keyboard for button in row]
+
+
+@pytest.mark.parametrize("page, items, expected", [
+    (1, _items(1, 10), ["page_road_sign_2_10_ru"]),
+    (2, _items(11, 20), ["page_road_sign_1_0_ru", "page_road_sign_3_20_ru"]),
+    (3, _items(21, 25), ["page_road_sign_2_10_ru"]),
+])
+def test_cursor_on_first_middle_and_last_page(page, items, expected):
+    assert _callbacks(get_pagination_buttons("road_sign", page, 25, "ru", items)) == expected
+
+
+def test_single_page_and_empty_have_no_buttons():
+    assert _callbacks(get_pagination_buttons("question", 1, 7, "uz", _items(1, 7))) == []
+    assert _callbacks(get_pagination_buttons("question", 1, 0, "uz", [])) == []
+
+
+@pytest.mark.parametrize("page, items", [(1, _items(1, 10)), (2, _items(11, 20)), (3, _items(21, 25))])
+def test_callbacks_round_trip_to_neighbour_pages(page, items):
+    # Har bir tugma kursori qo'shni sahifaning birinchi elementidan oldingi display_id ni beradi
+    for data in _callbacks(get_pagination_buttons("truck_part", page, 25, "es", items)):
+        section, target, after, language = parse_page_callback(data)
+        assert (section, language) == ("truck_part", "es")
+        assert after == (target - 1) * 10
+
+
+def test_legacy_callback_falls_back_to_offset():
+    assert parse_page_callback("page_question_3_uz") == ("question", 3, 20, "uz")
+    assert parse_page_callback("page_truck_part_2_ru") == ("truck_part", 2, 10, "ru")
@@ -0,0 +1,101 @@
+# test_pool.py: ConnectionPool - ulanishlarni qayta ishlatish, chegaralar, PRAGMA va health-check
+import sqlite3
+import time
+
+import pytest
+
+from utils.db_api.database import Database
+from utils.db_api.pool import ConnectionPool, get_pool
+
+
+def test_connection_is_reused(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "a.db"))
+    with pool.connection() as first:
+        pass
+    for _ in range(100):
+        with pool.connection() as conn:
+            assert conn is first
+    assert pool._created == 1
+    pool.close()
+
+
+def test_pool_is_bounded(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "a.db"), max_size=2, timeout=0.1)
+    a, b = pool.acquire(), pool.acquire()
+    with pytest.raises(sqlite3.OperationalError, match="Timed out"):
+        pool.acquire()
+    pool.release(a)
+    assert pool.acquire() is a
+    pool.release(a)
+    pool.release(b)
+    pool.close()
+
+
+def test_pragmas_applied(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "a.db"), pragmas={"journal_mode": "WAL", "synchronous": "NORMAL"})
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    pool.close()
+
+
+def test_unhealthy_connection_replaced(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "a.db"), health_check_interval=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    with pool.connection() as fresh:
+        assert fresh is not conn
+        assert fresh.execute("SELECT 1").fetchone() == (1,)
+    assert pool._created == 1
+    pool.close()
+
+
+def test_open_transaction_rolled_back_on_release(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "a.db"))
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.in_transaction
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+    pool.close()
+
+
+def test_database_queries_share_one_connection(tmp_path):
+    db = Database(str(tmp_path / "a.db"))
+    db.execute("CREATE TABLE t (x)", commit=True)
+    for i in range(50):
+        db.execute("INSERT INTO t VALUES (?)", (i,), commit=True)
+    assert db.execute("SELECT COUNT(*) FROM t", fetchone=True) == (50,)
+    assert get_pool(db.path_to_db)._created == 1
+
+
+@pytest.mark.benchmark
+def test_pooled_faster_than_connect_per_call(tmp_path):
+    """Benchmark: har so'rovda sqlite3.connect() va hovuzdagi issiq ulanish."""
+    path = str(tmp_path / "user.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE Users (id INTEGER PRIMARY KEY, telegram_id BIGINT UNIQUE, language TEXT)")
+        conn.executemany("INSERT INTO Users (telegram_id, language) VALUES (?, 'uz')",
+                         ((i,) for i in range(100_000)))
+    sql = "SELECT * FROM Users WHERE telegram_id = ?"
+    calls = 2000
+
+    started = time.perf_counter()
+    for i in range(calls):
+        conn = sqlite3.connect(path)
+        conn.execute(sql, (i * 50,)).fetchone()
+        conn.close()
+    per_call = time.perf_counter() - started
+
+    pool = ConnectionPool(path)
+    started = time.perf_counter()
+    for i in range(calls):
+        with pool.connection() as conn:
+            conn.execute(sql, (i * 50,)).fetchone()
+    pooled = time.perf_counter() - started
+    pool.close()
+
+    assert pooled < per_call, f"connect per call: {calls / per_call:.0f} q/s, pooled: {calls / pooled:.0f} q/s"
@@ -0,0 +1,111 @@
+# test_query_plans.py: issiq so'rovlar indekslardan foydalanishini (SCAN emas, SEARCH) tekshiradi
+#
+# DAO metodlari chaqirilganda bajarilgan so'rovlar (SQL va parametrlar) yozib olinadi,
+# keyin har biri uchun EXPLAIN QUERY PLAN olinadi. Shu tariqa testlar kod ichidagi
+# haqiqiy so'rovlarni tekshiradi, ularning nusxasini emas.
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from utils.db_api.database import Database
+from utils.db_api.payment import PaymentDatabase
+from utils.db_api.sections import SECTION_TABLES, SectionsDatabase
+from utils.db_api.users import UserDatabase
+
+
+@pytest.fixture
+def queries(monkeypatch) -> List[Tuple[str, tuple]]:
+    captured = []
+    execute = Database.execute
+
+    def recording_execute(self, sql, parameters=None, *args, **kwargs):
+        captured.append((sql, parameters or ()))
+        return execute(self, sql, parameters, *args, **kwargs)
+
+    monkeypatch.setattr(Database, "execute", recording_execute)
+    return captured
+
+
+def query_plan(db: Database, sql: str, parameters=()) -> List[str]:
+    with db.pool.connection() as conn:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+
+
+def assert_uses_index(db: Database, sql: str, parameters, index: str) -> None:
+    plan = query_plan(db, sql, parameters)
+    assert not [step for step in plan if step.startswith("SCAN")], f"{sql}\n{plan}"
+    assert any(step.startswith("SEARCH") and index in step for step in plan), f"{sql}\n{plan}"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def sections_db(tmp_path):
+    db = SectionsDatabase(str(tmp_path / "sections.db"))
+    run(db.migrate())
+    for i in range(50):
+        run(db.add_question(f"q{i}", f"a{i}", language="uz"))
+        run(db.add_road_sign(f"sign{i}", language="ru"))
+        run(db.add_truck_part(f"part{i}", language="es"))
+    return db
+
+
+@pytest.mark.parametrize("section", list(SECTION_TABLES))
+def test_keyset_page_uses_language_display_index(sections_db, queries, section):
+    table = SECTION_TABLES[section][0]
+    run(sections_db._load_page(section, "uz", 10, 10))
+    (sql, parameters), = queries
+    assert "display_id > ?" in sql
+    assert_uses_index(sections_db, sql, parameters, f"idx_{table.lower()}_language_display")
+
+
+@pytest.mark.parametrize("table", [table for table, _, _ in SECTION_TABLES.values()])
+def test_display_id_lookups_use_index(sections_db, queries, table):
+    run(sections_db._get_next_display_id(table, "uz"))
+    (sql, parameters), = queries
+    assert_uses_index(sections_db, sql, parameters, f"idx_{table.lower()}_language_display")
+    # O'chirishdan keyingi qayta raqamlash (_delete_item tranzaksiyasi ichida)
+    renumber = f"UPDATE {table} SET display_id = display_id - 1 WHERE language = ? AND display_id > ?"
+    assert_uses_index(sections_db, renumber, ("uz", 10), f"idx_{table.lower()}_language_display")
+
+
+def test_section_count_uses_counter_row(sections_db, queries):
+    run(sections_db._load_count("question", "uz"))
+    (sql, parameters), = queries
+    assert_uses_index(sections_db, sql, parameters, "SectionCounts")
+
+
+def test_user_hot_queries_use_indexes(tmp_path, queries):
+    db = UserDatabase(str(tmp_path / "user.db"))
+    run(db.migrate())
+    for i in range(50):
+        run(db.add_user(i, f"user{i}"))
+    queries.clear()
+
+    run(db.select_user(7))
+    run(db.count_daily_users())
+    run(db.count_weekly_users())
+    run(db.count_active_weekly_users())
+    run(db.count_users())
+    expected = ["sqlite_autoindex_Users_1", "idx_users_created_at", "idx_users_created_at",
+                "idx_users_last_active", "INTEGER PRIMARY KEY"]
+    assert len(queries) == len(expected)
+    for (sql, parameters), index in zip(queries, expected):
+        assert_uses_index(db, sql, parameters, index)
+
+
+def test_payment_hot_queries_use_indexes(tmp_path, queries):
+    db = PaymentDatabase(str(tmp_path / "payment.db"))
+    run(db.migrate())
+    queries.clear()
+
+    run(db.get_user_pending_payment(1))
+    run(db.get_pending_payments())
+    run(db.get_user_payment_history(1))
+    expected = ["idx_payments_user_status", "idx_payments_status_created", "idx_payments_user_status"]
+    assert len(queries) == len(expected)
+    for (sql, parameters), index in zip(queries, expected):
+        assert_uses_index(db, sql, parameters, index)
@@ -0,0 +1,89 @@
+# test_records.py: yozuv turlari - dict o'rniga ishlatish, xotira va maydonlarga murojaat
+import sys
+import timeit
+import tracemalloc
+
+import pytest
+
+from utils.db_api.database import dict_rows
+from utils.db_api.records import Payment, Question, RoadSign, TruckPart, User, record_factory
+
+COLUMNS = Question._fields
+
+
+def question_row(i: int) -> tuple:
+    return (i, i, f"Savol {i}?", f"Javob {i}.", None, "uz")
+
+
+@pytest.mark.parametrize("record_type", [Question, RoadSign, TruckPart, User, Payment])
+def test_records_have_no_instance_dict(record_type):
+    record = record_type._make(range(len(record_type._fields)))
+    assert not hasattr(record, "__dict__")
+
+
+def test_dict_style_reads():
+    record = Question._make(question_row(1))
+    assert record["question"] == record.question == record[2] == "Savol 1?"
+    assert record.get("audio_file_id", "x") is None
+    assert record.get("missing", "x") == "x"
+    assert "answer" in record and "missing" not in record
+    assert dict(record) == record.as_dict() == dict(zip(COLUMNS, question_row(1)))
+    with pytest.raises(KeyError):
+        record["missing"]
+
+
+def test_replace_keeps_type_and_original():
+    user = User._make((1, 10, "u", None, None, 0, 0, "uz"))
+    allowed = user._replace(is_allowed=1)
+    assert isinstance(allowed, User) and allowed["is_allowed"] == 1 and user["is_allowed"] == 0
+
+
+def test_record_factory_reorders_columns():
+    convert = record_factory(Question)(("question", "id", "language"))
+    record = convert(("q", 5, "ru"))
+    assert record == Question(5, None, "q", None, None, "ru")
+
+
+def _allocated(build) -> int:
+    tracemalloc.start()
+    try:
+        rows = build()
+        size, _ = tracemalloc.get_traced_memory()
+        del rows
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def test_record_smaller_than_dict():
+    row = question_row(1)
+    assert Question.__slots__ == ()
+    assert sys.getsizeof(Question._make(row)) < sys.getsizeof(dict(zip(COLUMNS, row))) / 2
+
+
+@pytest.mark.benchmark
+def test_records_use_less_memory_than_dicts():
+    """Benchmark: 30k katalog qatori - dict va yozuv."""
+    raw = [question_row(i) for i in range(30_000)]
+    to_dict = dict_rows(COLUMNS)
+    to_record = record_factory(Question)(COLUMNS)
+    dicts = _allocated(lambda: [to_dict(row) for row in raw])
+    records = _allocated(lambda: [to_record(row) for row in raw])
+    assert records < dicts * 0.6, f"30k rows: dict={dicts / 1e6:.1f} MB, record={records / 1e6:.1f} MB"
+
+
+@pytest.mark.benchmark
+def test_attribute_access_speed():
+    """Benchmark: maydonga murojaat - dict["x"], record.x va record["x"]."""
+    row = question_row(1)
+    as_dict, record = dict(zip(COLUMNS, row)), Question._make(row)
+    number = 200_000
+    timings = {
+        "dict[key]": timeit.timeit(lambda: as_dict["question"], number=number),
+        "record.attr": timeit.timeit(lambda: record.question, number=number),
+        "record[key]": timeit.timeit(lambda: record["question"], number=number),
+    }
+    # Atribut murojaati dict bilan bir darajada; ["x"] mos kelish uchun qoldirilgan, biroz sekinroq
+    assert timings["record.attr"] < timings["dict[key]"] * 3, \
+        "access ns/op: " + ", ".join(f"{k}={v / number * 1e9:.0f}" for k, v in timings.items())
+    assert timings["record[key]"] < timings["dict[key]"] * 10
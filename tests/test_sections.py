@@ -0,0 +1,205 @@
+# test_sections.py: SectionsDatabase - hisoblagichlar, display_id tekshiruvi va o'chirish
+import asyncio
+import itertools
+import sqlite3
+import time
+
+import pytest
+
+from utils.db_api.database import Database
+from utils.db_api.sections import SECTION_TABLES, SectionsDatabase
+
+LANGUAGES = ("uz", "ru", "es")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def new_db(tmp_path, name: str = "sections.db") -> SectionsDatabase:
+    db = SectionsDatabase(str(tmp_path / name))
+    run(db.migrate())
+    return db
+
+
+def fill(db: SectionsDatabase, items: int) -> None:
+    """Har bir bo'lim va til uchun ``items`` ta elementni to'g'ridan-to'g'ri (1..N display_id bilan) yozadi."""
+    with sqlite3.connect(db.path_to_db) as conn:
+        for i in range(1, items + 1):
+            for language in LANGUAGES:
+                conn.execute("INSERT INTO Questions (display_id, question, answer, language) VALUES (?, ?, ?, ?)",
+                             (i, f"q{i}", f"a{i}", language))
+                conn.execute("INSERT INTO RoadSigns (display_id, image_file_id, language) VALUES (?, ?, ?)",
+                             (i, f"s{i}", language))
+                conn.execute("INSERT INTO TruckParts (display_id, image_file_id, language) VALUES (?, ?, ?)",
+                             (i, f"p{i}", language))
+
+
+def counters_match_count(db: SectionsDatabase) -> None:
+    for section, (table, _, _) in SECTION_TABLES.items():
+        for language in LANGUAGES:
+            counted = db.execute(f"SELECT COUNT(*) AS total FROM {table} WHERE language = ?", (language,),
+                                 fetchone=True)
+            assert run(db._load_count(section, language)) == counted["total"], (section, language)
+
+
+def test_counters_follow_insert_delete_and_language_change(tmp_path):
+    db = new_db(tmp_path)
+    ids = [run(db.add_question(f"q{i}", f"a{i}", language=LANGUAGES[i % 3])) for i in range(12)]
+    signs = [run(db.add_road_sign(f"s{i}", language="ru")) for i in range(5)]
+    counters_match_count(db)
+
+    run(db.delete_question(ids[0]))
+    run(db.delete_road_sign(signs[-1]))
+    run(db.update_question(ids[1], language="es"))
+    counters_match_count(db)
+    assert run(db.get_question_count_by_language("es")) == 5
+    assert run(db.get_road_sign_count_by_language("ru")) == 4
+
+
+def test_migration_backfills_counters_for_existing_rows(tmp_path):
+    db = new_db(tmp_path)
+    fill(db, 20)
+    db.execute("DELETE FROM SectionCounts", commit=True)
+    db.execute("DELETE FROM schema_version WHERE version >= 2", commit=True)
+    run(db.migrate())
+    counters_match_count(db)
+
+
+def test_verify_display_ids_only_reindexes_broken_pairs(tmp_path):
+    db = new_db(tmp_path)
+    fill(db, 10)
+    assert run(db.verify_display_ids()) == 0
+
+    # Bo'shliq: uz savollarida display_id 3 yo'q
+    db.execute("DELETE FROM Questions WHERE language = 'uz' AND display_id = 3", commit=True)
+    assert run(db.verify_display_ids()) == 1
+    rows = db.execute("SELECT display_id FROM Questions WHERE language = 'uz' ORDER BY display_id", fetchall=True)
+    assert [row["display_id"] for row in rows] == list(range(1, 10))
+    assert run(db.verify_display_ids()) == 0
+
+
+def test_verify_display_ids_detects_duplicate_with_gap(tmp_path):
+    db = new_db(tmp_path)
+    fill(db, 5)
+    # 1, 2, 2, 4, 5: MAX va soni mos, lekin 3 yo'q va 2 takrorlangan
+    db.execute("UPDATE RoadSigns SET display_id = 2 WHERE language = 'es' AND display_id = 3", commit=True)
+    assert run(db.verify_display_ids()) == 1
+    assert display_ids(db, "RoadSigns", "es") == list(range(1, 6))
+    assert run(db.verify_display_ids()) == 0
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    count = [0]
+    execute = Database.execute
+
+    def counting_execute(self, *args, **kwargs):
+        count[0] += 1
+        return execute(self, *args, **kwargs)
+
+    monkeypatch.setattr(Database, "execute", counting_execute)
+    return count
+
+
+def test_startup_check_cost_independent_of_catalog_size(tmp_path, statements):
+    """Sog'lom bazada startup tekshiruvidagi so'rovlar soni katalog hajmiga bog'liq emas."""
+    results = {}
+    for items in (10, 5000):
+        db = new_db(tmp_path, f"sections_{items}.db")
+        fill(db, items)
+        statements[0] = 0
+        assert run(db.verify_display_ids()) == 0
+        results[items] = statements[0]
+    # Har bir (bo'lim, til) uchun hisoblagich va MIN/MAX/takrorlanmaslar soni - jami 18 ta so'rov
+    assert results[10] == results[5000] == 18
+
+
+def display_ids(db: SectionsDatabase, table: str, language: str) -> list:
+    rows = db.execute(f"SELECT display_id FROM {table} WHERE language = ? ORDER BY id", (language,), fetchall=True)
+    return [row["display_id"] for row in rows]
+
+
+def test_delete_shifts_later_display_ids(tmp_path):
+    db = new_db(tmp_path)
+    fill(db, 10)
+    item = db.execute("SELECT id FROM Questions WHERE language = 'ru' AND display_id = 4", fetchone=True)
+    run(db.delete_question(item["id"]))
+    assert display_ids(db, "Questions", "ru") == list(range(1, 10))
+    # Boshqa tillar o'zgarmaydi
+    assert display_ids(db, "Questions", "uz") == list(range(1, 11))
+    assert run(db.get_question_count_by_language("ru")) == 9
+    assert run(db.verify_display_ids()) == 0
+
+
+def test_delete_and_renumber_share_one_transaction(tmp_path):
+    db = new_db(tmp_path)
+    fill(db, 10)
+    # Qayta raqamlash xatolik bersa, DELETE ham bekor bo'lishi kerak
+    db.execute("""
+        CREATE TRIGGER fail_renumber BEFORE UPDATE OF display_id ON RoadSigns
+        BEGIN SELECT RAISE(ABORT, 'renumber failed'); END
+    """, commit=True)
+    item = db.execute("SELECT id FROM RoadSigns WHERE language = 'uz' AND display_id = 2", fetchone=True)
+    with pytest.raises(sqlite3.IntegrityError, match="renumber failed"):
+        run(db.delete_road_sign(item["id"]))
+    assert display_ids(db, "RoadSigns", "uz") == list(range(1, 11))
+    assert run(db.get_road_sign_count_by_language("uz")) == 10
+
+
+def _per_row_reindex(db: SectionsDatabase, table: str, item_id: int, language: str) -> None:
+    """Avvalgi usul: o'chirish, keyin har bir qator uchun alohida UPDATE va commit."""
+    with db.pool.connection() as conn:
+        conn.execute(f"DELETE FROM {table} WHERE id = ?", (item_id,))
+        conn.commit()
+        ids = [row[0] for row in conn.execute(f"SELECT id FROM {table} WHERE language = ? ORDER BY id", (language,))]
+        for display_id, row_id in enumerate(ids, start=1):
+            conn.execute(f"UPDATE {table} SET display_id = ? WHERE id = ?", (display_id, row_id))
+            conn.commit()
+
+
+def _traced_delete(db: SectionsDatabase, items: int) -> list:
+    """Birinchi elementni o'chiradi va hovuzdagi ulanishda bajarilgan SQL larni qaytaradi."""
+    fill(db, items)
+    first = db.execute("SELECT id FROM TruckParts WHERE language = 'es' AND display_id = 1", fetchone=True)
+    traced = []
+    with db.pool.connection() as conn:
+        conn.set_trace_callback(traced.append)
+    run(db.delete_truck_part(first["id"]))
+    with db.pool.connection() as conn:
+        conn.set_trace_callback(None)
+    assert display_ids(db, "TruckParts", "es") == list(range(1, items))
+    # Trigger ichidagi har bir qadam tashqi so'rov matni bilan qayta keladi - ketma-ket takrorlar bitta so'rov
+    return [sql.split()[0].upper() for sql, _ in itertools.groupby(traced)]
+
+
+def test_delete_statement_count_independent_of_section_size(tmp_path):
+    small = _traced_delete(new_db(tmp_path, "small.db"), 10)
+    large = _traced_delete(new_db(tmp_path, "large.db"), 1000)
+    # Qator boshiga UPDATE emas: bitta tranzaksiya, so'rovlar soni bir xil
+    assert small == large
+    assert small.count("BEGIN") == small.count("COMMIT") == 1
+
+
+@pytest.mark.benchmark
+def test_delete_latency_by_section_size(tmp_path):
+    """Benchmark: birinchi elementni o'chirish (eng ko'p qator suriladi) - bo'lim hajmiga qarab."""
+    timings = {}
+    for items in (100, 1000, 5000):
+        db = new_db(tmp_path, f"sections_{items}.db")
+        fill(db, items)
+        first = db.execute("SELECT id FROM TruckParts WHERE language = 'es' AND display_id = 1", fetchone=True)
+        started = time.perf_counter()
+        run(db.delete_truck_part(first["id"]))
+        timings[items] = time.perf_counter() - started
+        assert display_ids(db, "TruckParts", "es") == list(range(1, items))
+
+    db = new_db(tmp_path, "sections_per_row.db")
+    fill(db, 1000)
+    first = db.execute("SELECT id FROM TruckParts WHERE language = 'es' AND display_id = 1", fetchone=True)
+    started = time.perf_counter()
+    _per_row_reindex(db, "TruckParts", first["id"], "es")
+    per_row = time.perf_counter() - started
+
+    assert timings[1000] < per_row, f"set-based={timings}, per-row commits (1000)={per_row:.3f}"
+    assert timings[5000] < 1.0, f"set-based={timings}"
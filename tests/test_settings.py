@@ -0,0 +1,77 @@
+# test_settings.py: SettingsDatabase - standart qiymatlar, yuklash va boshqa jarayon o'zgarishlari
+import asyncio
+import inspect
+
+import pytest
+
+from utils.db_api.changes import ChangeWatcher
+from utils.db_api.settings import SettingsDatabase
+
+DEFAULTS = {"payment_amount": 14.09, "payment_card": "card"}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "settings.db")
+    run(SettingsDatabase(path).migrate())
+    return path
+
+
+def stored(db: SettingsDatabase) -> dict:
+    return dict(db.execute("SELECT key, value FROM Settings", fetchall=True))
+
+
+def test_load_does_not_write_defaults(path):
+    db = SettingsDatabase(path, defaults=DEFAULTS)
+    assert run(db.load()) == DEFAULTS
+    assert stored(db) == {}
+
+
+def test_seed_defaults_keeps_existing_values(path):
+    db = SettingsDatabase(path, defaults=DEFAULTS)
+    run(db.set_value("payment_amount", 20))
+    run(db.seed_defaults())
+    run(db.seed_defaults())
+    assert stored(db) == {"payment_amount": "20", "payment_card": '"card"'}
+    assert run(db.load())["payment_amount"] == 20
+
+
+def test_on_change_is_sync_and_coalesced(path):
+    assert not inspect.iscoroutinefunction(SettingsDatabase.on_change)
+    writer, reader = SettingsDatabase(path, defaults=DEFAULTS), SettingsDatabase(path, defaults=DEFAULTS)
+    notified = []
+    reader.subscribe(lambda settings: notified.append(settings.get("payment_amount")))
+
+    async def main():
+        await reader.load()
+        await writer.set_value("payment_amount", 30)
+        reader.on_change("setting", "payment_amount")
+        reader.on_change("setting", "payment_amount")
+        reader.on_change("section", "question:uz")
+        await reader._reload_task
+
+    run(main())
+    assert reader.get("payment_amount") == 30
+    assert notified == [14.09, 30]
+
+
+def test_change_from_other_connection_reaches_watcher(path):
+    writer, reader = SettingsDatabase(path, defaults=DEFAULTS), SettingsDatabase(path, defaults=DEFAULTS)
+
+    async def main():
+        await reader.load()
+        watcher = ChangeWatcher(path, reader.on_change, interval=0.01)
+        await watcher.start()
+        await writer.set_value("payment_card", "new card")
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if reader.get("payment_card") == "new card":
+                break
+        await watcher.stop()
+
+    run(main())
+    assert reader.get("payment_card") == "new card"
@@ -0,0 +1,194 @@
+# test_sharding.py: ShardRouter - foydalanuvchi bo'yicha tartib, navbat cheklovi va drain
+import asyncio
+
+from aiohttp import web
+
+from utils.misc.sharding import ShardPeers, ShardRouter, invalidation_app, shard_for
+
+
+def _message(update_id: int, user_id: int) -> dict:
+    return {"update_id": update_id, "message": {"message_id": update_id, "from": {"id": user_id},
+                                                 "chat": {"id": user_id}, "text": "/start"}}
+
+
+async def _start(app: web.Application):
+    """``app`` ni lokal bo'sh portda ishga tushiradi va (runner, port) qaytaradi."""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def _serve(handler):
+    """``handler`` ni lokal worker webhook'i sifatida ishga tushiradi va (runner, url) qaytaradi."""
+    app = web.Application()
+    app.router.add_post("/webhook", handler)
+    runner, port = await _start(app)
+    return runner, f"http://127.0.0.1:{port}/webhook"
+
+
+class FakeWorker:
+    """Lokal worker o'rnida: update'larni qayd qiladi, ``delays`` bo'yicha javobni kechiktiradi."""
+
+    def __init__(self, delays=None, gate: asyncio.Event = None):
+        self.delays = delays or {}
+        self.gate = gate
+        self.events = []
+        self.runner = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        update = await request.json()
+        update_id = update["update_id"]
+        self.events.append(("start", update_id))
+        if self.gate is not None:
+            await self.gate.wait()
+        await asyncio.sleep(self.delays.get(update_id, 0))
+        self.events.append(("end", update_id))
+        return web.Response()
+
+    async def start(self) -> str:
+        self.runner, url = await _serve(self.handle)
+        return url
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+
+def test_shard_for_is_stable_per_user():
+    assert shard_for(_message(1, 7), 4) == shard_for(_message(2, 7), 4) == 3
+
+
+def test_updates_of_one_user_are_forwarded_in_order():
+    async def main():
+        worker = FakeWorker(delays={1: 0.2})
+        url = await worker.start()
+        router = ShardRouter([url])
+        try:
+            await router.route(_message(1, 10))  # sekin
+            await router.route(_message(2, 10))
+            await router.route(_message(3, 20))  # boshqa foydalanuvchi kutmaydi
+            await router.drain()
+        finally:
+            await worker.stop()
+        return worker.events, router.routed
+
+    events, routed = asyncio.run(main())
+    # 10-foydalanuvchining 2-update'i 1-si tugagandan keyin yuboriladi
+    assert events.index(("end", 1)) < events.index(("start", 2))
+    # 20-foydalanuvchi 10-ning sekin update'ini kutmaydi
+    assert events.index(("end", 3)) < events.index(("end", 1))
+    assert routed == [3]
+
+
+def test_max_pending_applies_backpressure():
+    async def main():
+        gate = asyncio.Event()
+        worker = FakeWorker(gate=gate)
+        url = await worker.start()
+        router = ShardRouter([url], max_pending=2)
+        try:
+            await router.route(_message(1, 1))
+            await router.route(_message(2, 2))
+            third = asyncio.create_task(router.route(_message(3, 3)))
+            await asyncio.sleep(0.1)
+            blocked = not third.done()
+            gate.set()
+            await asyncio.wait_for(third, 1.0)
+            await router.drain()
+        finally:
+            await worker.stop()
+        return blocked, router.routed
+
+    assert asyncio.run(main()) == (True, [3])
+
+
+def test_drain_waits_for_forwarding_and_closes_session():
+    async def main():
+        worker = FakeWorker(delays={1: 0.1, 2: 0.1})
+        url = await worker.start()
+        router = ShardRouter([url])
+        try:
+            await router.route(_message(1, 1))
+            await router.route(_message(2, 1))
+            await router.drain(timeout=5)
+        finally:
+            await worker.stop()
+        return worker.events, router._tails, router._session
+
+    events, tails, session = asyncio.run(main())
+    assert events == [("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+    assert tails == {} and session is None
+
+
+def test_worker_error_is_retried():
+    calls = []
+
+    async def flaky(request: web.Request) -> web.Response:
+        calls.append((await request.json())["update_id"])
+        return web.Response(status=503 if len(calls) == 1 else 200)
+
+    async def main():
+        runner, url = await _serve(flaky)
+        router = ShardRouter([url], max_retries=1)
+        try:
+            await router.route(_message(1, 1))
+            await router.drain()
+        finally:
+            await runner.cleanup()
+        return router.routed, router.failed
+
+    assert asyncio.run(main()) == ([1], 0)
+    assert calls == [1, 1]
+
+
+def test_peers_invalidate_user_on_owning_worker():
+    received = []
+
+    async def main():
+        runner, port = await _start(invalidation_app(lambda scope, key: received.append((scope, key))))
+        # worker 0 dan: toq id lar 1-worker'ga (port_base + 1 = server porti) tegishli
+        peers = ShardPeers(0, 2, port_base=port - 1)
+        try:
+            await peers.invalidate_user(501)
+            await peers.invalidate_user(502)  # o'z shard'i, so'rov yuborilmaydi
+        finally:
+            await peers.close()
+            await runner.cleanup()
+
+    asyncio.run(main())
+    assert received == [("user", "501")]
+
+
+def test_peers_unreachable_worker_does_not_raise():
+    async def main():
+        peers = ShardPeers(0, 2, port_base=1, timeout=0.5)
+        try:
+            await peers.invalidate_user(1)
+        finally:
+            await peers.close()
+
+    asyncio.run(main())
+
+
+def test_invalidate_route_drops_cached_profile(tmp_path):
+    # ShardPeers -> /invalidate -> worker'ning UserDatabase.on_change: profil keshdan chiqariladi
+    from utils.db_api.users import UserDatabase
+
+    db = UserDatabase(str(tmp_path / "user.db"))
+
+    async def main():
+        await db.migrate()
+        await db.add_user(501, "user")
+        await db.select_user(501)
+        cached = db._profiles.peek(501) is not None
+        runner, port = await _start(invalidation_app(db.on_change))
+        peers = ShardPeers(0, 2, port_base=port - 1)
+        try:
+            await peers.invalidate_user(501)
+        finally:
+            await peers.close()
+            await runner.cleanup()
+        return cached, db._profiles.peek(501)
+
+    assert asyncio.run(main()) == (True, None)
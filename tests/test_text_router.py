@@ -0,0 +1,45 @@
+# test_text_router.py: TextRouter - tugma matnlarini amallarga moslash va qayta qurish
+from utils.misc.localization import Localization
+from utils.misc.text_router import TextRouter
+
+TEMPLATES = {
+    "uz": {"questions_answers": "Savollar", "language_settings": "Til", "back_to_menu": "Orqaga",
+           "road_signs": "Belgilar ({amount} so'm)"},
+    "ru": {"questions_answers": "Вопросы", "language_settings": "Язык", "road_signs": "Знаки ({amount} сум)"},
+    "es": {"questions_answers": "Preguntas"},
+}
+ROUTES = {
+    "questions_answers": ("section", "question"),
+    "road_signs": ("section", "road_sign"),
+    "language_settings": ("language_settings", None),
+    "back_to_menu": ("back", None),
+}
+
+
+def test_each_language_button_resolves():
+    router = TextRouter(Localization(TEMPLATES), ROUTES)
+    assert router.resolve("Savollar") == router.resolve("Вопросы") == router.resolve("Preguntas") \
+        == ("section", "question")
+    assert router.resolve("Язык") == ("language_settings", None)
+    # ru da yo'q kalit fallback (uz) matni bilan keladi
+    assert router.resolve("Orqaga") == ("back", None)
+    assert router.resolve("Salom") is None and router.resolve(None) is None
+
+
+def test_router_rebuilds_when_localization_changes(monkeypatch):
+    localization = Localization(TEMPLATES)
+    router = TextRouter(localization, ROUTES)
+    builds = []
+    build = router._build
+    monkeypatch.setattr(router, "_build", lambda: builds.append(localization.version) or build())
+
+    router.resolve("Savollar")
+    router.resolve("Til")
+    assert len(builds) == 1
+    localization.set_context(amount=10000)
+    assert router.resolve("Belgilar (10000 so'm)") == router.resolve("Знаки (10000 сум)") == ("section", "road_sign")
+    localization.set_context(amount=20000)
+    # Eski summali matn endi tugma emas
+    assert router.resolve("Belgilar (10000 so'm)") is None
+    assert router.resolve("Belgilar (20000 so'm)") == ("section", "road_sign")
+    assert len(builds) == 3
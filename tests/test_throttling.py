@@ -0,0 +1,106 @@
+# test_throttling.py: ThrottlingMiddleware - (foydalanuvchi, kalit) bo'yicha token bucket
+import asyncio
+import types as pytypes
+
+import pytest
+from aiogram import types
+from aiogram.dispatcher.handler import CancelHandler, current_handler
+
+from middlewares import throttling
+from middlewares.throttling import ThrottlingMiddleware
+from utils.misc import rate_limit
+
+
+class RecordingMiddleware(ThrottlingMiddleware):
+    """Rad etilgan update'larni Bot API ga yubormasdan qayd qiladi."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.throttled = []
+
+    async def message_throttled(self, message, exceeded):
+        self.throttled.append(("message", message.from_user.id, exceeded))
+
+    async def callback_throttled(self, callback_query, exceeded):
+        self.throttled.append(("callback", callback_query.from_user.id, exceeded))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(throttling, "time", pytypes.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _message(user_id: int) -> types.Message:
+    return types.Message.to_object({"message_id": 1, "date": 0, "text": "Savollar",
+                                    "from": {"id": user_id, "is_bot": False, "first_name": "u"},
+                                    "chat": {"id": user_id, "type": "private"}})
+
+
+def _callback(user_id: int) -> types.CallbackQuery:
+    return types.CallbackQuery.to_object({"id": "1", "chat_instance": "1", "data": "page_question_2",
+                                          "from": {"id": user_id, "is_bot": False, "first_name": "u"}})
+
+
+async def default_handler(*args):
+    pass
+
+
+@rate_limit(0.3, key="pagination")
+async def pagination_handler(*args):
+    pass
+
+
+def _passes(middleware: ThrottlingMiddleware, handler, update, times: int = 1) -> list:
+    """``times`` marta update yuboradi va har birining o'tgan/o'tmaganini qaytaradi."""
+    process = middleware.on_process_message if isinstance(update, types.Message) \
+        else middleware.on_process_callback_query
+
+    async def main():
+        current_handler.set(handler)
+        results = []
+        for _ in range(times):
+            try:
+                await process(update, {})
+                results.append(True)
+            except CancelHandler:
+                results.append(False)
+        return results
+
+    return asyncio.run(main())
+
+
+def test_message_throttled_after_burst(clock):
+    middleware = RecordingMiddleware(limit=1, burst=2)
+    assert _passes(middleware, default_handler, _message(7), 4) == [True, True, False, False]
+    # Boshqa foydalanuvchining o'z bucket'i bor
+    assert _passes(middleware, default_handler, _message(8)) == [True]
+    clock[0] += 1.0
+    assert _passes(middleware, default_handler, _message(7), 2) == [True, False]
+    assert middleware.throttled == [("message", 7, 1), ("message", 7, 2), ("message", 7, 1)]
+
+
+def test_callback_query_throttled(clock):
+    middleware = RecordingMiddleware(limit=1, burst=1)
+    assert _passes(middleware, default_handler, _callback(7), 3) == [True, False, False]
+    assert middleware.throttled == [("callback", 7, 1), ("callback", 7, 2)]
+
+
+def test_rate_limit_override_uses_own_key_and_rate(clock):
+    middleware = RecordingMiddleware(limit=5, burst=1)
+    assert _passes(middleware, default_handler, _callback(7), 2) == [True, False]
+    # Sahifalash alohida bucket'da: standart bucket bo'sh bo'lsa ham o'tadi
+    assert _passes(middleware, pagination_handler, _callback(7), 2) == [True, False]
+    clock[0] += 0.31
+    assert _passes(middleware, pagination_handler, _callback(7)) == [True]
+    assert _passes(middleware, default_handler, _callback(7)) == [False]
+    assert set(key for _, key in middleware._buckets._data) == {"default", "pagination"}
+
+
+def test_buckets_stay_bounded(clock):
+    middleware = RecordingMiddleware(limit=1, burst=1, max_users=3)
+    for user_id in range(10):
+        _passes(middleware, default_handler, _message(user_id))
+    assert len(middleware._buckets) == 3
+    assert [key[0] for key in middleware._buckets._data] == [7, 8, 9]
@@ -0,0 +1,274 @@
+# test_users.py: UserDatabase - ro'yxatdan o'tish, profil keshi va hisoblagichlar
+import asyncio
+import sqlite3
+import types as pytypes
+from datetime import datetime
+
+import pytest
+
+from data.config import ADMINS
+from utils.db_api.users import UserDatabase
+
+
+def _user_db(tmp_path) -> UserDatabase:
+    db = UserDatabase(str(tmp_path / "user.db"))
+    asyncio.run(db.migrate())
+    return db
+
+
+def test_admins_config_holds_ints():
+    assert ADMINS and all(isinstance(admin, int) for admin in ADMINS)
+
+
+def test_add_user_flags_admins(tmp_path):
+    db = _user_db(tmp_path)
+
+    async def main():
+        await db.add_user(ADMINS[0], "admin")
+        await db.add_user(ADMINS[0] + 1, "user")
+        return await db.check_if_admin(ADMINS[0]), await db.check_if_admin(ADMINS[0] + 1)
+
+    assert asyncio.run(main()) == (True, False)
+
+
+def test_user_counter_matches_count(tmp_path):
+    db = _user_db(tmp_path)
+
+    async def main():
+        for telegram_id in range(1, 31):
+            await db.add_user(telegram_id, f"user{telegram_id}")
+        await db.add_user(5, "duplicate")
+        await db.execute_async("DELETE FROM Users WHERE telegram_id <= 10", commit=True)
+        counted = await db.execute_async("SELECT COUNT(*) AS total FROM Users", fetchone=True)
+        return await db.count_users(), counted["total"]
+
+    assert asyncio.run(main()) == (20, 20)
+
+
+def test_front_digest_collects_worker_signups(tmp_path, monkeypatch):
+    # front va worker bitta bazani ishlatadi; worker buferlamaydi, front digestni bazadan yig'adi
+    from utils.misc import broadcast
+
+    front, worker = _user_db(tmp_path), UserDatabase(str(tmp_path / "user.db"))
+    worker.buffer_signups = False
+    digests = []
+
+    async def fake_send(chat_ids, send, fallback=None, bulk=False):
+        digests.append(bulk)
+        return len(ADMINS), 0
+
+    monkeypatch.setattr(broadcast.broadcaster, "send", fake_send)
+
+    async def main():
+        await front.add_user(1, "bootstrap", dispatcher=object())
+        await front.track_signups()
+        await worker.add_user(2, "first", dispatcher=object())
+        await worker.add_user(3, "second", dispatcher=object())
+        sent = await front.flush_signup_digest(object())
+        again = await front.flush_signup_digest(object())
+        return sent, again, worker._signups
+
+    assert asyncio.run(main()) == (3, 0, [])
+    assert digests == [True]
+
+
+def test_access_change_notified_after_write(tmp_path):
+    db = _user_db(tmp_path)
+    notified = []
+
+    async def on_access_change(telegram_id):
+        # Xabar berilganda yozuv allaqachon bazada
+        notified.append((telegram_id, (await db.select_user(telegram_id))["is_allowed"]))
+
+    async def main():
+        await db.add_user(7, "user")
+        db.on_access_change = on_access_change
+        await db.update_user_permission(7, True)
+        await db.update_user_permission(7, False)
+        await db.update_user_language(7, "ru")
+
+    asyncio.run(main())
+    assert notified == [(7, 1), (7, 0)]
+
+
+def test_profile_cache_counts_hits_and_misses(tmp_path):
+    db = _user_db(tmp_path)
+
+    async def main():
+        await db.add_user(7, "user")
+        await db.select_user(7)
+        await db.check_if_allowed(7)
+        await db.get_user_language(7)
+        return db.cache_stats()
+
+    stats = asyncio.run(main())
+    assert (stats["misses"], stats["hits"], stats["size"]) == (1, 2, 1)
+
+
+def test_warm_profile_hit_runs_no_sql(tmp_path):
+    db = _user_db(tmp_path)
+    statements = []
+    execute = db.execute_async
+
+    async def counting_execute(sql, *args, **kwargs):
+        statements.append(sql)
+        return await execute(sql, *args, **kwargs)
+
+    async def main():
+        await db.add_user(7, "user")
+        await db.select_user(7)
+        db.execute_async = counting_execute
+        return await db.select_user(7), await db.check_if_allowed(7), await db.get_user_language(7)
+
+    profile, allowed, language = asyncio.run(main())
+    assert (profile["telegram_id"], allowed, language) == (7, False, "uz")
+    assert statements == []
+
+
+def test_approve_and_revoke_refresh_cached_profile(tmp_path):
+    db = _user_db(tmp_path)
+
+    async def main():
+        await db.add_user(7, "user")
+        await db.select_user(7)
+        await db.update_user_permission(7, True)
+        approved = db._profiles.peek(7)["is_allowed"]
+        await db.update_user_permission(7, False)
+        revoked = db._profiles.peek(7)["is_allowed"]
+        # Boshqa jarayondagi o'zgarish (ChangeWatcher yoki /invalidate) profilni chiqaradi
+        db.on_change("user", "7")
+        return approved, revoked, db._profiles.peek(7)
+
+    assert asyncio.run(main()) == (1, 0, None)
+
+
+def test_stale_read_not_cached_over_concurrent_write(tmp_path):
+    # Keshdan o'tib ketgan o'qish bazadan eski qatorni oladi, shu payt ruxsat beriladi
+    db = _user_db(tmp_path)
+    execute = db.execute_async
+
+    async def main():
+        read_done, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_select(sql, *args, **kwargs):
+            result = await execute(sql, *args, **kwargs)
+            if sql.startswith("SELECT * FROM Users"):
+                read_done.set()
+                await release.wait()
+            return result
+
+        await db.add_user(7, "user")
+        db.execute_async = slow_select
+        reader = asyncio.create_task(db.check_if_allowed(7))
+        await read_done.wait()
+        await db.update_user_permission(7, True)
+        release.set()
+        stale = await reader
+        cached = db._profiles.peek(7)
+        db.execute_async = execute
+        return stale, cached, await db.check_if_allowed(7)
+
+    assert asyncio.run(main()) == (False, None, True)
+
+
+def _clock(db: UserDatabase, *times: str) -> None:
+    """_get_current_time ni berilgan ketma-ket vaqtlarga almashtiradi."""
+    ticks = iter(datetime.fromisoformat(value) for value in times)
+    db._get_current_time = lambda: next(ticks)
+
+
+def test_last_active_writes_coalesce_per_user(tmp_path):
+    db = _user_db(tmp_path)
+    written = []
+    executemany = db.executemany_async
+
+    async def recording_executemany(sql, rows):
+        written.append(list(rows))
+        return await executemany(sql, rows)
+
+    async def main():
+        await db.add_user(7, "a")
+        await db.add_user(8, "b")
+        _clock(db, "2026-01-10T10:00:00", "2026-01-10T10:01:00", "2026-01-10T10:02:00", "2026-01-10T10:03:00")
+        db.executemany_async = recording_executemany
+        for telegram_id in (7, 7, 8, 7):
+            await db.update_last_active(telegram_id)
+        flushed = await db.flush_last_active()
+        row = await db.execute_async("SELECT last_active FROM Users WHERE telegram_id = 7", fetchone=True)
+        return flushed, row["last_active"], await db.flush_last_active()
+
+    assert asyncio.run(main()) == (2, "2026-01-10T10:03:00", 0)
+    assert written == [[("2026-01-10T10:03:00", 7), ("2026-01-10T10:02:00", 8)]]
+
+
+def test_failed_last_active_flush_restores_buffer(tmp_path):
+    db = _user_db(tmp_path)
+
+    async def failing_executemany(sql, rows):
+        # Yozuv paytida kelgan yangiroq faollik qaytarilgan eski qiymatdan ustun
+        await db.update_last_active(7)
+        raise sqlite3.OperationalError("database is locked")
+
+    async def main():
+        _clock(db, "2026-01-10T10:00:00", "2026-01-10T10:01:00", "2026-01-10T10:05:00")
+        await db.update_last_active(7)
+        await db.update_last_active(8)
+        db.executemany_async = failing_executemany
+        with pytest.raises(sqlite3.OperationalError):
+            await db.flush_last_active()
+
+    asyncio.run(main())
+    assert db._last_active_buffer == {7: "2026-01-10T10:05:00", 8: "2026-01-10T10:01:00"}
+    assert db._last_active_flushing == {}
+
+
+def test_active_count_uses_buffered_and_flushing_values(tmp_path):
+    db = _user_db(tmp_path)
+    stored = {1: "2026-01-10T05:00:00", 2: "2026-01-01T00:00:00", 3: "2026-01-10T06:00:00", 4: "2026-01-01T00:00:00"}
+
+    async def main():
+        for telegram_id, last_active in stored.items():
+            await db.add_user(telegram_id, "user")
+            await db.execute_async("UPDATE Users SET last_active = ? WHERE telegram_id = ?",
+                                   parameters=(last_active, telegram_id), commit=True)
+        start, end = datetime(2026, 1, 10), datetime(2026, 1, 11)
+        from_db = await db._count_active_between(start, end)
+        # 2 - buferda oraliq ichida, 3 - buferda oraliqdan keyin, 4 - yozilayotgan flush'da oraliq ichida
+        db._last_active_buffer = {2: "2026-01-10T07:00:00", 3: "2026-01-12T00:00:00"}
+        db._last_active_flushing = {4: "2026-01-10T08:00:00"}
+        return from_db, await db._count_active_between(start, end), await db._count_active_between(start)
+
+    assert asyncio.run(main()) == (2, 3, 4)
+
+
+def test_single_process_digest_batches_signups(tmp_path, monkeypatch):
+    from utils.misc import broadcast
+    from utils.misc.outbound import PRIORITY_BULK, send_priority
+
+    db = _user_db(tmp_path)
+    sent = []
+
+    class FakeBot:
+        async def send_message(self, chat_id, text):
+            sent.append((chat_id, text, send_priority.get()))
+
+    dispatcher = pytypes.SimpleNamespace(bot=FakeBot())
+    monkeypatch.setattr(broadcast, "broadcaster", broadcast.Broadcaster())
+
+    async def main():
+        for telegram_id in (1, 2, 3):
+            await db.add_user(telegram_id, f"user{telegram_id}", dispatcher=dispatcher)
+        await db.add_user(2, "duplicate", dispatcher=dispatcher)
+        buffered = list(db._signups)
+        first = await db.flush_signup_digest(dispatcher)
+        # Bo'sh buferda xabar yuborilmaydi
+        second = await db.flush_signup_digest(dispatcher)
+        return buffered, first, second, db._signups
+
+    buffered, first, second, remaining = asyncio.run(main())
+    assert buffered == [(1, "user1", 0), (2, "user2", 0), (3, "user3", 0)]
+    assert (first, second, remaining) == (3, 0, [])
+    assert [(chat_id, priority) for chat_id, _, priority in sent] == [(admin, PRIORITY_BULK) for admin in ADMINS]
+    assert sent[0][1].splitlines() == ["Yangi foydalanuvchilar: 3 ta", "ID: 1, Username: user1",
+                                       "ID: 2, Username: user2", "ID: 3, Username: user3",
+                                       "Jami foydalanuvchilar: 3"]
@@ -0,0 +1,68 @@
+# cache.py: jarayon ichidagi chegaralangan LRU/TTL kesh
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Hajmi chegaralangan, muddati (TTL) bor LRU kesh.
+
+    Faqat event loop oqimidan foydalanish uchun mo'ljallangan, shuning uchun
+    qulflar ishlatilmaydi. ``hits``/``misses`` hisoblagichlari keshning
+    samaradorligini kuzatish uchun saqlanadi.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Kalit bo'yicha qiymatni qaytaradi; topilmasa yoki eskirgan bo'lsa ``default``."""
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Qiymatni keshga yozadi, kerak bo'lsa eng eski yozuvni chiqarib tashlaydi."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def peek(self, key: Hashable) -> Any:
+        """Hisoblagichlarni va tartibni o'zgartirmasdan qiymatni qaytaradi."""
+        entry = self._data.get(key)
+        return entry[0] if entry is not None else None
+
+    def pop(self, key: Hashable) -> Any:
+        """Kalitni keshdan o'chiradi (invalidatsiya)."""
+        entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Kesh statistikasini qaytaradi."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,81 @@
+# catalog.py: bo'limlar (savollar, yo'l belgilari, ehtiyot qismlar) uchun xotiradagi katalog
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+PageLoader = Callable[[str, str, int, int], Awaitable[Sequence[Any]]]
+CountLoader = Callable[[str, str], Awaitable[int]]
+
+
+class CatalogEntry:
+    """Bitta (bo'lim, til) juftligining keshlangan sahifalari va umumiy soni."""
+    __slots__ = ("version", "total", "pages")
+
+    def __init__(self, version: int, total: int):
+        self.version = version
+        self.total = total
+        # (after_display_id, limit) -> o'zgarmas sahifa
+        self.pages: "OrderedDict[Tuple[int, int], Tuple[Any, ...]]" = OrderedDict()
+
+
+class SectionCatalog:
+    """(bo'lim, til) juftliklari uchun versiyalangan sahifalar keshi.
+
+    Sahifalar keyset usulida (``display_id > after LIMIT n``) yuklanadi va
+    o'zgarmas tuple sifatida saqlanadi, umumiy son esa hisoblagich jadvalidan
+    olinadi, shuning uchun bo'lim qanchalik katta bo'lmasin, sahifa narxi
+    o'zgarmaydi. Kesh faqat ``invalidate`` orqali (qo'shish/yangilash/
+    o'chirishda) yangilanadi.
+    """
+
+    def __init__(self, page_loader: PageLoader, count_loader: CountLoader, max_pages: int = 256):
+        self._page_loader = page_loader
+        self._count_loader = count_loader
+        self.max_pages = max_pages
+        self._entries: Dict[Tuple[str, str], CatalogEntry] = {}
+        self._versions: Dict[Tuple[str, str], int] = {}
+
+    def version(self, section: str, language: str) -> int:
+        """Juftlikning joriy versiyasini qaytaradi (har invalidatsiyada oshadi)."""
+        return self._versions.get((section, language), 0)
+
+    async def _entry(self, section: str, language: str) -> CatalogEntry:
+        """Juftlik yozuvini qaytaradi, kerak bo'lsa umumiy sonini yuklaydi."""
+        key = (section, language)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        version = self._versions.setdefault(key, 0)
+        entry = CatalogEntry(version, await self._count_loader(section, language))
+        # Yuklash paytida invalidatsiya bo'lgan bo'lsa, eski yozuvni saqlamaymiz
+        if self.version(section, language) == version:
+            self._entries[key] = entry
+        return entry
+
+    async def get_page(self, section: str, language: str, after_display_id: int = 0,
+                       limit: int = 10) -> Tuple[Tuple[Any, ...], int]:
+        """``after_display_id`` dan keyingi ``limit`` ta element va umumiy sonni qaytaradi."""
+        entry = await self._entry(section, language)
+        page_key = (after_display_id, limit)
+        page = entry.pages.get(page_key)
+        if page is not None:
+            entry.pages.move_to_end(page_key)
+            return page, entry.total
+
+        page = tuple(await self._page_loader(section, language, after_display_id, limit))
+        if self.version(section, language) == entry.version:
+            entry.pages[page_key] = page
+            while len(entry.pages) > self.max_pages:
+                entry.pages.popitem(last=False)
+        logging.info(f"Katalog sahifasi yuklandi: section={section}, language={language}, "
+                     f"after={after_display_id}, items={len(page)}, version={entry.version}")
+        return page, entry.total
+
+    def invalidate(self, section: str, language: Optional[str] = None) -> None:
+        """Bo'lim (yoki uning bitta tili) keshini bekor qiladi."""
+        keys = [(section, language)] if language else [key for key in self._versions if key[0] == section]
+        for key in keys:
+            self._entries.pop(key, None)
+            self._versions[key] = self._versions.get(key, 0) + 1
+        logging.info(f"Katalog bekor qilindi: section={section}, language={language or '*'}")
@@ -0,0 +1,128 @@
+# changes.py: jarayonlararo kesh invalidatsiyasi uchun o'zgarishlar jurnali (Changes jadvali)
+import asyncio
+import logging
+import sqlite3
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .executor import get_executor
+from .pool import get_pool
+
+# Har bir bazada bir xil: triggerlar yozadi, ChangeWatcher o'qiydi.
+# (scope, key) yagona: bitta kalitning ketma-ket o'zgarishlari (masalan, display_id
+# qayta raqamlash) bitta qatorni yangi id bilan almashtiradi, jadval o'smaydi.
+CHANGES_TABLE = """
+    CREATE TABLE IF NOT EXISTS Changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        scope TEXT NOT NULL,
+        key TEXT NOT NULL,
+        created_at REAL NOT NULL DEFAULT (strftime('%s', 'now')),
+        UNIQUE (scope, key)
+    )
+"""
+
+
+def change_trigger(name: str, table: str, event: str, scope: str, keys: Sequence[str],
+                   when: Optional[str] = None) -> str:
+    """``table`` dagi ``event`` uchun Changes jadvaliga yozuvchi trigger SQL ini qaytaradi.
+
+    ``keys`` - kalit ifodalari (masalan, ``NEW.telegram_id``), har biri uchun
+    bitta qator yoziladi.
+    """
+    inserts = "\n".join(f"INSERT OR REPLACE INTO Changes (scope, key) VALUES ('{scope}', {key});" for key in keys)
+    condition = f"WHEN {when}" if when else ""
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table}
+        {condition}
+        BEGIN
+            {inserts}
+        END
+    """
+
+
+# Handler sinxron: keshni bekor qiladi, qayta o'qish kerak bo'lsa, o'zi vazifa boshlaydi
+ChangeHandler = Callable[[str, str], None]
+
+
+class ChangeWatcher:
+    """Boshqa jarayonlar (worker'lar) yozgan o'zgarishlarni kuzatib, keshlarni bekor qiladi.
+
+    Alohida ulanishda ``PRAGMA data_version`` tekshiriladi: u faqat boshqa
+    ulanish bazani o'zgartirganda oshadi va diskdan o'qimaydi, shuning uchun
+    tez-tez tekshirish arzon. Versiya o'zgarganda Changes jadvalidagi yangi
+    qatorlar ``handler(scope, key)`` ga beriladi.
+    """
+
+    def __init__(self, path_to_db: str, handler: ChangeHandler, interval: float = 0.5, retention: float = 3600.0):
+        self.path_to_db = path_to_db
+        self.handler = handler
+        self.interval = interval
+        self.retention = retention
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(self.path_to_db, check_same_thread=False)
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        self._last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM Changes").fetchone()[0]
+
+    def _poll(self) -> List[Tuple[int, str, str]]:
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return []
+        self._data_version = version
+        rows = self._conn.execute(
+            "SELECT id, scope, key FROM Changes WHERE id > ? ORDER BY id", (self._last_id,)).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        return rows
+
+    def _prune(self) -> int:
+        with get_pool(self.path_to_db).connection() as conn, conn:
+            return conn.execute("DELETE FROM Changes WHERE created_at < ?", (time.time() - self.retention,)).rowcount
+
+    def _dispatch(self, rows: List[Tuple[int, str, str]]) -> None:
+        # Bir xil o'zgarish bir necha marta kelsa, bir marta qayta ishlanadi
+        for scope, key in dict.fromkeys((scope, key) for _, scope, key in rows):
+            try:
+                self.handler(scope, key)
+            except Exception as e:
+                logging.error(f"Change handler xatolik: path={self.path_to_db}, scope={scope}, key={key}, error={e}")
+
+    async def _loop(self) -> None:
+        executor = get_executor(self.path_to_db)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                rows = await executor.run(self._poll)
+                if rows:
+                    self._dispatch(rows)
+                if time.monotonic() - self._last_prune >= self.retention:
+                    self._last_prune = time.monotonic()
+                    await executor.run(self._prune, write=True)
+            except Exception as e:
+                logging.error(f"ChangeWatcher xatolik: path={self.path_to_db}, error={e}")
+
+    async def start(self) -> None:
+        """Kuzatishni boshlaydi (mavjud o'zgarishlar o'tkazib yuboriladi)."""
+        if self._task and not self._task.done():
+            return
+        await get_executor(self.path_to_db).run(self._open)
+        self._last_prune = time.monotonic()
+        self._task = asyncio.create_task(self._loop())
+        logging.info(f"ChangeWatcher started: path={self.path_to_db}, interval={self.interval}s")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
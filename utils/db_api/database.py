@@ -1,46 +1,143 @@
 # database.py: Umumiy ma'lumotlar bazasi bilan bog'lanish va "execute" funksiyasi
+import logging
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+from .executor import DatabaseExecutor, get_executor
+from .instrumentation import sql_instrumentation
+from .pool import ConnectionPool, get_pool
+
+# Qatorlarni materiallashtirish: ustun nomlaridan bitta qator uchun konvertor yasaydi.
+# Konvertor so'rov boshida bir marta yasaladi, keyin har bir qatorga qo'llaniladi.
+RowFactory = Callable[[Tuple[str, ...]], Optional[Callable[[tuple], Any]]]
+
+
+def tuple_rows(columns: Tuple[str, ...]) -> None:
+    """Qatorlarni sqlite3 qaytargan tuple ko'rinishida qoldiradi (eng arzon)."""
+    return None
+
+
+def dict_rows(columns: Tuple[str, ...]) -> Callable[[tuple], dict]:
+    """Har bir qatorni {ustun: qiymat} lug'atiga aylantiradi."""
+    return lambda row: dict(zip(columns, row))
 
-def logger(statement):
-    print(f"""
-_____________________________________________________        
-Executing: 
-{statement}
-_____________________________________________________
-""")
 
 class Database:
+    """Barcha DAO klasslari uchun yagona so'rov bajarish mexanizmi.
+
+    * ulanishlar umumiy hovuzdan olinadi (tayyorlangan so'rovlar keshi bilan);
+    * qator ko'rinishi ``row_factory`` bilan tanlanadi (tuple, yozuv yoki dict);
+    * xatoliklar jurnalga yoziladi va qayta ko'tariladi, tranzaksiya bekor qilinadi;
+    * ``*_async`` metodlar o'qishlarni o'qish oqimlarida, yozishlarni yagona
+      yozish oqimida bajaradi.
+    """
+
+    row_factory: RowFactory = staticmethod(tuple_rows)
+
     def __init__(self, path_to_db="main.db"):
         self.path_to_db = path_to_db
 
     @property
-    def connection(self):
-        return sqlite3.connect(self.path_to_db)
+    def pool(self) -> ConnectionPool:
+        return get_pool(self.path_to_db)
+
+    @property
+    def executor(self) -> DatabaseExecutor:
+        return get_executor(self.path_to_db)
+
+    def _fetch(self, cursor: sqlite3.Cursor, fetchone: bool, fetchall: bool, row_factory: Optional[RowFactory]) -> Any:
+        """Kursor natijasini tanlangan ko'rinishda qaytaradi."""
+        if not (fetchone or fetchall):
+            return None
+        convert = (row_factory or self.row_factory)(tuple(col[0] for col in cursor.description or ()))
+        if fetchone:
+            row = cursor.fetchone()
+            return convert(row) if convert and row is not None else row
+        rows = cursor.fetchall()
+        return [convert(row) for row in rows] if convert else rows
 
-    def execute(self, sql: str, parameters: tuple = None, fetchone=False, fetchall=False, commit=False):
+    def execute(self, sql: str, parameters: Any = None, fetchone: bool = False, fetchall: bool = False,
+                commit: bool = False, row_factory: Optional[RowFactory] = None) -> Any:
+        """Bitta so'rovni bajaradi; ``commit`` bo'lsa, o'zgarishlar saqlanadi.
+
+        ``commit`` siz bajarilgan yozuv saqlanmaydi: ochiq qolgan tranzaksiya
+        ulanish hovuzga qaytarilganda bekor qilinadi.
+        """
         if not parameters:
             parameters = ()
-        connection = self.connection
-        connection.set_trace_callback(logger)
-        cursor = connection.cursor()
-        data = None
         try:
-            cursor.execute(sql, parameters)
-            if commit:
-                connection.commit()
-            if fetchall:
-                data = cursor.fetchall()
-            if fetchone:
-                data = cursor.fetchone()
-        except sqlite3.Error as e:
-            print(f"SQLite error: {e}")
-            connection.rollback()
-        finally:
-            connection.close()
-        return data
+            with self.pool.connection() as connection:
+                # Span qatorlarni materiallashtirishni ham o'z ichiga oladi (katta sahifalarda asosiy xarajat)
+                with sql_instrumentation.span(connection, sql):
+                    cursor = connection.execute(sql, parameters)
+                    result = self._fetch(cursor, fetchone, fetchall, row_factory)
+                if commit:
+                    connection.commit()
+                return result
+        except Exception as e:
+            logging.error(f"SQL error: {e}, query: {sql}")
+            raise
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any]) -> int:
+        """Bir nechta parametrlar to'plami bilan so'rovni bitta tranzaksiyada bajaradi."""
+        try:
+            with self.pool.connection() as connection, connection:
+                with sql_instrumentation.span(connection, sql):
+                    cursor = connection.executemany(sql, seq_of_parameters)
+                return cursor.rowcount
+        except Exception as e:
+            logging.error(f"SQL error: {e}, query: {sql}")
+            raise
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Aniq (BEGIN IMMEDIATE) tranzaksiya ichida ulanish beradi.
+
+        Blok xatoliksiz tugasa commit, aks holda rollback qilinadi.
+        """
+        with self.pool.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except Exception:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def run_in_transaction(self, func: Callable[..., Any], *args: Any) -> Any:
+        """``func(connection, *args)`` ni bitta tranzaksiyada bajaradi."""
+        with self.transaction() as connection:
+            return func(connection, *args)
+
+    def insert(self, sql: str, parameters: Any = ()) -> int:
+        """INSERT ni bajaradi va yangi qator ID sini qaytaradi (bir xil ulanishda)."""
+        def insert_row(connection: sqlite3.Connection) -> int:
+            with sql_instrumentation.span(connection, sql):
+                return connection.execute(sql, parameters).lastrowid
+
+        return self.run_in_transaction(insert_row)
+
+    async def execute_async(self, sql: str, parameters: Any = None, fetchone: bool = False, fetchall: bool = False,
+                            commit: bool = False, row_factory: Optional[RowFactory] = None) -> Any:
+        """execute() ni event loopni bloklamasdan bajaradi (``commit`` bo'lsa, yozish oqimida)."""
+        return await self.executor.run(
+            self.execute, sql, parameters, fetchone, fetchall, commit, row_factory, write=commit)
+
+    async def executemany_async(self, sql: str, seq_of_parameters: Sequence[Any]) -> int:
+        """executemany() ni yozish oqimida bajaradi."""
+        return await self.executor.run(self.executemany, sql, seq_of_parameters, write=True)
+
+    async def transaction_async(self, func: Callable[..., Any], *args: Any) -> Any:
+        """run_in_transaction() ni yozish oqimida bajaradi."""
+        return await self.executor.run(self.run_in_transaction, func, *args, write=True)
+
+    async def insert_async(self, sql: str, parameters: Any = ()) -> int:
+        """insert() ni yozish oqimida bajaradi."""
+        return await self.executor.run(self.insert, sql, parameters, write=True)
 
     @staticmethod
     def format_args(sql, parameters: dict):
         sql += " AND ".join([f"{item} = ?" for item in parameters])
-        return sql, tuple(parameters.values())
\ No newline at end of file
+        return sql, tuple(parameters.values())
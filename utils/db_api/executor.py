@@ -0,0 +1,59 @@
+# executor.py: SQLite so'rovlarini asyncio event loopdan tashqarida bajarish
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class DatabaseExecutor:
+    """Bitta ma'lumotlar bazasi fayli uchun oqimlar to'plami.
+
+    O'qish so'rovlari kichik oqimlar hovuzida parallel bajariladi, yozish
+    so'rovlari esa bitta alohida oqimda ketma-ket (navbat bilan) bajariladi,
+    shuning uchun SQLite yozuvchilari bir-birini ``database is locked`` bilan
+    to'xtatmaydi va event loop hech qachon bloklanmaydi.
+    """
+
+    def __init__(self, path_to_db: str, read_workers: int = 4):
+        self.path_to_db = path_to_db
+        self._reader = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="db-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+
+    async def run(self, func: Callable[..., Any], *args: Any, write: bool = False) -> Any:
+        """``func(*args)`` ni mos oqimda bajaradi va natijasini qaytaradi."""
+        loop = asyncio.get_running_loop()
+        executor = self._writer if write else self._reader
+        return await loop.run_in_executor(executor, functools.partial(func, *args))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Oqimlarni to'xtatadi; navbatdagi yozuvlar tugashini kutadi."""
+        self._writer.shutdown(wait=wait)
+        self._reader.shutdown(wait=wait)
+        logging.info(f"Database executor stopped: path={self.path_to_db}")
+
+
+_executors: Dict[str, DatabaseExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(path_to_db: str) -> DatabaseExecutor:
+    """Fayl uchun umumiy executorni qaytaradi (birinchi chaqiruvda yaratiladi)."""
+    executor = _executors.get(path_to_db)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(path_to_db)
+            if executor is None:
+                executor = DatabaseExecutor(path_to_db)
+                _executors[path_to_db] = executor
+    return executor
+
+
+def shutdown_all_executors(wait: bool = True) -> None:
+    """Barcha executorlarni to'xtatadi (bot to'xtaganda chaqiriladi)."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
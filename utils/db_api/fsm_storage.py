@@ -0,0 +1,213 @@
+# fsm_storage.py: FSM holatlari uchun SQLite asosidagi doimiy va chegaralangan storage
+import asyncio
+import copy
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiogram.dispatcher.storage import BaseStorage
+
+from .cache import LRUCache
+from .database import Database
+from .migrations import Migration, migrate
+
+FSM_MIGRATIONS = [
+    Migration(1, "FSM holatlari jadvali", [
+        """
+        CREATE TABLE IF NOT EXISTS FSM (
+            chat TEXT NOT NULL,
+            user TEXT NOT NULL,
+            state TEXT,
+            data TEXT NOT NULL DEFAULT '{}',
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (chat, user)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_fsm_updated_at ON FSM (updated_at)",
+    ]),
+]
+
+Key = Tuple[str, str]
+
+
+class SQLiteStorage(BaseStorage):
+    """MemoryStorage o'rniga doimiy (SQLite) va xotirada chegaralangan FSM storage.
+
+    * issiq qatlam: so'nggi foydalanuvchilar holati ``LRUCache`` da
+      (``hot_size`` ta, ``hot_ttl`` soniya), qolganlari bazadan o'qiladi;
+    * yozishlar birlashtiriladi: bir foydalanuvchining ketma-ket o'zgarishlari
+      ``flush_interval`` ichida bitta qatorga aylanadi va hammasi bitta
+      tranzaksiyada yoziladi;
+    * ``state_ttl`` dan uzoq o'zgarmagan holatlar (masalan, tashlab ketilgan
+      ``WAITING_FOR_PAYMENT``) o'qishda e'tiborga olinmaydi va davriy o'chiriladi
+      (fon sikli ``start`` yoki birinchi yozuv bilan ishga tushadi);
+    * throttling bucketlari faqat xotirada (chegaralangan) saqlanadi.
+
+    Qayta ishga tushirishda holatlar bazadan tiklanadi, shuning uchun admin
+    qo'shish jarayonlari yo'qolmaydi.
+    """
+
+    def __init__(self, path_to_db: str = "data/fsm.db", hot_size: int = 10000, hot_ttl: float = 600.0,
+                 state_ttl: float = 259200.0, flush_interval: float = 1.0, sweep_interval: float = 3600.0):
+        self.db = Database(path_to_db)
+        self.state_ttl = state_ttl
+        self.flush_interval = flush_interval
+        self.sweep_interval = sweep_interval
+        # (chat, user) -> [state, data]
+        self._hot = LRUCache(maxsize=hot_size, ttl=hot_ttl)
+        self._buckets = LRUCache(maxsize=hot_size, ttl=hot_ttl)
+        # Bazaga hali yozilmagan o'zgarishlar: (chat, user) -> (state, data JSON)
+        self._dirty: Dict[Key, Tuple[Optional[str], str]] = {}
+        # flush yozayotgan (hali commit qilinmagan) o'zgarishlar; o'qishda bazadan ustun
+        self._flushing: Dict[Key, Tuple[Optional[str], str]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_sweep = 0.0
+
+    async def migrate(self) -> int:
+        """FSM bazasi sxemasini oxirgi versiyagacha yangilaydi."""
+        return await migrate(self.db.path_to_db, FSM_MIGRATIONS)
+
+    @classmethod
+    def _key(cls, chat, user) -> Key:
+        chat, user = cls.check_address(chat=chat, user=user)
+        return str(chat), str(user)
+
+    async def _load(self, key: Key) -> List[Any]:
+        """Holatni issiq qatlamdan, yozilmagan o'zgarishlardan yoki bazadan oladi."""
+        record = self._hot.get(key)
+        if record is not None:
+            return record
+        pending = self._dirty.get(key) or self._flushing.get(key)
+        if pending is not None:
+            record = [pending[0], json.loads(pending[1])]
+        else:
+            row = await self.db.execute_async(
+                "SELECT state, data FROM FSM WHERE chat = ? AND user = ? AND updated_at >= ?",
+                (*key, time.time() - self.state_ttl), fetchone=True)
+            record = [row[0], json.loads(row[1])] if row else [None, {}]
+            # Bazadan o'qish paytida shu kalitga yozilgan bo'lsa, o'sha qiymat ustun
+            current = self._hot.peek(key)
+            if current is not None:
+                return current
+        self._hot.set(key, record)
+        return record
+
+    def start(self) -> None:
+        """Fon yozish va tozalash siklini ishga tushiradi (yozuvlar bo'lmasa ham eskirganlar o'chiriladi)."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def _store(self, key: Key, record: List[Any]) -> None:
+        self._hot.set(key, record)
+        self._dirty[key] = (record[0], json.dumps(record[1], ensure_ascii=False))
+        self.start()
+
+    async def get_state(self, *, chat=None, user=None, default: Optional[str] = None) -> Optional[str]:
+        state = (await self._load(self._key(chat, user)))[0]
+        return state if state is not None else self.resolve_state(default)
+
+    async def get_data(self, *, chat=None, user=None, default: Optional[Dict] = None) -> Dict:
+        return copy.deepcopy((await self._load(self._key(chat, user)))[1])
+
+    async def set_state(self, *, chat=None, user=None, state=None) -> None:
+        key = self._key(chat, user)
+        record = await self._load(key)
+        record[0] = self.resolve_state(state)
+        self._store(key, record)
+
+    async def set_data(self, *, chat=None, user=None, data: Dict = None) -> None:
+        key = self._key(chat, user)
+        record = await self._load(key)
+        record[1] = copy.deepcopy(data or {})
+        self._store(key, record)
+
+    async def update_data(self, *, chat=None, user=None, data: Dict = None, **kwargs) -> None:
+        key = self._key(chat, user)
+        record = await self._load(key)
+        record[1].update(copy.deepcopy(data or {}), **kwargs)
+        self._store(key, record)
+
+    def has_bucket(self) -> bool:
+        return True
+
+    async def get_bucket(self, *, chat=None, user=None, default: Optional[dict] = None) -> Dict:
+        return copy.deepcopy(self._buckets.get(self._key(chat, user)) or {})
+
+    async def set_bucket(self, *, chat=None, user=None, bucket: Dict = None) -> None:
+        self._buckets.set(self._key(chat, user), copy.deepcopy(bucket or {}))
+
+    async def update_bucket(self, *, chat=None, user=None, bucket: Dict = None, **kwargs) -> None:
+        key = self._key(chat, user)
+        current = self._buckets.get(key) or {}
+        current.update(copy.deepcopy(bucket or {}), **kwargs)
+        self._buckets.set(key, current)
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, upserts: List[tuple], deletes: List[Key], expired_before: float) -> int:
+        conn.executemany("""
+            INSERT INTO FSM (chat, user, state, data, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (chat, user) DO UPDATE SET
+                state = excluded.state, data = excluded.data, updated_at = excluded.updated_at
+        """, upserts)
+        conn.executemany("DELETE FROM FSM WHERE chat = ? AND user = ?", deletes)
+        if expired_before:
+            return conn.execute("DELETE FROM FSM WHERE updated_at < ?", (expired_before,)).rowcount
+        return 0
+
+    async def flush(self) -> int:
+        """Yozilmagan o'zgarishlarni bitta tranzaksiyada bazaga yozadi."""
+        now = time.time()
+        sweep = now - self._last_sweep >= self.sweep_interval
+        if not self._dirty and not sweep:
+            return 0
+        pending, self._dirty = self._dirty, {}
+        self._flushing = pending
+        upserts, deletes = [], []
+        for (chat, user), (state, data) in pending.items():
+            # Bo'sh holat (finish) qator sifatida saqlanmaydi
+            if state is None and data == "{}":
+                deletes.append((chat, user))
+            else:
+                upserts.append((chat, user, state, data, now))
+        try:
+            expired = await self.db.transaction_async(
+                self._write, upserts, deletes, now - self.state_ttl if sweep else 0.0)
+        except Exception as e:
+            # Yozilmagan o'zgarishlar qaytariladi (yangiroqlari ustun)
+            for key, value in pending.items():
+                self._dirty.setdefault(key, value)
+            logging.error(f"FSM flush xatolik: keys={len(pending)}, error={e}")
+            raise
+        finally:
+            self._flushing = {}
+        if sweep:
+            self._last_sweep = now
+            if expired:
+                logging.info(f"FSM: eskirgan holatlar o'chirildi: {expired}")
+        return len(pending)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                pass  # xatolik flush ichida log qilingan, keyingi siklda qayta uriniladi
+
+    async def close(self) -> None:
+        """Fon yozishni to'xtatadi va qolgan o'zgarishlarni yozadi."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self._dirty:
+            await self.flush()
+        logging.info("FSM storage yopildi")
+
+    async def wait_closed(self) -> None:
+        pass
@@ -0,0 +1,151 @@
+# instrumentation.py: SQL so'rovlarini o'lchash, sekin so'rovlar jurnali va tanlab kuzatish (trace)
+import logging
+import random
+import re
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+# Gistogramma chegaralari (millisekund)
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_WHITESPACE = re.compile(r"\s+")
+_NULL_SPAN = nullcontext()
+
+
+class StatementStats:
+    """Bitta so'rov shakli uchun vaqt gistogrammasi."""
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total += elapsed_ms
+        if elapsed_ms > self.max:
+            self.max = elapsed_ms
+        for i, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "buckets": dict(zip([f"<={b}ms" for b in BUCKETS_MS] + ["inf"], self.buckets)),
+        }
+
+
+class SQLInstrumentation:
+    """Barcha DAO klasslari uchun umumiy SQL o'lchash nuqtasi.
+
+    Hammasi o'chiq bo'lsa, ``span`` tayyor ``nullcontext`` ni qaytaradi, ya'ni
+    har bir so'rovga deyarli qo'shimcha xarajat qo'shilmaydi. Yoqilgan
+    imkoniyatlar:
+
+    * ``timing`` - har bir so'rov shakli uchun vaqt gistogrammasi;
+    * ``slow_query_ms`` - shundan uzoq davom etgan so'rovlar ``logging.warning`` ga yoziladi;
+    * ``trace_sample_rate`` - tanlangan so'rovlarning to'liq matni (triggerlar bilan)
+      ``logging.debug`` ga yoziladi.
+    """
+
+    def __init__(self):
+        self.timing = False
+        self.slow_query_ms = 0
+        self.trace_sample_rate = 0.0
+        self._active = False
+        self._stats: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, timing: Optional[bool] = None, slow_query_ms: Optional[int] = None,
+                  trace_sample_rate: Optional[float] = None) -> None:
+        """Sozlamalarni o'zgartiradi (berilmaganlari o'zgarmaydi)."""
+        if timing is not None:
+            self.timing = timing
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+        if trace_sample_rate is not None:
+            self.trace_sample_rate = max(0.0, min(1.0, trace_sample_rate))
+        self._active = bool(self.timing or self.slow_query_ms > 0 or self.trace_sample_rate > 0)
+        logging.info(f"SQL instrumentation: timing={self.timing}, slow_query_ms={self.slow_query_ms}, "
+                     f"trace_sample_rate={self.trace_sample_rate}")
+
+    def span(self, conn: sqlite3.Connection, sql: str):
+        """So'rov bajarilishini o'rab turuvchi context manager qaytaradi."""
+        if not self._active:
+            return _NULL_SPAN
+        trace = self.trace_sample_rate > 0 and random.random() < self.trace_sample_rate
+        return _Span(self, conn, sql, trace)
+
+    def observe(self, sql: str, elapsed_ms: float) -> None:
+        """Bajarilgan so'rov vaqtini qayd qiladi."""
+        if self.slow_query_ms and elapsed_ms >= self.slow_query_ms:
+            logging.warning(f"Sekin SQL so'rov: {elapsed_ms:.1f}ms, query: {normalize_sql(sql)}")
+        if self.timing:
+            key = normalize_sql(sql)
+            with self._lock:
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = StatementStats()
+                stats.observe(elapsed_ms)
+
+    def snapshot(self, top: int = 20) -> List[Dict[str, Any]]:
+        """Umumiy vaqti bo'yicha eng og'ir so'rovlar statistikasini qaytaradi."""
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[1].total, reverse=True)[:top]
+            return [dict(query=query, **stats.as_dict()) for query, stats in items]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def log_summary(self, top: int = 10) -> None:
+        """Eng og'ir so'rovlar statistikasini jurnalga yozadi."""
+        for row in self.snapshot(top):
+            logging.info(f"SQL stats: count={row['count']}, avg={row['avg_ms']}ms, max={row['max_ms']}ms, "
+                         f"query={row['query']}")
+
+
+class _Span:
+    __slots__ = ("instrumentation", "conn", "sql", "trace", "started")
+
+    def __init__(self, instrumentation: SQLInstrumentation, conn: sqlite3.Connection, sql: str, trace: bool):
+        self.instrumentation = instrumentation
+        self.conn = conn
+        self.sql = sql
+        self.trace = trace
+
+    def __enter__(self):
+        if self.trace:
+            self.conn.set_trace_callback(_trace)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        if self.trace:
+            self.conn.set_trace_callback(None)
+        self.instrumentation.observe(self.sql, elapsed_ms)
+        return False
+
+
+def _trace(statement: str) -> None:
+    logging.debug(f"SQL trace: {statement}")
+
+
+def normalize_sql(sql: str, limit: int = 200) -> str:
+    """So'rov matnini bir qatorga keltiradi (statistika kaliti sifatida)."""
+    return _WHITESPACE.sub(" ", sql).strip()[:limit]
+
+
+# Barcha bazalar uchun umumiy nusxa
+sql_instrumentation = SQLInstrumentation()
@@ -0,0 +1,47 @@
+# maintenance.py: ma'lumotlar bazasi uchun fon vazifalari (WAL checkpoint)
+import asyncio
+import logging
+from typing import Optional
+
+from .executor import get_executor
+from .pool import all_pools
+
+_checkpoint_task: Optional[asyncio.Task] = None
+
+
+async def checkpoint_all(mode: str = "PASSIVE") -> None:
+    """Barcha ochiq bazalar uchun WAL checkpoint bajaradi (yozish oqimida)."""
+    for pool in all_pools():
+        try:
+            result = await get_executor(pool.path_to_db).run(pool.checkpoint, mode, write=True)
+            logging.info(f"WAL checkpoint: path={pool.path_to_db}, mode={mode}, result={result}")
+        except Exception as e:
+            logging.error(f"WAL checkpoint xatolik: path={pool.path_to_db}, error={e}")
+
+
+async def _checkpoint_loop(interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await checkpoint_all()
+
+
+def start_checkpoint_scheduler(interval: int) -> None:
+    """WAL checkpoint rejalashtiruvchisini ishga tushiradi."""
+    global _checkpoint_task
+    if interval <= 0 or (_checkpoint_task and not _checkpoint_task.done()):
+        return
+    _checkpoint_task = asyncio.create_task(_checkpoint_loop(interval))
+    logging.info(f"WAL checkpoint scheduler started: interval={interval}s")
+
+
+async def stop_checkpoint_scheduler() -> None:
+    """Rejalashtiruvchini to'xtatadi va oxirgi marta WAL ni qisqartiradi."""
+    global _checkpoint_task
+    if _checkpoint_task:
+        _checkpoint_task.cancel()
+        try:
+            await _checkpoint_task
+        except asyncio.CancelledError:
+            pass
+        _checkpoint_task = None
+    await checkpoint_all(mode="TRUNCATE")
@@ -0,0 +1,72 @@
+# migrations.py: sxema versiyalari va tartiblangan migratsiyalarni qo'llash
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Sequence, Union
+
+from .executor import get_executor
+from .pool import get_pool
+
+
+class Migration(NamedTuple):
+    """Bitta migratsiya qadami.
+
+    ``apply`` SQL so'rovlar ro'yxati yoki ulanishni qabul qiluvchi funksiya
+    bo'lishi mumkin (masalan, ustun mavjudligini tekshirish kerak bo'lganda).
+    """
+    version: int
+    description: str
+    apply: Union[Sequence[str], Callable[[sqlite3.Connection], None]]
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Jadval ustunlari nomlarini qaytaradi (jadval bo'lmasa bo'sh ro'yxat)."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def _current_version(conn: sqlite3.Connection) -> int:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(path_to_db: str, migrations: Sequence[Migration]) -> int:
+    """Hali qo'llanmagan migratsiyalarni tartib bilan qo'llaydi va joriy versiyani qaytaradi.
+
+    Har bir migratsiya o'z tranzaksiyasida bajariladi: xatolik bo'lsa, u
+    to'liq bekor qilinadi va keyingi ishga tushirishda qayta urinib ko'riladi.
+    """
+    with get_pool(path_to_db).connection() as conn:
+        version = _current_version(conn)
+        for migration in sorted(migrations, key=lambda m: m.version):
+            if migration.version <= version:
+                continue
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                if callable(migration.apply):
+                    migration.apply(conn)
+                else:
+                    for statement in migration.apply:
+                        conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (migration.version, migration.description, datetime.now().isoformat()))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logging.error(f"Migration failed: path={path_to_db}, version={migration.version}, error={e}")
+                raise
+            version = migration.version
+            logging.info(f"Migration applied: path={path_to_db}, version={version}, {migration.description}")
+    return version
+
+
+async def migrate(path_to_db: str, migrations: Sequence[Migration]) -> int:
+    """``apply_migrations`` ni yozish oqimida bajaradi."""
+    return await get_executor(path_to_db).run(apply_migrations, path_to_db, migrations, write=True)
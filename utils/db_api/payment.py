@@ -2,57 +2,50 @@ import sqlite3
 import logging
 from datetime import datetime
 import pytz
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
+
+from .database import Database, dict_rows
+from .migrations import Migration, migrate
+from .records import Payment, record_factory
+
+PAYMENT_ROWS = record_factory(Payment)
+
+PAYMENT_MIGRATIONS = [
+    Migration(1, "Payments jadvali", [
+        """
+        CREATE TABLE IF NOT EXISTS Payments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            telegram_id BIGINT NOT NULL,
+            photo_file_id VARCHAR(255) NOT NULL,
+            amount DECIMAL(10,2) NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME,
+            FOREIGN KEY (telegram_id) REFERENCES Users(telegram_id)
+        )
+        """,
+    ]),
+    Migration(2, "Payments foydalanuvchi/holat va holat/sana indekslari", [
+        "CREATE INDEX IF NOT EXISTS idx_payments_user_status ON Payments (telegram_id, status)",
+        "CREATE INDEX IF NOT EXISTS idx_payments_status_created ON Payments (status, created_at)",
+    ]),
+]
+
+class PaymentDatabase(Database):
+    row_factory = staticmethod(dict_rows)
 
-class PaymentDatabase:
     def __init__(self, path_to_db: str):
-        self.path_to_db = path_to_db
+        super().__init__(path_to_db)
         self.uzbekistan_tz = pytz.timezone("Asia/Tashkent")
         logging.info(f"PaymentDatabase initialized with path: {path_to_db}")
 
-    def execute(self, sql: str, parameters: tuple = (), fetchone: bool = False, fetchall: bool = False, commit: bool = False) -> Any:
-        """Execute a SQL query with the given parameters."""
-        try:
-            with sqlite3.connect(self.path_to_db) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(sql, parameters)
-                if commit:
-                    conn.commit()
-                if fetchone:
-                    result = cursor.fetchone()
-                    return dict(result) if result else None
-                if fetchall:
-                    result = cursor.fetchall()
-                    return [dict(row) for row in result] if result else []
-                return None
-        except sqlite3.Error as e:
-            logging.error(f"SQL error in execute: {e}, query: {sql}")
-            raise
-        except Exception as e:
-            logging.error(f"Unexpected error in execute: {e}, query: {sql}")
-            raise
-
     def _get_current_time(self) -> datetime:
         """Joriy vaqtni O‘zbekiston vaqt mintaqasida oladi."""
         return datetime.now(self.uzbekistan_tz)
 
-    async def create_table_payments(self) -> None:
-        """To‘lovlar jadvalini yaratadi."""
-        sql = """
-            CREATE TABLE IF NOT EXISTS Payments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                telegram_id BIGINT NOT NULL,
-                photo_file_id VARCHAR(255) NOT NULL,
-                amount DECIMAL(10,2) NOT NULL,
-                status VARCHAR(20) NOT NULL DEFAULT 'pending',
-                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME,
-                FOREIGN KEY (telegram_id) REFERENCES Users(telegram_id)
-            );
-        """
-        self.execute(sql, commit=True)
-        logging.info("Payments table created or already exists.")
+    async def migrate(self) -> int:
+        """Payments bazasi sxemasini oxirgi versiyagacha yangilaydi."""
+        return await migrate(self.path_to_db, PAYMENT_MIGRATIONS)
 
     async def add_payment(self, telegram_id: int, photo_file_id: str, amount: float) -> int:
         """To'lov chekini qo'shadi va payment ID ni qaytaradi."""
@@ -71,16 +64,10 @@ class PaymentDatabase:
                 VALUES (?, ?, ?, ?, ?)
             """
 
-            # INSERT va last_insert_rowid() ni bir xil connection'da bajarish
             try:
-                with sqlite3.connect(self.path_to_db) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(sql, (telegram_id, photo_file_id, amount, 'pending', created_at))
-                    payment_id = cursor.lastrowid  # Bu to'g'ri usul
-                    conn.commit()
-
-                    logging.info(f"Payment added: telegram_id={telegram_id}, payment_id={payment_id}, amount={amount}")
-                    return payment_id
+                payment_id = await self.insert_async(sql, (telegram_id, photo_file_id, amount, 'pending', created_at))
+                logging.info(f"Payment added: telegram_id={telegram_id}, payment_id={payment_id}, amount={amount}")
+                return payment_id
 
             except sqlite3.Error as e:
                 logging.error(f"SQL error in add_payment: {e}")
@@ -90,21 +77,21 @@ class PaymentDatabase:
             logging.error(f"Error adding payment: telegram_id={telegram_id}, error={e}")
             raise
 
-    async def get_user_pending_payment(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+    async def get_user_pending_payment(self, telegram_id: int) -> Optional[Payment]:
         """Foydalanuvchining tasdiqlanmagan to'lovini qaytaradi."""
         try:
             sql = "SELECT * FROM Payments WHERE telegram_id = ? AND status = 'pending'"
-            result = self.execute(sql, parameters=(telegram_id,), fetchone=True)
+            result = await self.execute_async(sql, parameters=(telegram_id,), fetchone=True, row_factory=PAYMENT_ROWS)
             return result
         except Exception as e:
             logging.error(f"Error getting pending payment: telegram_id={telegram_id}, error={e}")
             return None
 
-    async def get_pending_payments(self) -> List[Dict[str, Any]]:
+    async def get_pending_payments(self) -> List[Payment]:
         """Barcha tasdiqlanmagan to‘lovlarni qaytaradi."""
         try:
             sql = "SELECT * FROM Payments WHERE status = 'pending' ORDER BY created_at DESC"
-            result = self.execute(sql, fetchall=True)
+            result = await self.execute_async(sql, fetchall=True, row_factory=PAYMENT_ROWS)
             return result
         except Exception as e:
             logging.error(f"Error getting pending payments: error={e}")
@@ -117,17 +104,17 @@ class PaymentDatabase:
         try:
             updated_at = self._get_current_time().isoformat()
             sql = "UPDATE Payments SET status = ?, updated_at = ? WHERE id = ?"
-            self.execute(sql, parameters=(status, updated_at, payment_id), commit=True)
+            await self.execute_async(sql, parameters=(status, updated_at, payment_id), commit=True)
             logging.info(f"Payment status updated: payment_id={payment_id}, status={status}")
         except Exception as e:
             logging.error(f"Error updating payment status: payment_id={payment_id}, error={e}")
             raise
 
-    async def get_user_payment_history(self, telegram_id: int) -> List[Dict[str, Any]]:
+    async def get_user_payment_history(self, telegram_id: int) -> List[Payment]:
         """Foydalanuvchining to‘lovlar tarixini qaytaradi."""
         try:
             sql = "SELECT * FROM Payments WHERE telegram_id = ? ORDER BY created_at DESC"
-            result = self.execute(sql, parameters=(telegram_id,), fetchall=True)
+            result = await self.execute_async(sql, parameters=(telegram_id,), fetchall=True, row_factory=PAYMENT_ROWS)
             return result
         except Exception as e:
             logging.error(f"Error getting payment history: telegram_id={telegram_id}, error={e}")
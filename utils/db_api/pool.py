@@ -0,0 +1,174 @@
+# pool.py: SQLite ulanishlari hovuzi (har bir ma'lumotlar bazasi fayli uchun bitta hovuz)
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class ConnectionPool:
+    """Bitta ma'lumotlar bazasi fayli uchun doimiy ulanishlar hovuzi.
+
+    Ulanishlar yopilmaydi, balki hovuzga qaytariladi, shuning uchun har bir
+    so'rov faylni qayta ochmaydi va sxemani qayta tahlil qilmaydi. Har bir
+    ulanishning tayyorlangan so'rovlar keshi (``cached_statements``) ham
+    issiq holatda saqlanadi.
+    """
+
+    def __init__(self, path_to_db: str, max_size: int = 5, timeout: float = 30.0,
+                 pragmas: Optional[Dict[str, Any]] = None, health_check_interval: float = 30.0,
+                 cached_statements: int = 256):
+        self.path_to_db = path_to_db
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = dict(pragmas or {})
+        self.health_check_interval = health_check_interval
+        self.cached_statements = cached_statements
+        # LIFO: oxirgi qaytarilgan (eng "issiq") ulanish birinchi beriladi
+        self._idle: "queue.LifoQueue[Tuple[sqlite3.Connection, float]]" = queue.LifoQueue(maxsize=max_size)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Yangi ulanish ochadi va PRAGMA sozlamalarini qo'llaydi."""
+        conn = sqlite3.connect(
+            self.path_to_db,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        logging.info(f"SQLite connection opened: path={self.path_to_db}, pool_size={self._created}/{self.max_size}")
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        """Ulanish ishlayotganini tekshiradi."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Ulanishni yopadi va hovuz hisobidan chiqaradi."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def acquire(self) -> sqlite3.Connection:
+        """Hovuzdan ulanish oladi, kerak bo'lsa yangisini ochadi."""
+        if self._closed:
+            raise sqlite3.ProgrammingError(f"Connection pool is closed: {self.path_to_db}")
+        while True:
+            try:
+                conn, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.max_size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._connect()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                try:
+                    conn, released_at = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        f"Timed out waiting for a connection: path={self.path_to_db}, max_size={self.max_size}")
+
+            # Uzoq vaqt ishlatilmagan ulanishni tekshirish
+            if time.monotonic() - released_at > self.health_check_interval and not self._is_healthy(conn):
+                logging.warning(f"Unhealthy SQLite connection discarded: path={self.path_to_db}")
+                self._discard(conn)
+                continue
+            return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Ulanishni hovuzga qaytaradi."""
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                self._discard(conn)
+                return
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            self._idle.put_nowait((conn, time.monotonic()))
+        except queue.Full:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """``with`` bloki davomida hovuzdan ulanish beradi."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Optional[Tuple[int, int, int]]:
+        """WAL faylini asosiy bazaga ko'chiradi: (busy, log_frames, checkpointed_frames)."""
+        with self.connection() as conn:
+            return conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+    def close(self) -> None:
+        """Hovuzdagi barcha bo'sh ulanishlarni yopadi."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+        logging.info(f"Connection pool closed: path={self.path_to_db}")
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_pool_options: Dict[str, Any] = {}
+
+
+def configure_pools(**options: Any) -> None:
+    """Keyin yaratiladigan hovuzlar uchun sozlamalarni o'rnatadi (masalan, ``pragmas``)."""
+    _pool_options.update(options)
+
+
+def get_pool(path_to_db: str) -> ConnectionPool:
+    """Fayl uchun umumiy hovuzni qaytaradi (birinchi chaqiruvda yaratiladi)."""
+    pool = _pools.get(path_to_db)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(path_to_db)
+            if pool is None:
+                pool = ConnectionPool(path_to_db, **_pool_options)
+                _pools[path_to_db] = pool
+    return pool
+
+
+def all_pools() -> List[ConnectionPool]:
+    """Hozir ochiq bo'lgan barcha hovuzlarni qaytaradi."""
+    with _pools_lock:
+        return list(_pools.values())
+
+
+def close_all_pools() -> None:
+    """Barcha hovuzlarni yopadi (bot to'xtaganda chaqiriladi)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
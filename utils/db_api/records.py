@@ -0,0 +1,87 @@
+# records.py: bazadan qaytadigan qatorlar uchun ixcham, o'zgarmas yozuv turlari
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+
+class RecordMixin:
+    """namedtuple asosidagi yozuvlarga lug'atga o'xshash o'qish interfeysini qo'shadi.
+
+    Yozuvlar ``__slots__ = ()`` bilan e'lon qilinadi, ya'ni har bir nusxada
+    ``__dict__`` yo'q va u oddiy tuple o'lchamida bo'ladi. ``record["id"]``,
+    ``record.get("id")``, ``dict(record)`` avvalgi dict qatorlar kabi ishlaydi.
+    Yozuvlar keshlar orasida bo'lishiladi, shuning uchun o'zgartirish o'rniga
+    ``_replace`` ishlatiladi.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...]
+    _index: Dict[str, int] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._index = {name: i for i, name in enumerate(cls._fields)}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._index.get(key)
+        return default if i is None else tuple.__getitem__(self, i)
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self._fields, tuple.__iter__(self))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._fields, tuple.__iter__(self)))
+
+
+class Question(RecordMixin, namedtuple("Question", "id display_id question answer audio_file_id language")):
+    """Savol-javob."""
+    __slots__ = ()
+
+
+class RoadSign(RecordMixin, namedtuple("RoadSign", "id display_id image_file_id description language")):
+    """Yo'l belgisi."""
+    __slots__ = ()
+
+
+class TruckPart(RecordMixin, namedtuple("TruckPart", "id display_id image_file_id description language")):
+    """Yuk mashinasi qismi."""
+    __slots__ = ()
+
+
+class User(RecordMixin, namedtuple(
+        "User", "id telegram_id username created_at last_active is_admin is_allowed language")):
+    """Foydalanuvchi profili."""
+    __slots__ = ()
+
+
+class Payment(RecordMixin, namedtuple(
+        "Payment", "id telegram_id photo_file_id amount status created_at updated_at")):
+    """To'lov cheki."""
+    __slots__ = ()
+
+
+def record_factory(record_type) -> Callable[[Tuple[str, ...]], Callable[[tuple], Any]]:
+    """``Database`` uchun qatorlarni ``record_type`` yozuvlariga aylantiruvchi row_factory.
+
+    Ustunlar tartibi yozuv maydonlariga mos bo'lsa, qator to'g'ridan-to'g'ri
+    ``_make`` ga beriladi; aks holda ustunlar nomi bo'yicha joylashtiriladi
+    (yo'q maydonlar None bo'ladi).
+    """
+    fields = record_type._fields
+
+    def factory(columns: Tuple[str, ...]) -> Callable[[tuple], Any]:
+        if columns == fields:
+            return record_type._make
+        positions = [columns.index(name) if name in columns else None for name in fields]
+        return lambda row: record_type._make([None if i is None else row[i] for i in positions])
+
+    return factory
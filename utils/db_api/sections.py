@@ -1,195 +1,234 @@
 import sqlite3
 import logging
-from typing import List, Dict, Any, Optional
-
+from typing import List, Dict, Any, Optional, Tuple
+
+from .catalog import SectionCatalog
+from .changes import CHANGES_TABLE, change_trigger
+from .database import Database, dict_rows
+from .instrumentation import sql_instrumentation
+from .migrations import Migration, migrate, table_columns
+from .records import Question, RoadSign, TruckPart, record_factory
+
+QUESTION_ROWS = record_factory(Question)
+ROAD_SIGN_ROWS = record_factory(RoadSign)
+TRUCK_PART_ROWS = record_factory(TruckPart)
+
+# Bo'lim nomi -> (jadval, sahifada qaytariladigan ustunlar, yozuv turi)
+SECTION_TABLES = {
+    "question": ("Questions", "id, display_id, question, answer, audio_file_id, language", QUESTION_ROWS),
+    "road_sign": ("RoadSigns", "id, display_id, image_file_id, description, language", ROAD_SIGN_ROWS),
+    "truck_part": ("TruckParts", "id, display_id, image_file_id, description, language", TRUCK_PART_ROWS),
+}
+
+# Jadval -> ustunlar ta'rifi (id va display_id dan tashqari)
+SECTION_SCHEMAS = {
+    "Questions": """
+        question TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        audio_file_id VARCHAR(255) NULL,
+        language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
+    """,
+    "RoadSigns": """
+        image_file_id VARCHAR(255) NOT NULL,
+        description TEXT NULL,
+        language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
+    """,
+    "TruckParts": """
+        image_file_id VARCHAR(255) NOT NULL,
+        description TEXT NULL,
+        language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
+    """,
+}
+
+
+def _reindex_sql(table: str) -> str:
+    """display_id larni id tartibida 1..N qilib qayta raqamlovchi yagona so'rov.
+
+    ``:language`` NULL bo'lsa, barcha tillar qayta raqamlanadi.
+    """
+    return f"""
+        UPDATE {table} SET display_id = ordered.rn
+        FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY language ORDER BY id) AS rn
+              FROM {table} WHERE :language IS NULL OR language = :language) AS ordered
+        WHERE {table}.id = ordered.id AND {table}.display_id <> ordered.rn
+    """
+
+
+def _create_section_tables(conn: sqlite3.Connection) -> None:
+    """Bo'lim jadvallarini yaratadi, eski (display_id siz) jadvallarni ko'chiradi."""
+    for table, schema in SECTION_SCHEMAS.items():
+        columns = table_columns(conn, table)
+        if columns and "display_id" not in columns:
+            conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                display_id INTEGER NOT NULL,
+                {schema.strip()}
+            )
+        """)
+        if columns and "display_id" not in columns:
+            conn.execute(f"""
+                INSERT INTO {table} (id, display_id, {", ".join(c for c in columns if c != "id")})
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY language ORDER BY id), {", ".join(c for c in columns if c != "id")}
+                FROM {table}_old
+            """)
+            conn.execute(f"DROP TABLE {table}_old")
+            logging.info(f"{table} table migrated with display_id column.")
+        else:
+            # Avvalgi versiyalar har ishga tushishda qilgan qayta indekslashni bir marta bajarish
+            conn.execute(_reindex_sql(table), {"language": None})
+
+
+def _create_section_counts(conn: sqlite3.Connection) -> None:
+    """Bo'limlar bo'yicha elementlar sonini saqlovchi hisoblagich jadvalini yaratadi.
+
+    Hisoblagichlar triggerlar orqali yuritiladi, shuning uchun umumiy sonni
+    olish uchun ``COUNT(*)`` bilan butun jadvalni ko'rib chiqish shart emas.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS SectionCounts (
+            section VARCHAR(20) NOT NULL,
+            language VARCHAR(10) NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (section, language)
+        )
+    """)
+    for section, (table, _, _) in SECTION_TABLES.items():
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_count_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO SectionCounts (section, language, total) VALUES ('{section}', NEW.language, 1)
+                ON CONFLICT (section, language) DO UPDATE SET total = total + 1;
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_count_delete AFTER DELETE ON {table}
+            BEGIN
+                UPDATE SectionCounts SET total = total - 1
+                WHERE section = '{section}' AND language = OLD.language;
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_count_language AFTER UPDATE OF language ON {table}
+            WHEN OLD.language <> NEW.language
+            BEGIN
+                UPDATE SectionCounts SET total = total - 1
+                WHERE section = '{section}' AND language = OLD.language;
+                INSERT INTO SectionCounts (section, language, total) VALUES ('{section}', NEW.language, 1)
+                ON CONFLICT (section, language) DO UPDATE SET total = total + 1;
+            END
+        """)
+        # Mavjud ma'lumotlar uchun hisoblagichlarni bir marta to'ldirish
+        conn.execute(f"""
+            INSERT OR REPLACE INTO SectionCounts (section, language, total)
+            SELECT '{section}', language, COUNT(*) FROM {table} GROUP BY language
+        """)
+
+
+def _create_section_changes(conn: sqlite3.Connection) -> None:
+    """Bo'lim o'zgarishlarini Changes jurnaliga yozuvchi triggerlarni yaratadi.
+
+    Boshqa worker jarayonlari jurnal orqali o'z katalog keshlarini bekor qiladi.
+    """
+    conn.execute(CHANGES_TABLE)
+    for section, (table, _, _) in SECTION_TABLES.items():
+        conn.execute(change_trigger(f"{table}_change_insert", table, "INSERT", "section",
+                                    [f"'{section}:' || NEW.language"]))
+        conn.execute(change_trigger(f"{table}_change_update", table, "UPDATE", "section",
+                                    [f"'{section}:' || OLD.language", f"'{section}:' || NEW.language"]))
+        conn.execute(change_trigger(f"{table}_change_delete", table, "DELETE", "section",
+                                    [f"'{section}:' || OLD.language"]))
+
+
+SECTIONS_MIGRATIONS = [
+    Migration(1, "Questions, RoadSigns, TruckParts jadvallari", _create_section_tables),
+    Migration(2, "SectionCounts hisoblagichlari va triggerlar", _create_section_counts),
+    Migration(3, "Bo'limlar uchun (language, display_id) indekslari", [
+        f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_language_display ON {table} (language, display_id)"
+        for table, _, _ in SECTION_TABLES.values()
+    ]),
+    Migration(4, "Changes jurnali va bo'lim o'zgarish triggerlari", _create_section_changes),
+]
+
+
+class SectionsDatabase(Database):
+    row_factory = staticmethod(dict_rows)
 
-class SectionsDatabase:
     def __init__(self, path_to_db: str):
-        self.path_to_db = path_to_db
+        super().__init__(path_to_db)
+        # Bo'limlar katalogi: sahifalar va umumiy sonlar shu yerda keshlanadi
+        self.catalog = SectionCatalog(self._load_page, self._load_count)
         logging.info(f"SectionsDatabase initialized with path: {path_to_db}")
 
-    def execute(self, sql: str, parameters: tuple = (), fetchone: bool = False, fetchall: bool = False,
-                commit: bool = False) -> Any:
-        """Execute a SQL query with the given parameters."""
-        try:
-            with sqlite3.connect(self.path_to_db) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(sql, parameters)
-                if commit:
-                    conn.commit()
-                if fetchone:
-                    result = cursor.fetchone()
-                    return dict(result) if result else None
-                if fetchall:
-                    result = cursor.fetchall()
-                    return [dict(row) for row in result] if result else []
-                return None
-        except sqlite3.Error as e:
-            logging.error(f"SQL error in execute: {e}, query: {sql}")
-            raise
-        except Exception as e:
-            logging.error(f"Unexpected error in execute: {e}, query: {sql}")
-            raise
-
-    async def create_table_questions(self) -> None:
-        """Savol-javoblar jadvalini yaratadi."""
-        sql_check = "SELECT name FROM sqlite_master WHERE type='table' AND name='Questions'"
-        result = self.execute(sql_check, fetchone=True)
-        if not result:
-            sql_create = """
-                CREATE TABLE IF NOT EXISTS Questions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    display_id INTEGER NOT NULL,
-                    question TEXT NOT NULL,
-                    answer TEXT NOT NULL,
-                    audio_file_id VARCHAR(255) NULL,
-                    language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
-                );
-            """
-            self.execute(sql_create, commit=True)
-            logging.info("Questions table created.")
-        else:
-            sql_check_column = "PRAGMA table_info(Questions)"
-            columns = self.execute(sql_check_column, fetchall=True)
-            has_display_id = any(col['name'] == 'display_id' for col in columns)
-            if not has_display_id:
-                self.execute("ALTER TABLE Questions RENAME TO Questions_old", commit=True)
-                sql_create = """
-                    CREATE TABLE IF NOT EXISTS Questions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        display_id INTEGER NOT NULL,
-                        question TEXT NOT NULL,
-                        answer TEXT NOT NULL,
-                        audio_file_id VARCHAR(255) NULL,
-                        language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
-                    );
-                """
-                self.execute(sql_create, commit=True)
-                self.execute("""
-                    INSERT INTO Questions (id, display_id, question, answer, audio_file_id, language)
-                    SELECT id, ROW_NUMBER() OVER (PARTITION BY language ORDER BY id) AS display_id, 
-                           question, answer, audio_file_id, language 
-                    FROM Questions_old
-                """, commit=True)
-                self.execute("DROP TABLE Questions_old", commit=True)
-                logging.info("Questions table migrated with display_id column.")
-
-            # Tillarda alohida ketma-ketlik yaratish
-            languages = ['uz', 'ru', 'es']
-            for lang in languages:
-                await self._reindex_display_ids("Questions", lang)
-            logging.info("Questions table display_ids reindexed for all languages.")
-
-    async def create_table_road_signs(self) -> None:
-        """Yo'l belgilari jadvalini yaratadi."""
-        sql_check = "SELECT name FROM sqlite_master WHERE type='table' AND name='RoadSigns'"
-        result = self.execute(sql_check, fetchone=True)
-        if not result:
-            sql_create = """
-                CREATE TABLE IF NOT EXISTS RoadSigns (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    display_id INTEGER NOT NULL,
-                    image_file_id VARCHAR(255) NOT NULL,
-                    description TEXT NULL,
-                    language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
-                );
-            """
-            self.execute(sql_create, commit=True)
-            logging.info("RoadSigns table created.")
-        else:
-            sql_check_column = "PRAGMA table_info(RoadSigns)"
-            columns = self.execute(sql_check_column, fetchall=True)
-            has_display_id = any(col['name'] == 'display_id' for col in columns)
-            if not has_display_id:
-                self.execute("ALTER TABLE RoadSigns RENAME TO RoadSigns_old", commit=True)
-                sql_create = """
-                    CREATE TABLE IF NOT EXISTS RoadSigns (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        display_id INTEGER NOT NULL,
-                        image_file_id VARCHAR(255) NOT NULL,
-                        description TEXT NULL,
-                        language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
-                    );
-                """
-                self.execute(sql_create, commit=True)
-                self.execute("""
-                    INSERT INTO RoadSigns (id, display_id, image_file_id, description, language)
-                    SELECT id, ROW_NUMBER() OVER (PARTITION BY language ORDER BY id) AS display_id, 
-                           image_file_id, description, language 
-                    FROM RoadSigns_old
-                """, commit=True)
-                self.execute("DROP TABLE RoadSigns_old", commit=True)
-                logging.info("RoadSigns table migrated with display_id column.")
-
-            # Tillarda alohida ketma-ketlik yaratish
-            languages = ['uz', 'ru', 'es']
-            for lang in languages:
-                await self._reindex_display_ids("RoadSigns", lang)
-            logging.info("RoadSigns table display_ids reindexed for all languages.")
-
-    async def create_table_truck_parts(self) -> None:
-        """Yuk mashinasi qismlari jadvalini yaratadi."""
-        sql_check = "SELECT name FROM sqlite_master WHERE type='table' AND name='TruckParts'"
-        result = self.execute(sql_check, fetchone=True)
-        if not result:
-            sql_create = """
-                CREATE TABLE IF NOT EXISTS TruckParts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    display_id INTEGER NOT NULL,
-                    image_file_id VARCHAR(255) NOT NULL,
-                    description TEXT NULL,
-                    language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
-                );
-            """
-            self.execute(sql_create, commit=True)
-            logging.info("TruckParts table created.")
-        else:
-            sql_check_column = "PRAGMA table_info(TruckParts)"
-            columns = self.execute(sql_check_column, fetchall=True)
-            has_display_id = any(col['name'] == 'display_id' for col in columns)
-            if not has_display_id:
-                self.execute("ALTER TABLE TruckParts RENAME TO TruckParts_old", commit=True)
-                sql_create = """
-                    CREATE TABLE IF NOT EXISTS TruckParts (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        display_id INTEGER NOT NULL,
-                        image_file_id VARCHAR(255) NOT NULL,
-                        description TEXT NULL,
-                        language VARCHAR(10) NOT NULL CHECK(language IN ('uz', 'ru', 'es'))
-                    );
-                """
-                self.execute(sql_create, commit=True)
-                self.execute("""
-                    INSERT INTO TruckParts (id, display_id, image_file_id, description, language)
-                    SELECT id, ROW_NUMBER() OVER (PARTITION BY language ORDER BY id) AS display_id, 
-                           image_file_id, description, language 
-                    FROM TruckParts_old
-                """, commit=True)
-                self.execute("DROP TABLE TruckParts_old", commit=True)
-                logging.info("TruckParts table migrated with display_id column.")
-
-            # Tillarda alohida ketma-ketlik yaratish
-            languages = ['uz', 'ru', 'es']
-            for lang in languages:
-                await self._reindex_display_ids("TruckParts", lang)
-            logging.info("TruckParts table display_ids reindexed for all languages.")
+    async def migrate(self) -> int:
+        """Bo'limlar bazasi sxemasini oxirgi versiyagacha yangilaydi."""
+        return await migrate(self.path_to_db, SECTIONS_MIGRATIONS)
+
+    def on_change(self, scope: str, key: str) -> None:
+        """Boshqa jarayon o'zgartirgan bo'lim keshini bekor qiladi (ChangeWatcher)."""
+        if scope == "section":
+            section, language = key.split(":", 1)
+            self.catalog.invalidate(section, language)
+
+    async def verify_display_ids(self) -> int:
+        """display_id lar ketma-ketligini tekshiradi va faqat buzilganlarini qayta indekslaydi.
+
+        display_id lar har bir til uchun 1..N bo'lgani uchun MIN 1 ga, MAX va
+        takrorlanmas display_id lar soni esa hisoblagichdagi songa teng bo'lishi
+        kerak (faqat MAX ni solishtirish takror + bo'shliq juftligini ko'rmaydi).
+        Qiymatlar (language, display_id) indeksini tartib bo'yicha bir marta
+        o'qish (vaqtinchalik B-tree siz) va hisoblagichdan olinadi: har bir
+        juftlik uchun bitta so'rov, jadvalning o'ziga murojaat qilinmaydi.
+        Qayta indekslangan (jadval, til) juftliklari sonini qaytaradi.
+        """
+        reindexed = 0
+        for section, (table, _, _) in SECTION_TABLES.items():
+            for language in ['uz', 'ru', 'es']:
+                total = await self._load_count(section, language)
+                stats = await self.execute_async(
+                    f"SELECT MIN(display_id) AS min_id, MAX(display_id) AS max_id, COUNT(*) AS distinct_ids "
+                    f"FROM (SELECT display_id FROM {table} WHERE language = ? GROUP BY display_id)",
+                    parameters=(language,), fetchone=True)
+                min_id, max_id, distinct_ids = stats["min_id"] or 0, stats["max_id"] or 0, stats["distinct_ids"]
+                if max_id != total or distinct_ids != total or min_id != min(total, 1):
+                    logging.warning(f"display_id lar mos emas: table={table}, language={language}, "
+                                    f"min={min_id}, max={max_id}, distinct={distinct_ids}, total={total}")
+                    await self._reindex_display_ids(table, language)
+                    self.catalog.invalidate(section, language)
+                    reindexed += 1
+        return reindexed
 
     async def _get_next_display_id(self, table: str, language: str) -> int:
         """Muayyan jadval va til uchun keyingi display_id ni qaytaradi."""
         sql = f"SELECT MAX(display_id) AS max_id FROM {table} WHERE language = ?"
-        result = self.execute(sql, parameters=(language,), fetchone=True)
+        result = await self.execute_async(sql, parameters=(language,), fetchone=True)
         max_id = result['max_id'] if result and result['max_id'] is not None else 0
         return max_id + 1
 
     async def _reindex_display_ids(self, table: str, language: str) -> None:
-        """Muayyan jadval va til uchun display_id larni qayta indekslaydi."""
-        sql = f"SELECT id FROM {table} WHERE language = ? ORDER BY id"
-        items = self.execute(sql, parameters=(language,), fetchall=True)
-        for new_display_id, item in enumerate(items, 1):
-            update_sql = f"UPDATE {table} SET display_id = ? WHERE id = ?"
-            self.execute(update_sql, parameters=(new_display_id, item['id']), commit=True)
-        logging.info(f"Display IDs reindexed for table={table}, language={language}, count={len(items)}")
+        """Muayyan jadval va til uchun display_id larni bitta so'rov bilan qayta indekslaydi."""
+        await self.execute_async(_reindex_sql(table), parameters={"language": language}, commit=True)
+        logging.info(f"Display IDs reindexed for table={table}, language={language}")
+
+    async def _delete_item(self, table: str, item_id: int) -> Optional[str]:
+        """Elementni o'chiradi va undan keyingi display_id larni bitta tranzaksiyada bittaga suradi.
+
+        O'chirilgan elementning tilini qaytaradi (element topilmasa None).
+        """
+        renumber_sql = f"UPDATE {table} SET display_id = display_id - 1 WHERE language = ? AND display_id > ?"
+
+        def delete_row(conn: sqlite3.Connection) -> Optional[str]:
+            row = conn.execute(f"SELECT language, display_id FROM {table} WHERE id = ?", (item_id,)).fetchone()
+            if not row:
+                return None
+            language, display_id = row
+            conn.execute(f"DELETE FROM {table} WHERE id = ?", (item_id,))
+            with sql_instrumentation.span(conn, renumber_sql):
+                conn.execute(renumber_sql, (language, display_id))
+            return language
+
+        return await self.transaction_async(delete_row)
 
     async def add_question(self, question: str, answer: str, audio_file_id: str = None, language: str = 'uz') -> int:
         """Savol-javob qo'shadi va shu tildagi ketma-ketlikni saqlaydi."""
@@ -201,9 +240,8 @@ class SectionsDatabase:
             INSERT INTO Questions (display_id, question, answer, audio_file_id, language)
             VALUES (?, ?, ?, ?, ?)
         """
-        self.execute(sql, parameters=(display_id, question, answer, audio_file_id, language), commit=True)
-        result = self.execute("SELECT last_insert_rowid()", fetchone=True)
-        question_id = result['last_insert_rowid()'] if result else None
+        question_id = await self.insert_async(sql, (display_id, question, answer, audio_file_id, language))
+        self.catalog.invalidate("question", language)
         logging.info(
             f"Savol qo'shildi: question={question[:50]}, language={language}, question_id={question_id}, display_id={display_id}")
         return question_id
@@ -220,9 +258,8 @@ class SectionsDatabase:
             INSERT INTO RoadSigns (display_id, image_file_id, description, language)
             VALUES (?, ?, ?, ?)
         """
-        self.execute(sql, parameters=(display_id, image_file_id, description, language), commit=True)
-        result = self.execute("SELECT last_insert_rowid()", fetchone=True)
-        sign_id = result['last_insert_rowid()'] if result else None
+        sign_id = await self.insert_async(sql, (display_id, image_file_id, description, language))
+        self.catalog.invalidate("road_sign", language)
         logging.info(
             f"Yo'l belgisi qo'shildi: image_file_id={image_file_id}, language={language}, sign_id={sign_id}, display_id={display_id}")
         return sign_id
@@ -239,9 +276,8 @@ class SectionsDatabase:
             INSERT INTO TruckParts (display_id, image_file_id, description, language)
             VALUES (?, ?, ?, ?)
         """
-        self.execute(sql, parameters=(display_id, image_file_id, description, language), commit=True)
-        result = self.execute("SELECT last_insert_rowid()", fetchone=True)
-        part_id = result['last_insert_rowid()'] if result else None
+        part_id = await self.insert_async(sql, (display_id, image_file_id, description, language))
+        self.catalog.invalidate("truck_part", language)
         logging.info(
             f"Truck zapchasti qo'shildi: image_file_id={image_file_id}, language={language}, part_id={part_id}, display_id={display_id}")
         return part_id
@@ -278,7 +314,7 @@ class SectionsDatabase:
 
         params.append(question_id)
         sql = f"UPDATE Questions SET {', '.join(updates)} WHERE id = ?"
-        self.execute(sql, parameters=tuple(params), commit=True)
+        await self.execute_async(sql, parameters=tuple(params), commit=True)
 
         # Agar til o'zgartirilgan bo'lsa, ikkala tilda ham qayta indekslash
         if language and language != old_language:
@@ -287,6 +323,7 @@ class SectionsDatabase:
         elif language:
             await self._reindex_display_ids("Questions", language)
 
+        self.catalog.invalidate("question")
         logging.info(f"Savol yangilandi: question_id={question_id}")
 
     async def update_road_sign(self, sign_id: int, image_file_id: str = None, description: str = None,
@@ -318,7 +355,7 @@ class SectionsDatabase:
 
         params.append(sign_id)
         sql = f"UPDATE RoadSigns SET {', '.join(updates)} WHERE id = ?"
-        self.execute(sql, parameters=tuple(params), commit=True)
+        await self.execute_async(sql, parameters=tuple(params), commit=True)
 
         # Agar til o'zgartirilgan bo'lsa, ikkala tilda ham qayta indekslash
         if language and language != old_language:
@@ -327,6 +364,7 @@ class SectionsDatabase:
         elif language:
             await self._reindex_display_ids("RoadSigns", language)
 
+        self.catalog.invalidate("road_sign")
         logging.info(f"Yo'l belgisi yangilandi: sign_id={sign_id}")
 
     async def update_truck_part(self, part_id: int, image_file_id: str = None, description: str = None,
@@ -358,7 +396,7 @@ class SectionsDatabase:
 
         params.append(part_id)
         sql = f"UPDATE TruckParts SET {', '.join(updates)} WHERE id = ?"
-        self.execute(sql, parameters=tuple(params), commit=True)
+        await self.execute_async(sql, parameters=tuple(params), commit=True)
 
         # Agar til o'zgartirilgan bo'lsa, ikkala tilda ham qayta indekslash
         if language and language != old_language:
@@ -367,116 +405,126 @@ class SectionsDatabase:
         elif language:
             await self._reindex_display_ids("TruckParts", language)
 
+        self.catalog.invalidate("truck_part")
         logging.info(f"Truck zapchasti yangilandi: part_id={part_id}")
 
-    async def get_questions(self, language: str) -> List[Dict[str, Any]]:
+    async def get_questions(self, language: str) -> List[Question]:
         """Til bo'yicha savol-javoblarni qaytaradi."""
         if language not in ['uz', 'ru', 'es']:
             raise ValueError(f"Invalid language code: {language}")
         sql = "SELECT id, display_id, question, answer, audio_file_id, language FROM Questions WHERE language = ? ORDER BY display_id"
-        result = self.execute(sql, parameters=(language,), fetchall=True)
+        result = await self.execute_async(sql, parameters=(language,), fetchall=True, row_factory=QUESTION_ROWS)
         return result or []
 
-    async def get_road_signs(self, language: str) -> List[Dict[str, Any]]:
+    async def get_road_signs(self, language: str) -> List[RoadSign]:
         """Til bo'yicha yo'l belgilarini qaytaradi."""
         if language not in ['uz', 'ru', 'es']:
             raise ValueError(f"Invalid language code: {language}")
         sql = "SELECT id, display_id, image_file_id, description, language FROM RoadSigns WHERE language = ? ORDER BY display_id"
-        result = self.execute(sql, parameters=(language,), fetchall=True)
+        result = await self.execute_async(sql, parameters=(language,), fetchall=True, row_factory=ROAD_SIGN_ROWS)
         return result or []
 
-    async def get_truck_parts(self, language: str) -> List[Dict[str, Any]]:
+    async def get_truck_parts(self, language: str) -> List[TruckPart]:
         """Til bo'yicha yuk mashinasi qismlarini qaytaradi."""
         if language not in ['uz', 'ru', 'es']:
             raise ValueError(f"Invalid language code: {language}")
         sql = "SELECT id, display_id, image_file_id, description, language FROM TruckParts WHERE language = ? ORDER BY display_id"
-        result = self.execute(sql, parameters=(language,), fetchall=True)
+        result = await self.execute_async(sql, parameters=(language,), fetchall=True, row_factory=TRUCK_PART_ROWS)
         return result or []
 
-    async def get_question_by_id(self, question_id: int, language: str = None) -> Optional[Dict[str, Any]]:
+    async def _load_page(self, section: str, language: str, after_display_id: int,
+                         limit: int) -> List[Dict[str, Any]]:
+        """Keyset usulida bitta sahifani bazadan yuklaydi (OFFSET ishlatilmaydi)."""
+        table, columns, row_factory = SECTION_TABLES[section]
+        sql = f"SELECT {columns} FROM {table} WHERE language = ? AND display_id > ? ORDER BY display_id LIMIT ?"
+        result = await self.execute_async(sql, parameters=(language, after_display_id, limit), fetchall=True,
+                                          row_factory=row_factory)
+        return result or []
+
+    async def _load_count(self, section: str, language: str) -> int:
+        """Bo'lim elementlari sonini hisoblagich jadvalidan qaytaradi."""
+        sql = "SELECT total FROM SectionCounts WHERE section = ? AND language = ?"
+        result = await self.execute_async(sql, parameters=(section, language), fetchone=True)
+        return result['total'] if result else 0
+
+    async def get_page(self, section: str, language: str, after_display_id: int = 0,
+                       limit: int = 10) -> Tuple[Tuple[Dict[str, Any], ...], int]:
+        """``after_display_id`` dan keyingi ``limit`` ta elementni va bo'limdagi umumiy sonni qaytaradi."""
+        if section not in SECTION_TABLES:
+            raise ValueError(f"Invalid section: {section}")
+        if language not in ['uz', 'ru', 'es']:
+            raise ValueError(f"Invalid language code: {language}")
+        return await self.catalog.get_page(section, language, after_display_id, limit)
+
+    async def get_question_by_id(self, question_id: int, language: str = None) -> Optional[Question]:
         """Savolni ID bo'yicha qaytaradi, til ixtiyoriy."""
         if language and language not in ['uz', 'ru', 'es']:
             raise ValueError(f"Invalid language code: {language}")
         if language:
             sql = "SELECT id, display_id, question, answer, audio_file_id, language FROM Questions WHERE id = ? AND language = ?"
-            result = self.execute(sql, parameters=(question_id, language), fetchone=True)
+            result = await self.execute_async(sql, parameters=(question_id, language), fetchone=True, row_factory=QUESTION_ROWS)
         else:
             sql = "SELECT id, display_id, question, answer, audio_file_id, language FROM Questions WHERE id = ?"
-            result = self.execute(sql, parameters=(question_id,), fetchone=True)
+            result = await self.execute_async(sql, parameters=(question_id,), fetchone=True, row_factory=QUESTION_ROWS)
         logging.info(f"Question qidirildi: question_id={question_id}, language={language}, found={bool(result)}")
         return result
 
-    async def get_road_sign_by_id(self, sign_id: int, language: str = None) -> Optional[Dict[str, Any]]:
+    async def get_road_sign_by_id(self, sign_id: int, language: str = None) -> Optional[RoadSign]:
         """Yo'l belgisini ID bo'yicha qaytaradi, til ixtiyoriy."""
         if language and language not in ['uz', 'ru', 'es']:
             raise ValueError(f"Invalid language code: {language}")
         if language:
             sql = "SELECT id, display_id, image_file_id, description, language FROM RoadSigns WHERE id = ? AND language = ?"
-            result = self.execute(sql, parameters=(sign_id, language), fetchone=True)
+            result = await self.execute_async(sql, parameters=(sign_id, language), fetchone=True, row_factory=ROAD_SIGN_ROWS)
         else:
             sql = "SELECT id, display_id, image_file_id, description, language FROM RoadSigns WHERE id = ?"
-            result = self.execute(sql, parameters=(sign_id,), fetchone=True)
+            result = await self.execute_async(sql, parameters=(sign_id,), fetchone=True, row_factory=ROAD_SIGN_ROWS)
         logging.info(f"Road sign qidirildi: sign_id={sign_id}, language={language}, found={bool(result)}")
         return result
 
-    async def get_truck_part_by_id(self, part_id: int, language: str = None) -> Optional[Dict[str, Any]]:
+    async def get_truck_part_by_id(self, part_id: int, language: str = None) -> Optional[TruckPart]:
         """Yuk mashinasi qismini ID bo'yicha qaytaradi, til ixtiyoriy."""
         if language and language not in ['uz', 'ru', 'es']:
             raise ValueError(f"Invalid language code: {language}")
         if language:
             sql = "SELECT id, display_id, image_file_id, description, language FROM TruckParts WHERE id = ? AND language = ?"
-            result = self.execute(sql, parameters=(part_id, language), fetchone=True)
+            result = await self.execute_async(sql, parameters=(part_id, language), fetchone=True, row_factory=TRUCK_PART_ROWS)
         else:
             sql = "SELECT id, display_id, image_file_id, description, language FROM TruckParts WHERE id = ?"
-            result = self.execute(sql, parameters=(part_id,), fetchone=True)
+            result = await self.execute_async(sql, parameters=(part_id,), fetchone=True, row_factory=TRUCK_PART_ROWS)
         logging.info(f"Truck part qidirildi: part_id={part_id}, language={language}, found={bool(result)}")
         return result
 
     async def delete_question(self, question_id: int) -> None:
         """Savolni o'chiradi va shu tildagi display_id larni qayta indekslaydi."""
-        question = await self.get_question_by_id(question_id)
-        if question:
-            language = question['language']
-            sql = "DELETE FROM Questions WHERE id = ?"
-            self.execute(sql, parameters=(question_id,), commit=True)
-            await self._reindex_display_ids("Questions", language)
+        language = await self._delete_item("Questions", question_id)
+        if language:
+            self.catalog.invalidate("question", language)
             logging.info(f"Savol o'chirildi: question_id={question_id}, language={language}")
 
     async def delete_road_sign(self, sign_id: int) -> None:
         """Yo'l belgisini o'chiradi va shu tildagi display_id larni qayta indekslaydi."""
-        road_sign = await self.get_road_sign_by_id(sign_id)
-        if road_sign:
-            language = road_sign['language']
-            sql = "DELETE FROM RoadSigns WHERE id = ?"
-            self.execute(sql, parameters=(sign_id,), commit=True)
-            await self._reindex_display_ids("RoadSigns", language)
+        language = await self._delete_item("RoadSigns", sign_id)
+        if language:
+            self.catalog.invalidate("road_sign", language)
             logging.info(f"Yo'l belgisi o'chirildi: sign_id={sign_id}, language={language}")
 
     async def delete_truck_part(self, part_id: int) -> None:
         """Yuk mashinasi qismini o'chiradi va shu tildagi display_id larni qayta indekslaydi."""
-        truck_part = await self.get_truck_part_by_id(part_id)
-        if truck_part:
-            language = truck_part['language']
-            sql = "DELETE FROM TruckParts WHERE id = ?"
-            self.execute(sql, parameters=(part_id,), commit=True)
-            await self._reindex_display_ids("TruckParts", language)
+        language = await self._delete_item("TruckParts", part_id)
+        if language:
+            self.catalog.invalidate("truck_part", language)
             logging.info(f"Truck zapchasti o'chirildi: part_id={part_id}, language={language}")
 
     # Qo'shimcha metodlar - til bo'yicha statistika
     async def get_question_count_by_language(self, language: str) -> int:
         """Til bo'yicha savollar sonini qaytaradi."""
-        sql = "SELECT COUNT(*) as count FROM Questions WHERE language = ?"
-        result = self.execute(sql, parameters=(language,), fetchone=True)
-        return result['count'] if result else 0
+        return await self._load_count("question", language)
 
     async def get_road_sign_count_by_language(self, language: str) -> int:
         """Til bo'yicha yo'l belgilari sonini qaytaradi."""
-        sql = "SELECT COUNT(*) as count FROM RoadSigns WHERE language = ?"
-        result = self.execute(sql, parameters=(language,), fetchone=True)
-        return result['count'] if result else 0
+        return await self._load_count("road_sign", language)
 
     async def get_truck_part_count_by_language(self, language: str) -> int:
         """Til bo'yicha yuk mashinasi qismlari sonini qaytaradi."""
-        sql = "SELECT COUNT(*) as count FROM TruckParts WHERE language = ?"
-        result = self.execute(sql, parameters=(language,), fetchone=True)
-        return result['count'] if result else 0
\ No newline at end of file
+        return await self._load_count("truck_part", language)
\ No newline at end of file
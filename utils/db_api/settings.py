@@ -0,0 +1,119 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set
+
+from .changes import CHANGES_TABLE, change_trigger
+from .database import Database
+from .migrations import Migration, migrate
+
+SETTINGS_MIGRATIONS = [
+    Migration(1, "Settings jadvali", [
+        """
+        CREATE TABLE IF NOT EXISTS Settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at DATETIME NOT NULL
+        )
+        """,
+    ]),
+    Migration(2, "Changes jurnali va Settings o'zgarish triggerlari", [
+        CHANGES_TABLE,
+        change_trigger("settings_change_insert", "Settings", "INSERT", "setting", ["NEW.key"]),
+        change_trigger("settings_change_update", "Settings", "UPDATE", "setting", ["NEW.key"]),
+    ]),
+]
+
+
+class SettingsDatabase(Database):
+    """Ish vaqtida o'zgaradigan sozlamalar (to'lov summasi, karta ma'lumotlari).
+
+    Qiymatlar ``Settings`` jadvalida JSON ko'rinishida saqlanadi va xotiradagi
+    nusxadan O(1) o'qiladi. ``set_value`` bazaga yozadi va obunachilarni darhol
+    xabardor qiladi, shuning uchun davriy tekshiruv yoki modulni qayta yuklash
+    kerak emas.
+    """
+
+    def __init__(self, path_to_db: str, defaults: Optional[Mapping[str, Any]] = None):
+        super().__init__(path_to_db)
+        self.defaults = dict(defaults or {})
+        self._values: Dict[str, Any] = dict(self.defaults)
+        self._subscribers: List[Callable[["SettingsDatabase"], None]] = []
+        # Boshqa jarayon o'zgartirgan kalitlar shu yerda to'planib, bitta vazifa bilan qayta o'qiladi
+        self._stale: Set[str] = set()
+        self._reload_task: Optional[asyncio.Task] = None
+        logging.info(f"SettingsDatabase initialized with path: {path_to_db}")
+
+    async def migrate(self) -> int:
+        """Settings bazasi sxemasini oxirgi versiyagacha yangilaydi."""
+        return await migrate(self.path_to_db, SETTINGS_MIGRATIONS)
+
+    async def seed_defaults(self) -> int:
+        """Bazada yo'q kalitlar uchun standart qiymatlarni yozadi (ishga tushishda bir marta)."""
+        updated_at = datetime.now().isoformat()
+        return await self.executemany_async(
+            "INSERT OR IGNORE INTO Settings (key, value, updated_at) VALUES (?, ?, ?)",
+            [(key, json.dumps(value, ensure_ascii=False), updated_at) for key, value in self.defaults.items()])
+
+    async def load(self) -> Dict[str, Any]:
+        """Sozlamalarni bazadan o'qiydi (yo'q kalitlar standart qiymatda qoladi)."""
+        rows = await self.execute_async("SELECT key, value FROM Settings", fetchall=True)
+        self._values = {**self.defaults, **{key: json.loads(value) for key, value in rows}}
+        logging.info(f"Sozlamalar yuklandi: keys={sorted(self._values)}")
+        self._notify()
+        return self.snapshot()
+
+    def on_change(self, scope: str, key: str) -> None:
+        """Boshqa jarayon (admin worker'i) yozgan sozlamani qayta o'qishga belgilaydi (ChangeWatcher)."""
+        if scope != "setting":
+            return
+        self._stale.add(key)
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(self._reload_stale())
+
+    async def _reload_stale(self) -> None:
+        """Belgilangan kalitlarni bazadan o'qiydi va obunachilarga bir marta xabar beradi."""
+        while self._stale:
+            keys, self._stale = self._stale, set()
+            try:
+                rows = await self.execute_async(
+                    "SELECT key, value FROM Settings WHERE key IN (SELECT value FROM json_each(?))",
+                    (json.dumps(sorted(keys)),), fetchall=True)
+            except Exception as e:
+                logging.error(f"Sozlamalarni qayta o'qishda xatolik: keys={sorted(keys)}, error={e}")
+                return
+            self._values.update({key: json.loads(value) for key, value in rows})
+            logging.info(f"Sozlamalar yangilandi (boshqa jarayon): keys={sorted(keys)}")
+        self._notify()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Sozlama qiymatini xotiradan qaytaradi."""
+        return self._values.get(key, default)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Barcha sozlamalar nusxasini qaytaradi."""
+        return dict(self._values)
+
+    async def set_value(self, key: str, value: Any) -> None:
+        """Sozlamani bazaga yozadi va obunachilarga xabar beradi."""
+        await self.execute_async(
+            """
+            INSERT INTO Settings (key, value, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """,
+            (key, json.dumps(value, ensure_ascii=False), datetime.now().isoformat()), commit=True)
+        self._values[key] = value
+        logging.info(f"Sozlama yangilandi: {key}={value!r}")
+        self._notify()
+
+    def subscribe(self, callback: Callable[["SettingsDatabase"], None]) -> None:
+        """Sozlamalar o'zgarganda chaqiriladigan funksiyani ro'yxatdan o'tkazadi."""
+        self._subscribers.append(callback)
+
+    def _notify(self) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(self)
+            except Exception as e:
+                logging.error(f"Sozlamalar obunachisida xatolik: {e}")
@@ -1,105 +1,209 @@
 
+import asyncio
+import itertools
+import json
 import sqlite3
 from datetime import datetime, timedelta
 import pytz
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable, Callable
 from aiogram import Dispatcher
 import logging
 
 from data.config import ADMINS
+from .cache import LRUCache
+from .changes import CHANGES_TABLE, change_trigger
+from .database import Database, dict_rows
+from .migrations import Migration, migrate, table_columns
+from .records import User, record_factory
 
+USER_ROWS = record_factory(User)
 
-class UserDatabase:
-    def __init__(self, path_to_db: str):
-        self.path_to_db = path_to_db
-        self.uzbekistan_tz = pytz.timezone("Asia/Tashkent")
-        logging.info(f"UserDatabase initialized with path: {path_to_db}")
 
-    def execute(self, sql: str, parameters: tuple = (), fetchone: bool = False, fetchall: bool = False, commit: bool = False) -> Optional[List[Dict[str, Any]]]:
-        """Execute a SQL query with the given parameters."""
-        try:
-            with sqlite3.connect(self.path_to_db) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(sql, parameters)
-                if commit:
-                    conn.commit()
-                if fetchone:
-                    result = cursor.fetchone()
-                    return dict(result) if result else None
-                if fetchall:
-                    result = cursor.fetchall()
-                    return [dict(row) for row in result] if result else []
-                return None
-        except Exception as e:
-            logging.error(f"SQL error: {e}, query: {sql}")
-            raise
+def _add_language_column(conn: sqlite3.Connection) -> None:
+    """Eski bazalarda Users.language ustunini qo'shadi."""
+    if "language" not in table_columns(conn, "Users"):
+        conn.execute("ALTER TABLE Users ADD COLUMN language VARCHAR(10) NOT NULL DEFAULT 'uz'")
+
 
-    async def create_table_users(self) -> None:
-        """Foydalanuvchilar jadvalini yaratadi."""
-        sql = """
-            CREATE TABLE IF NOT EXISTS Users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                telegram_id BIGINT NOT NULL UNIQUE,
-                username VARCHAR(255),
-                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                last_active DATETIME,
-                is_admin BOOLEAN NOT NULL DEFAULT 0,
-                is_allowed BOOLEAN NOT NULL DEFAULT 0,
-                language VARCHAR(10) NOT NULL DEFAULT 'uz'
-            );
+USER_MIGRATIONS = [
+    Migration(1, "Users jadvali", [
         """
-        self.execute(sql, commit=True)
-        logging.info("Users table created or already exists.")
+        CREATE TABLE IF NOT EXISTS Users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            telegram_id BIGINT NOT NULL UNIQUE,
+            username VARCHAR(255),
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            last_active DATETIME,
+            is_admin BOOLEAN NOT NULL DEFAULT 0,
+            is_allowed BOOLEAN NOT NULL DEFAULT 0,
+            language VARCHAR(10) NOT NULL DEFAULT 'uz'
+        )
+        """,
+    ]),
+    Migration(2, "Users.language ustuni", _add_language_column),
+    Migration(3, "Users faollik va ro'yxatdan o'tish sanasi indekslari", [
+        "CREATE INDEX IF NOT EXISTS idx_users_last_active ON Users (last_active)",
+        "CREATE INDEX IF NOT EXISTS idx_users_created_at ON Users (created_at)",
+    ]),
+    Migration(4, "UserCounts hisoblagichi va triggerlar", [
+        """
+        CREATE TABLE IF NOT EXISTS UserCounts (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS users_count_insert AFTER INSERT ON Users
+        BEGIN
+            UPDATE UserCounts SET total = total + 1 WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS users_count_delete AFTER DELETE ON Users
+        BEGIN
+            UPDATE UserCounts SET total = total - 1 WHERE id = 1;
+        END
+        """,
+        # Mavjud foydalanuvchilar uchun hisoblagichni bir marta to'ldirish
+        "INSERT OR REPLACE INTO UserCounts (id, total) SELECT 1, COUNT(*) FROM Users",
+    ]),
+    # Boshqa worker jarayonlaridagi profil keshlari shu jurnal orqali bekor qilinadi
+    Migration(5, "Changes jurnali va Users o'zgarish triggerlari", [
+        CHANGES_TABLE,
+        change_trigger("users_change_update", "Users", "UPDATE OF is_allowed, is_admin, language, username",
+                       "user", ["NEW.telegram_id"]),
+        change_trigger("users_change_delete", "Users", "DELETE", "user", ["OLD.telegram_id"]),
+    ]),
+]
+
+
+class UserDatabase(Database):
+    row_factory = staticmethod(dict_rows)
+
+    def __init__(self, path_to_db: str, cache_size: int = 10000, cache_ttl: float = 300.0):
+        super().__init__(path_to_db)
+        self.uzbekistan_tz = pytz.timezone("Asia/Tashkent")
+        # Foydalanuvchi profillari keshi (language, is_allowed, is_admin va h.k.)
+        self._profiles = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        # Profil avlodlari: har invalidatsiya/yozuvda kalitga yangi raqam beriladi. Bazadan o'qish
+        # tugaguncha avlod o'zgargan bo'lsa, eski qator keshga yozilmaydi (SectionCatalog kabi)
+        self._profile_versions = LRUCache(maxsize=cache_size, ttl=None)
+        self._profile_version_counter = itertools.count(1)
+        # sharded rejimida: ruxsat/admin o'zgarganda foydalanuvchi worker'idagi keshni bekor qiladi
+        self.on_access_change: Optional[Callable[[int], Awaitable[None]]] = None
+        # update_last_active yozuvlari shu yerda to'planib, davriy ravishda bitta tranzaksiyada yoziladi
+        self._last_active_buffer: Dict[int, str] = {}
+        self._last_active_flushing: Dict[int, str] = {}
+        self._last_active_task: Optional[asyncio.Task] = None
+        # Yangi foydalanuvchilar (telegram_id, username, is_admin) adminlarga davriy digest bilan yuboriladi
+        self._signups: List[tuple] = []
+        # sharded rejimida ro'yxatdan o'tishlar worker'larda bo'ladi: ular buferlanmaydi, front esa
+        # digestni bazadan (_signup_mark dan keyingi Users.id lar) yig'adi
+        self.buffer_signups = True
+        self._signup_mark: Optional[int] = None
+        self._signup_task: Optional[asyncio.Task] = None
+        logging.info(f"UserDatabase initialized with path: {path_to_db}")
+
+    async def migrate(self) -> int:
+        """Users bazasi sxemasini oxirgi versiyagacha yangilaydi."""
+        return await migrate(self.path_to_db, USER_MIGRATIONS)
 
     async def add_user(self, telegram_id: int, username: Optional[str] = None, dispatcher: Optional[Dispatcher] = None) -> None:
-        """Foydalanuvchi qo‘shadi va adminlarga xabar yuboradi."""
+        """Foydalanuvchi qo‘shadi; ``dispatcher`` berilsa, u adminlar uchun digestga qo'shiladi."""
         try:
             created_at = self._get_current_time().isoformat()
             username = username or "Unknown"
-            is_admin = 1 if str(telegram_id) in ADMINS else 0
+            is_admin = 1 if int(telegram_id) in ADMINS else 0
             sql = """
-                INSERT OR IGNORE INTO Users (telegram_id, username, created_at, is_allowed, is_admin, language)
+                INSERT INTO Users (telegram_id, username, created_at, is_allowed, is_admin, language)
                 VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (telegram_id) DO NOTHING
+                RETURNING id
             """
-            self.execute(sql, parameters=(telegram_id, username, created_at, 0, is_admin, 'uz'), commit=True)
+            inserted = await self.execute_async(sql, parameters=(telegram_id, username, created_at, 0, is_admin, 'uz'),
+                                                fetchone=True, commit=True)
+            self._invalidate_profile(telegram_id)
+            if not inserted:
+                logging.info(f"User already exists: telegram_id={telegram_id}")
+                return
             logging.info(f"User added: telegram_id={telegram_id}, username={username}, is_admin={is_admin}")
 
-            total_users = await self.count_users()
-            if dispatcher:
-                from utils.notify_admins import on_startup_notify  # Import here to avoid circular import
-                message = (
-                    f"Yangi foydalanuvchi qo'shildi!\n"
-                    f"ID: {telegram_id}\n"
-                    f"Username: {username}\n"
-                    f"Jami foydalanuvchilar: {total_users}\n"
-                    f"Ruxsat: {'Berilmagan' if not await self.check_if_allowed(telegram_id) else 'Berilgan'}\n"
-                    f"Admin: {'Ha' if is_admin else 'Yo‘q'}"
-                )
-                await on_startup_notify(dispatcher, message=message)
-                logging.info(f"Notification sent to admins: {message}")
+            if dispatcher and self.buffer_signups:
+                # Adminlarga har bir ro'yxatdan o'tish uchun emas, davriy digestda xabar beriladi
+                self._signups.append((telegram_id, username, is_admin))
         except Exception as e:
             logging.error(f"Error adding user: telegram_id={telegram_id}, error={e}")
             raise
 
-    async def select_all_users(self) -> List[Dict[str, Any]]:
+    async def select_all_users(self) -> List[User]:
         """Barcha foydalanuvchilarni qaytaradi."""
         sql = "SELECT * FROM Users"
-        result = self.execute(sql, fetchall=True)
+        result = await self.execute_async(sql, fetchall=True, row_factory=USER_ROWS)
         return result
 
     async def count_users(self) -> int:
-        """Foydalanuvchilar sonini qaytaradi."""
-        sql = "SELECT COUNT(*) FROM Users"
-        result = self.execute(sql, fetchone=True)
-        return result['COUNT(*)'] if result else 0
+        """Foydalanuvchilar sonini triggerlar yuritadigan hisoblagichdan qaytaradi."""
+        sql = "SELECT total FROM UserCounts WHERE id = 1"
+        result = await self.execute_async(sql, fetchone=True)
+        return result['total'] if result else 0
+
+    async def _get_profile(self, telegram_id: int) -> Optional[User]:
+        """Foydalanuvchi profilini keshdan, bo'lmasa bazadan oladi."""
+        profile = self._profiles.get(telegram_id)
+        if profile is None:
+            version = self._profile_versions.peek(telegram_id)
+            sql = "SELECT * FROM Users WHERE telegram_id = ?"
+            profile = await self.execute_async(sql, parameters=(telegram_id,), fetchone=True, row_factory=USER_ROWS)
+            # O'qish paytida yozuv yoki invalidatsiya bo'lgan bo'lsa, qator eskirgan bo'lishi mumkin
+            if profile and self._profile_versions.peek(telegram_id) == version:
+                self._profiles.set(telegram_id, profile)
+        return profile
+
+    def _bump_profile_version(self, telegram_id: int) -> None:
+        """Kalit avlodini oshiradi: jarayondagi o'qishlar natijasi keshga yozilmaydi."""
+        self._profile_versions.set(telegram_id, next(self._profile_version_counter))
+
+    def _invalidate_profile(self, telegram_id: int) -> None:
+        """Profilni keshdan chiqaradi va avlodini oshiradi."""
+        self._bump_profile_version(telegram_id)
+        self._profiles.pop(telegram_id)
+
+    def _update_cached_profile(self, telegram_id: int, **fields: Any) -> None:
+        """Keshdagi profil maydonlarini yozuv bilan bir vaqtda yangilaydi."""
+        self._bump_profile_version(telegram_id)
+        profile = self._profiles.peek(telegram_id)
+        if profile is not None:
+            self._profiles.set(telegram_id, profile._replace(**fields))
+
+    async def _notify_access_change(self, telegram_id: int) -> None:
+        """Ruxsat o'zgarishini boshqa jarayondagi keshga yetkazadi (javob yuborilishidan oldin)."""
+        if self.on_access_change is None:
+            return
+        try:
+            await self.on_access_change(telegram_id)
+        except Exception as e:
+            logging.error(f"Error notifying access change: telegram_id={telegram_id}, error={e}")
+
+    def on_change(self, scope: str, key: str) -> None:
+        """Boshqa jarayon o'zgartirgan profilni keshdan olib tashlaydi (ChangeWatcher)."""
+        if scope == "user":
+            self._invalidate_profile(int(key))
 
-    async def select_user(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+    def cache_stats(self) -> Dict[str, Any]:
+        """Profil keshining hit/miss statistikasini qaytaradi."""
+        return self._profiles.stats()
+
+    async def select_user(self, telegram_id: int) -> Optional[User]:
         """Telegram ID bo‘yicha foydalanuvchini qaytaradi."""
         try:
-            sql = "SELECT * FROM Users WHERE telegram_id = ?"
-            result = self.execute(sql, parameters=(telegram_id,), fetchone=True)
-            return result
+            profile = await self._get_profile(telegram_id)
+            if not profile:
+                return None
+            # Hali yozilmagan so'nggi faollik vaqtini hisobga olish
+            last_active = self._pending_last_active().get(telegram_id)
+            if last_active:
+                return profile._replace(last_active=last_active)
+            return profile
         except Exception as e:
             logging.error(f"Error selecting user: telegram_id={telegram_id}, error={e}")
             return None
@@ -110,7 +214,7 @@ class UserDatabase:
         today_start = self._get_start_of_day(now)
         tomorrow_start = today_start + timedelta(days=1)
         sql = "SELECT COUNT(*) FROM Users WHERE created_at >= ? AND created_at < ?"
-        result = self.execute(sql, parameters=(today_start.isoformat(), tomorrow_start.isoformat()), fetchone=True)
+        result = await self.execute_async(sql, parameters=(today_start.isoformat(), tomorrow_start.isoformat()), fetchone=True)
         return result['COUNT(*)'] if result else 0
 
     async def count_weekly_users(self) -> int:
@@ -118,7 +222,7 @@ class UserDatabase:
         now = self._get_current_time()
         one_week_ago = now - timedelta(days=7)
         sql = "SELECT COUNT(*) FROM Users WHERE created_at >= ?"
-        result = self.execute(sql, parameters=(one_week_ago.isoformat()), fetchone=True)
+        result = await self.execute_async(sql, parameters=(one_week_ago.isoformat(),), fetchone=True)
         return result['COUNT(*)'] if result else 0
 
     async def count_monthly_users(self) -> int:
@@ -126,51 +230,184 @@ class UserDatabase:
         now = self._get_current_time()
         one_month_ago = now - timedelta(days=30)
         sql = "SELECT COUNT(*) FROM Users WHERE created_at >= ?"
-        result = self.execute(sql, parameters=(one_month_ago.isoformat()), fetchone=True)
+        result = await self.execute_async(sql, parameters=(one_month_ago.isoformat(),), fetchone=True)
         return result['COUNT(*)'] if result else 0
 
     async def update_last_active(self, telegram_id: int) -> None:
-        """Foydalanuvchining so‘nggi faollik vaqtini yangilaydi."""
+        """Foydalanuvchining so‘nggi faollik vaqtini buferga yozadi (keyinroq bazaga yoziladi)."""
+        last_active = self._get_current_time().isoformat()
+        self._last_active_buffer[telegram_id] = last_active
+        logging.debug(f"Last active buffered: telegram_id={telegram_id}, last_active={last_active}")
+
+    def _pending_last_active(self) -> Dict[int, str]:
+        """Bazaga hali yozilmagan so'nggi faollik vaqtlarini qaytaradi."""
+        if not self._last_active_flushing:
+            return self._last_active_buffer
+        return {**self._last_active_flushing, **self._last_active_buffer}
+
+    async def flush_last_active(self) -> int:
+        """Buferdagi so'nggi faollik vaqtlarini bitta executemany tranzaksiyasida yozadi."""
+        if not self._last_active_buffer:
+            return 0
+        pending, self._last_active_buffer = self._last_active_buffer, {}
+        self._last_active_flushing = pending
         try:
-            last_active = self._get_current_time().isoformat()
             sql = "UPDATE Users SET last_active = ? WHERE telegram_id = ?"
-            self.execute(sql, parameters=(last_active, telegram_id), commit=True)
-            logging.info(f"Last active updated: telegram_id={telegram_id}, last_active={last_active}")
+            rows = [(last_active, telegram_id) for telegram_id, last_active in pending.items()]
+            await self.executemany_async(sql, rows)
+            logging.info(f"Last active flushed: users={len(rows)}")
+            return len(rows)
         except Exception as e:
-            logging.error(f"Error updating last active: telegram_id={telegram_id}, error={e}")
+            # Yozilmagan qiymatlarni buferga qaytarish (yangiroq qiymatlar ustun)
+            for telegram_id, last_active in pending.items():
+                self._last_active_buffer.setdefault(telegram_id, last_active)
+            logging.error(f"Error flushing last active: users={len(pending)}, error={e}")
             raise
+        finally:
+            self._last_active_flushing = {}
+
+    async def _last_active_flush_loop(self, interval: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush_last_active()
+            except Exception:
+                pass  # xatolik flush_last_active ichida log qilingan, keyingi siklda qayta uriniladi
+
+    def start_last_active_flusher(self, interval: int) -> None:
+        """So'nggi faollik buferini davriy yozishni ishga tushiradi."""
+        if self._last_active_task and not self._last_active_task.done():
+            return
+        self._last_active_task = asyncio.create_task(self._last_active_flush_loop(interval))
+        logging.info(f"Last active flusher started: interval={interval}s")
+
+    async def stop_last_active_flusher(self) -> None:
+        """Davriy yozishni to'xtatadi va buferda qolganlarni yozadi."""
+        if self._last_active_task:
+            self._last_active_task.cancel()
+            try:
+                await self._last_active_task
+            except asyncio.CancelledError:
+                pass
+            self._last_active_task = None
+        await self.flush_last_active()
+
+    def _format_signup_digest(self, signups: List[tuple], total_users: int, limit: int = 20) -> str:
+        lines = [f"Yangi foydalanuvchilar: {len(signups)} ta"]
+        for telegram_id, username, is_admin in signups[:limit]:
+            lines.append(f"ID: {telegram_id}, Username: {username}{', Admin' if is_admin else ''}")
+        if len(signups) > limit:
+            lines.append(f"... va yana {len(signups) - limit} ta")
+        lines.append(f"Jami foydalanuvchilar: {total_users}")
+        return "\n".join(lines)
+
+    async def track_signups(self) -> None:
+        """Digestni bazadan yig'ishga o'tadi: bundan keyin qo'shilgan foydalanuvchilar
+        (boshqa jarayonlar yozganlari ham) keyingi digestga kiradi."""
+        result = await self.execute_async("SELECT COALESCE(MAX(id), 0) AS last_id FROM Users", fetchone=True)
+        self._signup_mark = result['last_id']
+        self.buffer_signups = False
+        logging.info(f"Signup digest bazadan yig'iladi: after_id={self._signup_mark}")
+
+    async def _new_signups(self) -> List[tuple]:
+        """``_signup_mark`` dan keyin qo'shilgan foydalanuvchilarni qaytaradi va belgini suradi."""
+        sql = "SELECT id, telegram_id, username, is_admin FROM Users WHERE id > ? ORDER BY id"
+        rows = await self.execute_async(sql, parameters=(self._signup_mark,), fetchall=True)
+        if rows:
+            self._signup_mark = rows[-1]['id']
+        return [(row['telegram_id'], row['username'], row['is_admin']) for row in rows]
+
+    async def flush_signup_digest(self, dispatcher: Dispatcher) -> int:
+        """To'plangan yangi foydalanuvchilar haqida adminlarga bitta xabar yuboradi."""
+        signups, self._signups = self._signups, []
+        if self._signup_mark is not None:
+            signups += await self._new_signups()
+        if not signups:
+            return 0
+        from utils.misc.broadcast import broadcaster  # Import here to avoid circular import
+        message = self._format_signup_digest(signups, await self.count_users())
+        await broadcaster.send(ADMINS, lambda admin: dispatcher.bot.send_message(admin, message), bulk=True)
+        logging.info(f"Signup digest sent: users={len(signups)}")
+        return len(signups)
+
+    async def _signup_digest_loop(self, dispatcher: Dispatcher, interval: int) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush_signup_digest(dispatcher)
+            except Exception as e:
+                logging.error(f"Error sending signup digest: {e}")
+
+    def start_signup_digest(self, dispatcher: Dispatcher, interval: int) -> None:
+        """Yangi foydalanuvchilar digestini davriy yuborishni ishga tushiradi."""
+        if self._signup_task and not self._signup_task.done():
+            return
+        self._signup_task = asyncio.create_task(self._signup_digest_loop(dispatcher, interval))
+        logging.info(f"Signup digest started: interval={interval}s")
+
+    async def stop_signup_digest(self, dispatcher: Dispatcher) -> None:
+        """Digestni to'xtatadi va to'planganlarini yuboradi."""
+        if self._signup_task:
+            self._signup_task.cancel()
+            try:
+                await self._signup_task
+            except asyncio.CancelledError:
+                pass
+            self._signup_task = None
+        await self.flush_signup_digest(dispatcher)
+
+    async def _count_active_between(self, start: datetime, end: Optional[datetime] = None) -> int:
+        """[start, end) oralig'ida faol bo'lgan foydalanuvchilar sonini bufer bilan birga hisoblaydi."""
+        start_iso = start.isoformat()
+        end_iso = end.isoformat() if end else None
+        range_sql = "last_active >= :start" + (" AND last_active < :end" if end_iso else "")
+        pending = self._pending_last_active()
+        if not pending:
+            sql = f"SELECT COUNT(*) FROM Users WHERE {range_sql}"
+            result = await self.execute_async(sql, parameters={"start": start_iso, "end": end_iso}, fetchone=True)
+            return result['COUNT(*)'] if result else 0
+
+        # Buferdagi foydalanuvchilar uchun bazadagi eski qiymat emas, buferdagi qiymat hisoblanadi
+        pending_in_range = [
+            telegram_id for telegram_id, last_active in pending.items()
+            if last_active >= start_iso and (end_iso is None or last_active < end_iso)
+        ]
+        sql = f"""
+            SELECT COUNT(*) FROM Users
+            WHERE telegram_id IN (SELECT value FROM json_each(:in_range))
+               OR ({range_sql} AND telegram_id NOT IN (SELECT value FROM json_each(:pending)))
+        """
+        parameters = {
+            "start": start_iso,
+            "end": end_iso,
+            "in_range": json.dumps(pending_in_range),
+            "pending": json.dumps(list(pending)),
+        }
+        result = await self.execute_async(sql, parameters=parameters, fetchone=True)
+        return result['COUNT(*)'] if result else 0
 
     async def count_active_daily_users(self) -> int:
         """Kunlik faol foydalanuvchilar sonini qaytaradi."""
         now = self._get_current_time()
         today_start = self._get_start_of_day(now)
         tomorrow_start = today_start + timedelta(days=1)
-        sql = "SELECT COUNT(*) FROM Users WHERE last_active >= ? AND last_active < ?"
-        result = self.execute(sql, parameters=(today_start.isoformat(), tomorrow_start.isoformat()), fetchone=True)
-        return result['COUNT(*)'] if result else 0
+        return await self._count_active_between(today_start, tomorrow_start)
 
     async def count_active_weekly_users(self) -> int:
         """Haftalik faol foydalanuvchilar sonini qaytaradi."""
         now = self._get_current_time()
-        one_week_ago = now - timedelta(days=7)
-        sql = "SELECT COUNT(*) FROM Users WHERE last_active >= ?"
-        result = self.execute(sql, parameters=(one_week_ago.isoformat()), fetchone=True)
-        return result['COUNT(*)'] if result else 0
+        return await self._count_active_between(now - timedelta(days=7))
 
-    async def count_monthly_users(self) -> int:
+    async def count_active_monthly_users(self) -> int:
         """Oylik faol foydalanuvchilar sonini qaytaradi."""
         now = self._get_current_time()
-        one_month_ago = now - timedelta(days=30)
-        sql = "SELECT COUNT(*) FROM Users WHERE last_active >= ?"
-        result = self.execute(sql, parameters=(one_month_ago.isoformat()), fetchone=True)
-        return result['COUNT(*)'] if result else 0
+        return await self._count_active_between(now - timedelta(days=30))
 
     async def check_if_admin(self, telegram_id: int) -> bool:
         """Foydalanuvchi admin ekanligini tekshiradi."""
         try:
-            sql = "SELECT is_admin FROM Users WHERE telegram_id = ?"
-            result = self.execute(sql, parameters=(telegram_id,), fetchone=True)
-            return bool(result and result['is_admin'])
+            profile = await self._get_profile(telegram_id)
+            return bool(profile and profile['is_admin'])
         except Exception as e:
             logging.error(f"Error checking admin status: telegram_id={telegram_id}, error={e}")
             return False
@@ -178,9 +415,8 @@ class UserDatabase:
     async def check_if_allowed(self, telegram_id: int) -> bool:
         """Foydalanuvchi ruxsatga ega ekanligini tekshiradi."""
         try:
-            sql = "SELECT is_allowed FROM Users WHERE telegram_id = ?"
-            result = self.execute(sql, parameters=(telegram_id,), fetchone=True)
-            return bool(result and result['is_allowed'])
+            profile = await self._get_profile(telegram_id)
+            return bool(profile and profile['is_allowed'])
         except Exception as e:
             logging.error(f"Error checking permission: telegram_id={telegram_id}, error={e}")
             return False
@@ -189,17 +425,25 @@ class UserDatabase:
         """Foydalanuvchi ruxsatini yangilaydi."""
         try:
             sql = "UPDATE Users SET is_allowed = ? WHERE telegram_id = ?"
-            self.execute(sql, parameters=(int(is_allowed), telegram_id), commit=True)
+            await self.execute_async(sql, parameters=(int(is_allowed), telegram_id), commit=True)
+            self._update_cached_profile(telegram_id, is_allowed=int(is_allowed))
+            await self._notify_access_change(telegram_id)
             logging.info(f"Permission updated: telegram_id={telegram_id}, is_allowed={is_allowed}")
         except Exception as e:
             logging.error(f"Error updating permission: telegram_id={telegram_id}, error={e}")
             raise
 
+    async def update_user_access(self, telegram_id: int, is_allowed: bool) -> None:
+        """Foydalanuvchi ruxsatini yangilaydi (update_user_permission bilan bir xil)."""
+        await self.update_user_permission(telegram_id=telegram_id, is_allowed=is_allowed)
+
     async def set_admin(self, telegram_id: int) -> None:
         """Foydalanuvchini admin qiladi."""
         try:
             sql = "UPDATE Users SET is_admin = 1 WHERE telegram_id = ?"
-            self.execute(sql, parameters=(telegram_id,), commit=True)
+            await self.execute_async(sql, parameters=(telegram_id,), commit=True)
+            self._update_cached_profile(telegram_id, is_admin=1)
+            await self._notify_access_change(telegram_id)
             logging.info(f"User set as admin: telegram_id={telegram_id}")
         except Exception as e:
             logging.error(f"Error setting admin: telegram_id={telegram_id}, error={e}")
@@ -211,7 +455,8 @@ class UserDatabase:
             raise ValueError(f"Invalid language code: {language}")
         try:
             sql = "UPDATE Users SET language = ? WHERE telegram_id = ?"
-            self.execute(sql, parameters=(language, telegram_id), commit=True)
+            await self.execute_async(sql, parameters=(language, telegram_id), commit=True)
+            self._update_cached_profile(telegram_id, language=language)
             logging.info(f"Language updated: telegram_id={telegram_id}, language={language}")
         except Exception as e:
             logging.error(f"Error updating language: telegram_id={telegram_id}, error={e}")
@@ -220,9 +465,8 @@ class UserDatabase:
     async def get_user_language(self, telegram_id: int) -> str:
         """Foydalanuvchi tilini qaytaradi."""
         try:
-            sql = "SELECT language FROM Users WHERE telegram_id = ?"
-            result = self.execute(sql, parameters=(telegram_id,), fetchone=True)
-            return result['language'] if result else 'uz'
+            profile = await self._get_profile(telegram_id)
+            return profile['language'] if profile else 'uz'
         except Exception as e:
             logging.error(f"Error getting language: telegram_id={telegram_id}, error={e}")
             return 'uz'
@@ -0,0 +1,96 @@
+# broadcast.py: ko'p chatlarga parallel xabar yuborish
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Optional, Set, Tuple
+
+from aiogram.utils.exceptions import RetryAfter
+
+from .outbound import PRIORITY_ADMIN, PRIORITY_BULK, priority
+
+# chat_id ni qabul qilib, bitta yuborishni bajaruvchi funksiya
+Sender = Callable[[Any], Awaitable[Any]]
+
+
+class Broadcaster:
+    """Adminlar va boshqa chatlar ro'yxatiga xabarlarni parallel yuboradi.
+
+    * bir vaqtda ishlayotgan yuborishlar soni ``concurrency`` bilan cheklanadi;
+    * tezlik cheklovlari (umumiy va chat bo'yicha) ``ScheduledBot`` ning
+      ``OutboundScheduler`` ida - bu yerda ikkinchi marta qo'llanmaydi;
+    * ``RetryAfter`` ni ``ScheduledBot`` o'zi kutib qayta yuboradi; bu yerga
+      yetib kelgani - urinishlar tugagan, yuborish muvaffaqiyatsiz;
+    * boshqa xatolikda ``fallback`` (masalan, Markdownsiz matn) bir marta sinaladi.
+
+    ``schedule`` yuborishni fon vazifasi sifatida ishga tushiradi, shuning
+    uchun foydalanuvchiga javob adminlarga yuborish tugashini kutmaydi.
+    Yuborishlar umumiy navbatda ``PRIORITY_ADMIN`` ustuvorligi bilan o'tadi,
+    ya'ni foydalanuvchi javoblaridan keyin; digest va shunga o'xshash
+    ommaviy xabarlar ``bulk=True`` bilan ``PRIORITY_BULK`` da yuboriladi.
+    """
+
+    def __init__(self, concurrency: int = 8, send_priority: int = PRIORITY_ADMIN):
+        self.send_priority = send_priority
+        self._tasks: Set[asyncio.Task] = set()
+        self.configure(concurrency)
+
+    def configure(self, concurrency: Optional[int] = None) -> None:
+        """Parallel yuborishlar sonini o'zgartiradi (berilmasa o'zgarmaydi)."""
+        if concurrency is not None:
+            self.concurrency = max(1, concurrency)
+            self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Semafor ishlayotgan event loop ichida yaratiladi
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def _deliver(self, chat_id: Any, send: Sender, fallback: Optional[Sender]) -> bool:
+        async with self.semaphore:
+            for sender in (send, fallback):
+                if sender is None:
+                    break
+                try:
+                    await sender(chat_id)
+                    return True
+                except RetryAfter as e:
+                    # ScheduledBot qayta urinishlarini tugatgan; fallback ham xuddi shu cheklovga uchraydi
+                    logging.error(f"Chat {chat_id} ga xabar yuborilmadi: RetryAfter {e.timeout}s, urinishlar tugadi")
+                    return False
+                except Exception as e:
+                    logging.error(f"Chat {chat_id} ga xabar yuborishda xatolik: {e}")
+            return False
+
+    async def send(self, chat_ids: Iterable[Any], send: Sender, fallback: Optional[Sender] = None,
+                   bulk: bool = False) -> Tuple[int, int]:
+        """Barcha chatlarga yuboradi va (yuborilgan, yuborilmagan) sonini qaytaradi.
+
+        ``bulk`` bo'lsa, yuborishlar ``PRIORITY_BULK`` bilan (admin xabarlaridan keyin) o'tadi.
+        """
+        chat_ids = list(dict.fromkeys(chat_ids))
+        with priority(PRIORITY_BULK if bulk else self.send_priority):
+            results = await asyncio.gather(*(self._deliver(chat_id, send, fallback) for chat_id in chat_ids))
+        sent = sum(results)
+        return sent, len(results) - sent
+
+    def schedule(self, chat_ids: Iterable[Any], send: Sender, fallback: Optional[Sender] = None,
+                 bulk: bool = False) -> asyncio.Task:
+        """``send`` ni fon vazifasi sifatida ishga tushiradi (javob yo'lini bloklamaydi)."""
+        task = asyncio.create_task(self.send(list(chat_ids), send, fallback, bulk=bulk))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drain(self, timeout: Optional[float] = 30.0) -> None:
+        """To'xtashdan oldin fondagi yuborishlar tugashini kutadi."""
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        logging.info(f"Broadcast navbati bo'shatildi: done={len(done)}, cancelled={len(pending)}")
+
+
+# Barcha handlerlar uchun umumiy nusxa (sozlamalar loader.py da)
+broadcaster = Broadcaster()
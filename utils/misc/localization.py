@@ -0,0 +1,94 @@
+# localization.py: bir marta kompilyatsiya qilinadigan lokalizatsiya katalogi
+import logging
+from string import Formatter
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+
+def _placeholders(template: str) -> Set[str]:
+    """Shablondagi {nom} maydonlarini qaytaradi ({{ va }} oddiy qavs hisoblanadi)."""
+    return {field for _, field, _, _ in Formatter().parse(template) if field}
+
+
+class Localization:
+    """(til, kalit) bo'yicha O(1) qidiruvli xabarlar katalogi.
+
+    Barcha shablonlar ishga tushishda bir marta tayyorlanadi: oddiy matnlar
+    o'zgarishsiz saqlanadi, ``{amount}`` kabi maydonli shablonlar esa joriy
+    kontekst bilan to'ldiriladi. Kontekst (masalan, to'lov sozlamalari)
+    o'zgarganda faqat shu maydonlarga bog'liq shablonlar qayta yoziladi va
+    ``version`` oshadi, obunachilar (klaviatura keshi, matn router'i) xabardor
+    qilinadi.
+    """
+
+    def __init__(self, templates: Mapping[str, Mapping[str, str]], fallback: str = "uz",
+                 missing: str = "Xabar topilmadi"):
+        self.fallback = fallback
+        self.missing = missing
+        self.version = 0
+        self._context: Dict[str, Any] = {}
+        self._subscribers: List[Callable[["Localization"], None]] = []
+        # Har bir til uchun fallback tildagi kalitlar ham qo'shiladi
+        self._templates: Dict[Tuple[str, str], str] = {}
+        for language, messages in templates.items():
+            for key, template in {**templates.get(fallback, {}), **messages}.items():
+                self._templates[(language, key)] = template
+        self._dynamic: Dict[Tuple[str, str], Set[str]] = {}
+        for key, template in self._templates.items():
+            fields = _placeholders(template)
+            if fields:
+                self._dynamic[key] = fields
+        self._compiled: Dict[Tuple[str, str], str] = {}
+        self._by_language: Dict[str, Dict[str, str]] = {}
+        self._render(self._templates)
+
+    @property
+    def languages(self) -> Tuple[str, ...]:
+        return tuple(self._by_language)
+
+    def _render(self, keys) -> None:
+        for key in keys:
+            template = self._templates[key]
+            # Maydonsiz shablonda ham {{ va }} oddiy qavsga aylantiriladi
+            if key in self._dynamic or "{" in template or "}" in template:
+                try:
+                    template = template.format(**self._context)
+                except (KeyError, IndexError, ValueError):
+                    # Kontekst hali berilmagan bo'lsa, shablon o'zgarishsiz qoladi
+                    pass
+            self._compiled[key] = template
+            self._by_language.setdefault(key[0], {})[key[1]] = template
+        self.version += 1
+
+    def set_context(self, **context: Any) -> bool:
+        """Shablon kontekstini yangilaydi; o'zgargan maydonlarga bog'liq xabarlarni qayta yozadi."""
+        changed = {name for name, value in context.items() if self._context.get(name, object()) != value}
+        if not changed:
+            return False
+        self._context.update(context)
+        self._render([key for key, fields in self._dynamic.items() if fields & changed])
+        logging.info(f"Lokalizatsiya yangilandi: fields={sorted(changed)}, version={self.version}")
+        for callback in list(self._subscribers):
+            try:
+                callback(self)
+            except Exception as e:
+                logging.error(f"Lokalizatsiya obunachisida xatolik: {e}")
+        return True
+
+    def subscribe(self, callback: Callable[["Localization"], None]) -> None:
+        """Katalog o'zgarganda chaqiriladigan funksiyani ro'yxatdan o'tkazadi."""
+        self._subscribers.append(callback)
+
+    def get(self, language: str, key: str) -> str:
+        """Xabarni qaytaradi: avval so'ralgan til, keyin fallback til."""
+        message = self._compiled.get((language, key))
+        if message is None:
+            message = self._compiled.get((self.fallback, key), self.missing)
+        return message
+
+    def messages(self, language: Optional[str] = None) -> Dict[str, str]:
+        """Bitta tilning (yoki fallback tilning) tayyor xabarlar lug'atini qaytaradi."""
+        return self._by_language.get(language) or self._by_language.get(self.fallback, {})
+
+    def all_messages(self) -> Dict[str, Dict[str, str]]:
+        """Barcha tillarning tayyor xabarlarini qaytaradi (o'zgartirmang)."""
+        return self._by_language
@@ -0,0 +1,259 @@
+# outbound.py: Telegram'ga chiquvchi xabarlar navbati (tezlik cheklovlari va ustuvorliklar)
+import asyncio
+import contextvars
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+from aiogram import Bot
+from aiogram.utils.exceptions import RetryAfter
+
+from utils.db_api.instrumentation import StatementStats
+
+# Ustuvorliklar: kichik qiymat oldin yuboriladi
+PRIORITY_USER = 0  # foydalanuvchiga javoblar
+PRIORITY_ADMIN = 5  # adminlarga bildirishnomalar, to'lov cheklari
+PRIORITY_BULK = 10  # ommaviy xabarlar, digestlar
+
+# Joriy vazifadagi yuborishlar ustuvorligi (standart: foydalanuvchi javobi)
+send_priority: contextvars.ContextVar[int] = contextvars.ContextVar("send_priority", default=PRIORITY_USER)
+
+# Chat bo'yicha cheklovlar qo'llaniladigan Bot API metodlari
+RATE_LIMITED_METHODS = frozenset({
+    "sendMessage", "sendPhoto", "sendAudio", "sendVoice", "sendDocument", "sendVideo", "sendAnimation",
+    "sendSticker", "sendMediaGroup", "sendLocation", "sendContact", "copyMessage", "forwardMessage",
+    "editMessageText", "editMessageCaption", "editMessageMedia", "editMessageReplyMarkup",
+})
+
+
+@contextmanager
+def priority(level: int):
+    """Blok ichidagi (va undan yaratilgan vazifalardagi) yuborishlar ustuvorligini o'rnatadi."""
+    token = send_priority.set(level)
+    try:
+        yield
+    finally:
+        send_priority.reset(token)
+
+
+class TokenBucket:
+    """Token bucket: ``rate`` token/soniya, ``capacity`` tagacha yig'iladi.
+
+    ``reserve`` tokenni darhol band qiladi (zarur bo'lsa qarzga) va uni
+    ishlatish mumkin bo'lguncha kutish vaqtini qaytaradi.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, now: float) -> float:
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def try_consume(self, now: float) -> bool:
+        """Token bo'lsa, uni oladi va True qaytaradi (qarzga bermaydi)."""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def block(self, now: float, seconds: float) -> None:
+        """``RetryAfter`` dan keyin kamida ``seconds`` davomida token bermaydi."""
+        self._refill(now)
+        # Keyingi reserve() aynan ``seconds`` dan keyin token beradi
+        self.tokens = min(self.tokens, 1.0) - seconds * self.rate
+
+
+class OutboundScheduler:
+    """Barcha chiquvchi yuborishlar uchun umumiy navbat.
+
+    * chat bo'yicha cheklov (``chat_rate``/``chat_burst``) yuboruvchining o'zida
+      kutiladi, shuning uchun bitta band chat boshqalarni to'xtatmaydi;
+    * umumiy cheklov (``global_rate``) yagona ishchi vazifa tomonidan
+      ustuvorlik tartibida beriladi: foydalanuvchi javoblari admin
+      xabarlari va digestlardan oldin o'tadi;
+    * ``RetryAfter`` kelsa, tegishli bucket bloklanadi va yuborish qayta
+      urinib ko'riladi;
+    * ``shared_chats`` (masalan, adminlar) ga ``shares`` ta jarayon yuboradi,
+      shuning uchun ularning chat cheklovi jarayonlar orasida bo'linadi;
+    * navbat chuqurligi, kutish va yuborish vaqtlari ``snapshot`` orqali olinadi.
+    """
+
+    def __init__(self, global_rate: float = 30.0, chat_rate: float = 1.0, chat_burst: float = 3.0,
+                 max_retries: int = 3, max_chats: int = 10000, shared_chats: Iterable[Any] = (), shares: int = 1):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        # chat_id int yoki "@kanal" bo'lishi mumkin, shuning uchun satr ko'rinishida solishtiriladi
+        self.shared_chats = frozenset(str(chat_id) for chat_id in shared_chats)
+        self.shares = max(1, shares)
+        self.max_retries = max_retries
+        self.max_chats = max_chats
+        self._global: Optional[TokenBucket] = None
+        # Eng uzoq ishlatilmagan chat bucket'i birinchi chiqariladi (max_chats dan oshmaydi)
+        self._chats: "OrderedDict[Any, TokenBucket]" = OrderedDict()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._seq = 0
+        self.peak_depth = 0
+        self.retries = 0
+        self.failures = 0
+        self.wait_stats = StatementStats()
+        self.send_stats: Dict[str, StatementStats] = {}
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_worker(self) -> None:
+        # Navbat va ishchi ishlayotgan event loop ichida yaratiladi
+        if self._worker is None or self._worker.done():
+            loop = asyncio.get_running_loop()
+            if self._queue is None:
+                self._queue = asyncio.PriorityQueue()
+                self._global = TokenBucket(self.global_rate, self.global_rate, loop.time())
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            delay = self._global.reserve(loop.time())
+            if delay > 0:
+                await asyncio.sleep(delay)
+                # Kutish paytida kelgan yuqori ustuvorlikdagi so'rov oldin o'tadi
+                self._queue.put_nowait(item)
+                item = self._queue.get_nowait()
+            future = item[2]
+            if not future.done():
+                future.set_result(None)
+
+    def _chat_bucket(self, chat_id: Any, now: float) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is not None:
+            self._chats.move_to_end(chat_id)
+        else:
+            while len(self._chats) >= self.max_chats:
+                self._chats.popitem(last=False)
+            if self.shares > 1 and str(chat_id) in self.shared_chats:
+                bucket = TokenBucket(self.chat_rate / self.shares, max(1.0, self.chat_burst / self.shares), now)
+            else:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst, now)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    async def acquire(self, chat_id: Any = None) -> None:
+        """Chat va umumiy cheklovlar ruxsat berguncha kutadi."""
+        loop = asyncio.get_running_loop()
+        if chat_id is not None:
+            delay = self._chat_bucket(chat_id, loop.time()).reserve(loop.time())
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self._ensure_worker()
+        future = loop.create_future()
+        self._seq += 1
+        enqueued = loop.time()
+        self._queue.put_nowait((send_priority.get(), self._seq, future))
+        self.peak_depth = max(self.peak_depth, self._queue.qsize())
+        await future
+        self.wait_stats.observe((loop.time() - enqueued) * 1000)
+
+    def back_off(self, chat_id: Any, seconds: float) -> None:
+        """``RetryAfter`` bo'yicha chat (chat noma'lum bo'lsa, umumiy) cheklovini bloklaydi."""
+        self.retries += 1
+        now = asyncio.get_running_loop().time()
+        if chat_id is not None:
+            self._chat_bucket(chat_id, now).block(now, seconds)
+        elif self._global is not None:
+            self._global.block(now, seconds)
+
+    def observe(self, method: str, elapsed_ms: float) -> None:
+        stats = self.send_stats.get(method)
+        if stats is None:
+            stats = self.send_stats[method] = StatementStats()
+        stats.observe(elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Navbat metrikalarini qaytaradi."""
+        return {
+            "depth": self.depth,
+            "peak_depth": self.peak_depth,
+            "retries": self.retries,
+            "failures": self.failures,
+            "chats": len(self._chats),
+            "wait": self.wait_stats.as_dict(),
+            "send": {method: stats.as_dict() for method, stats in self.send_stats.items()},
+        }
+
+    def log_summary(self) -> None:
+        """Navbat metrikalarini jurnalga yozadi."""
+        snapshot = self.snapshot()
+        logging.info(f"Outbound: depth={snapshot['depth']}, peak_depth={snapshot['peak_depth']}, "
+                     f"retries={snapshot['retries']}, failures={snapshot['failures']}, "
+                     f"wait_avg={snapshot['wait']['avg_ms']}ms, wait_max={snapshot['wait']['max_ms']}ms")
+        for method, stats in snapshot["send"].items():
+            logging.info(f"Outbound {method}: count={stats['count']}, avg={stats['avg_ms']}ms, max={stats['max_ms']}ms")
+
+    async def stop(self) -> None:
+        """Ishchi vazifani to'xtatadi; kutayotgan yuborishlar darhol o'tkaziladi."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            future = self._queue.get_nowait()[2]
+            if not future.done():
+                future.set_result(None)
+
+
+class ScheduledBot(Bot):
+    """Barcha yuborishlarni ``OutboundScheduler`` orqali o'tkazuvchi Bot.
+
+    Handlerlar ``message.answer``, ``bot.send_message`` va boshqalarni odatdagidek
+    chaqiradi; cheklovlar, ustuvorlik va ``RetryAfter`` dan keyingi qayta
+    urinish shu yerda bajariladi.
+    """
+
+    def __init__(self, *args, scheduler: Optional[OutboundScheduler] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler or OutboundScheduler()
+
+    async def request(self, method: str, data: Optional[Dict] = None, files: Optional[Dict] = None, **kwargs):
+        if method not in RATE_LIMITED_METHODS:
+            return await super().request(method, data, files, **kwargs)
+
+        chat_id = (data or {}).get("chat_id")
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(chat_id)
+            started = time.perf_counter()
+            try:
+                result = await super().request(method, data, files, **kwargs)
+            except RetryAfter as e:
+                self.scheduler.back_off(chat_id, e.timeout)
+                attempt += 1
+                # Yuklanayotgan fayllar oqimi qayta o'qilmaydi, shuning uchun ular qayta yuborilmaydi
+                if files or attempt > self.scheduler.max_retries:
+                    self.scheduler.failures += 1
+                    raise
+                logging.warning(f"RetryAfter: method={method}, chat_id={chat_id}, timeout={e.timeout}s, "
+                                f"attempt={attempt}")
+                continue
+            self.scheduler.observe(method, (time.perf_counter() - started) * 1000)
+            return result
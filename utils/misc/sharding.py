@@ -0,0 +1,268 @@
+# sharding.py: update'larni foydalanuvchi bo'yicha bir nechta worker jarayonlariga taqsimlash
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+from aiogram import Bot
+
+
+def update_user_id(update: Dict[str, Any]) -> Optional[int]:
+    """Update yuboruvchisining id sini qaytaradi (foydalanuvchi bo'lmasa, chat id)."""
+    for field, value in update.items():
+        if field == "update_id" or not isinstance(value, dict):
+            continue
+        # message, callback_query, inline_query va h.k. - "from"; poll_answer - "user"
+        user = value.get("from") or value.get("user")
+        if user:
+            return user["id"]
+        # channel_post va boshqalar: foydalanuvchi yo'q, chat bo'yicha
+        chat = value.get("chat") or (value.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"]
+    return None
+
+
+def shard_for(update: Dict[str, Any], workers: int) -> int:
+    """Update qaysi worker'ga tegishli ekanini qaytaradi (0..workers-1)."""
+    user_id = update_user_id(update)
+    return user_id % workers if user_id is not None else 0
+
+
+class ShardRouter:
+    """Front jarayon: update'larni worker'larga foydalanuvchi bo'yicha yo'naltiradi.
+
+    * bitta foydalanuvchining update'lari doim bitta worker'ga boradi, shuning
+      uchun uning FSM holati, throttling bucketi va keshlari o'sha jarayonda;
+    * bitta foydalanuvchi uchun update'lar ketma-ket yuboriladi: worker
+      webhook javobini handler tugagandan keyin qaytaradi, keyingi update
+      shundan keyingina yuboriladi (FSM tartibi saqlanadi);
+    * bir vaqtda yo'naltirilayotgan update'lar ``max_pending`` bilan cheklanadi
+      (polling sekinlashadi, webhook esa javobni kechiktiradi);
+    * worker vaqtincha ishlamasa (qayta ishga tushayotgan bo'lsa), update
+      ``max_retries`` marta qayta yuboriladi.
+    """
+
+    def __init__(self, worker_urls: List[str], max_pending: int = 256, max_retries: int = 5,
+                 timeout: float = 60.0):
+        self.worker_urls = worker_urls
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.routed = [0] * len(worker_urls)
+        self.failed = 0
+        # foydalanuvchi -> uning oxirgi yo'naltirish vazifasi
+        self._tails: Dict[Any, asyncio.Task] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._pending: Optional[asyncio.Semaphore] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Sessiya va semafor ishlayotgan event loop ichida yaratiladi
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def _post(self, shard: int, update: Dict[str, Any]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.session.post(self.worker_urls[shard], json=update) as response:
+                    if response.status < 500:
+                        self.routed[shard] += 1
+                        return True
+                    error = f"HTTP {response.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = repr(e)
+            delay = min(0.5 * 2 ** attempt, 10.0)
+            logging.warning(f"Worker {shard} ga yuborilmadi: update_id={update.get('update_id')}, "
+                            f"error={error}, attempt={attempt + 1}, retry_in={delay}s")
+            await asyncio.sleep(delay)
+        self.failed += 1
+        logging.error(f"Update tashlab yuborildi: update_id={update.get('update_id')}, shard={shard}")
+        return False
+
+    async def _forward(self, shard: int, update: Dict[str, Any], previous: Optional[asyncio.Task]) -> bool:
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+            return await self._post(shard, update)
+        finally:
+            self._pending.release()
+
+    async def route(self, update: Dict[str, Any]) -> asyncio.Task:
+        """Update'ni tegishli worker'ga yuborish vazifasini boshlaydi (navbat to'lsa kutadi)."""
+        if self._pending is None:
+            self._pending = asyncio.Semaphore(self.max_pending)
+        await self._pending.acquire()
+        user_id = update_user_id(update)
+        shard = user_id % len(self.worker_urls) if user_id is not None else 0
+        task = asyncio.create_task(self._forward(shard, update, self._tails.get(user_id)))
+        self._tails[user_id] = task
+        task.add_done_callback(lambda t: self._tails.get(user_id) is t and self._tails.pop(user_id))
+        return task
+
+    async def drain(self, timeout: Optional[float] = 30.0) -> None:
+        """Yo'naltirilayotgan update'lar tugashini kutadi va sessiyani yopadi."""
+        if self._tails:
+            done, pending = await asyncio.wait(set(self._tails.values()), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            logging.info(f"Shard navbati bo'shatildi: done={len(done)}, cancelled={len(pending)}")
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        logging.info(f"Shard: routed={self.routed}, failed={self.failed}")
+
+
+async def poll_updates(bot: Bot, router: ShardRouter, timeout: int = 20) -> None:
+    """Telegram'dan long polling bilan update'larni olib, worker'larga yo'naltiradi."""
+    offset = None
+    while True:
+        try:
+            updates = await bot.get_updates(offset=offset, timeout=timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"getUpdates xatolik: {e}")
+            await asyncio.sleep(1)
+            continue
+        for update in updates:
+            offset = update.update_id + 1
+            await router.route(update.to_python())
+
+
+async def serve_webhook(router: ShardRouter, path: str, host: str, port: int) -> web.AppRunner:
+    """Telegram webhook'larini qabul qilib, worker'larga yo'naltiruvchi serverni ishga tushiradi."""
+    async def handle(request: web.Request) -> web.Response:
+        await router.route(await request.json())
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(path, handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logging.info(f"Front webhook server: http://{host}:{port}{path}")
+    return runner
+
+
+# Worker'lar bir-biriga kesh invalidatsiyasini shu yo'l orqali yuboradi
+INVALIDATE_PATH = "/invalidate"
+
+
+def invalidation_app(handler: Callable[[str, str], None]) -> web.Application:
+    """Worker ilovasi: ``INVALIDATE_PATH`` ga kelgan (scope, key) ni ``handler`` ga beradi."""
+    async def handle(request: web.Request) -> web.Response:
+        data = await request.json()
+        handler(data["scope"], str(data["key"]))
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(INVALIDATE_PATH, handle)
+    return app
+
+
+class ShardPeers:
+    """Worker'dan foydalanuvchini yurituvchi boshqa worker'ga profil invalidatsiyasini yuboradi.
+
+    ChangeWatcher o'zgarishni ``CHANGE_POLL_INTERVAL`` ichida ko'radi. Admin
+    ruxsat bergach foydalanuvchi darhol yozsa, uning worker'i eski (ruxsatsiz)
+    profilni ko'rmasligi uchun invalidatsiya foydalanuvchiga javobdan oldin
+    to'g'ridan-to'g'ri yetkaziladi; yetkazilmasa, ChangeWatcher zaxira bo'lib qoladi.
+    """
+
+    def __init__(self, index: int, count: int, host: str = "127.0.0.1", port_base: int = 8100,
+                 timeout: float = 2.0):
+        self.index = index
+        self.count = count
+        self.host = host
+        self.port_base = port_base
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def url_for(self, shard: int) -> str:
+        return f"http://{self.host}:{self.port_base + shard}{INVALIDATE_PATH}"
+
+    async def invalidate_user(self, telegram_id: int) -> None:
+        """``telegram_id`` ni yurituvchi worker'dagi profil keshini bekor qiladi."""
+        shard = telegram_id % self.count
+        if shard == self.index:
+            return  # o'z keshi yozuv bilan birga yangilangan
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        try:
+            async with self._session.post(self.url_for(shard), json={"scope": "user", "key": telegram_id}) as response:
+                if response.status >= 400:
+                    logging.warning(f"Invalidatsiya qabul qilinmadi: shard={shard}, telegram_id={telegram_id}, "
+                                    f"status={response.status}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.warning(f"Invalidatsiya yuborilmadi: shard={shard}, telegram_id={telegram_id}, error={e!r}")
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class WorkerPool:
+    """Worker jarayonlarini (``BOT_MODE=worker``) ishga tushiradi, kuzatadi va to'xtatadi.
+
+    Har bir worker ``host:port_base + index`` da webhook qabul qiladi. Kutilmaganda
+    to'xtagan worker qayta ishga tushiriladi; shu vaqt ichida uning update'lari
+    ``ShardRouter`` da qayta yuboriladi.
+    """
+
+    def __init__(self, count: int, script: str, host: str = "127.0.0.1", port_base: int = 8100,
+                 path: str = "/webhook"):
+        self.count = count
+        self.script = script
+        self.host = host
+        self.port_base = port_base
+        self.path = path
+        self._processes: List[Optional[subprocess.Popen]] = [None] * count
+        self._supervisor: Optional[asyncio.Task] = None
+
+    @property
+    def urls(self) -> List[str]:
+        return [f"http://{self.host}:{self.port_base + index}{self.path}" for index in range(self.count)]
+
+    def _spawn(self, index: int) -> None:
+        env = dict(os.environ, BOT_MODE="worker", WORKER_INDEX=str(index))
+        self._processes[index] = subprocess.Popen([sys.executable, self.script], env=env)
+        logging.info(f"Worker {index} ishga tushdi: pid={self._processes[index].pid}, "
+                     f"port={self.port_base + index}")
+
+    async def _supervise(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            for index, process in enumerate(self._processes):
+                if process is not None and process.poll() is not None:
+                    logging.error(f"Worker {index} to'xtadi: code={process.returncode}, qayta ishga tushirilmoqda")
+                    self._spawn(index)
+
+    def start(self, interval: float = 1.0) -> None:
+        for index in range(self.count):
+            self._spawn(index)
+        self._supervisor = asyncio.create_task(self._supervise(interval))
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Worker'larga SIGTERM yuboradi (ular o'zi drain qiladi), ``timeout`` dan keyin o'ldiradi."""
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        processes = [process for process in self._processes if process is not None and process.poll() is None]
+        for process in processes:
+            process.terminate()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        for process in processes:
+            try:
+                await loop.run_in_executor(None, process.wait, max(0.0, deadline - loop.time()))
+            except subprocess.TimeoutExpired:
+                logging.warning(f"Worker to'xtamadi, o'ldirilmoqda: pid={process.pid}")
+                process.kill()
+        logging.info(f"Worker'lar to'xtatildi: {len(processes)}")
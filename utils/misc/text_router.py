@@ -0,0 +1,40 @@
+# text_router.py: reply-klaviatura tugmalari matnini amallarga moslash
+import logging
+from typing import Dict, Mapping, Optional, Tuple
+
+from .localization import Localization
+
+# (amal, argument), masalan ("section", "question") yoki ("back", None)
+Route = Tuple[str, Optional[str]]
+
+
+class TextRouter:
+    """Tugma matni -> amal jadvali, tarjimalar versiyasi bo'yicha bir marta quriladi.
+
+    ``routes`` xabar kalitlarini amallarga bog'laydi; jadval barcha tillarning
+    tayyor matnlaridan yig'iladi va lokalizatsiya ``version`` o'zgarganda
+    qayta quriladi. Har bir xabar uchun qidiruv bitta dict murojaatidan iborat.
+    """
+
+    def __init__(self, localization: Localization, routes: Mapping[str, Route]):
+        self._localization = localization
+        self._routes = dict(routes)
+        self._table: Dict[str, Route] = {}
+        self._version: Optional[int] = None
+
+    def _build(self) -> None:
+        table: Dict[str, Route] = {}
+        for messages in self._localization.all_messages().values():
+            for key, route in self._routes.items():
+                text = messages.get(key)
+                if text:
+                    table.setdefault(text, route)
+        self._table = table
+        self._version = self._localization.version
+        logging.info(f"Matn router'i qurildi: texts={len(table)}, version={self._version}")
+
+    def resolve(self, text: Optional[str]) -> Optional[Route]:
+        """Matnga mos amalni qaytaradi (mos kelmasa None)."""
+        if self._version != self._localization.version:
+            self._build()
+        return self._table.get(text) if text else None